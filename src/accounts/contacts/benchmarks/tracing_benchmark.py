@@ -0,0 +1,158 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the cost of tracing in the contacts service.
+
+Times importing the service in fresh interpreters, next to the previous
+eager OpenTelemetry imports, then GET /contacts/<username> against an
+in-memory SQLite database with tracing disabled and enabled. Enabled
+spans go to an in-memory exporter instead of Cloud Trace.
+
+Usage: python benchmarks/tracing_benchmark.py [--requests N] [--imports N]
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, SERVICE_DIR)
+
+# pylint: disable=wrong-import-position
+import contacts
+from db import ContactsDb
+
+USERNAME = 'testuser'
+# what contacts.py and db.py imported at module load before
+EAGER_IMPORTS = [
+    'opentelemetry.trace',
+    'opentelemetry.sdk.trace.export',
+    'opentelemetry.sdk.trace',
+    'opentelemetry.propagate',
+    'opentelemetry.exporter.cloud_trace',
+    'opentelemetry.propagators.cloud_trace_propagator',
+    'opentelemetry.instrumentation.flask',
+    'opentelemetry.instrumentation.sqlalchemy',
+]
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+import contacts
+print(time.perf_counter() - start, sum(m.startswith('opentelemetry') for m in sys.modules))
+'''
+
+
+def time_import(preload, repeat):
+    """Return the median seconds to import the service, and the OpenTelemetry modules loaded"""
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, *preload],
+                                cwd=SERVICE_DIR, check=True, capture_output=True,
+                                text=True).stdout.split()
+        seconds.append(float(output[0]))
+    return statistics.median(seconds), int(output[1])
+
+
+def make_database(_uri, logger, enable_tracing=False, contact_count=10):
+    """ContactsDb on a new in-memory SQLite database holding a few contacts"""
+    contacts_db = ContactsDb('sqlite:///:memory:', logger, enable_tracing)
+    contacts_db.contacts_table.create(contacts_db.engine)
+    for i in range(contact_count):
+        contacts_db.add_contact({'username': USERNAME,
+                                 'label': f'contact-{i}',
+                                 'account_num': f'{1000000000 + i}',
+                                 'routing_num': '883745000',
+                                 'is_external': False})
+    return contacts_db
+
+
+def make_keys(directory):
+    """Create an RSA key pair. Return (private key PEM, public key file path)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(serialization.Encoding.PEM,
+                                    serialization.PrivateFormat.PKCS8,
+                                    serialization.NoEncryption())
+    public_key_path = os.path.join(directory, 'jwtRS256.key.pub')
+    with open(public_key_path, 'wb') as public_key_file:
+        public_key_file.write(key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo))
+    return private_pem, public_key_path
+
+
+def create_app(tracing, public_key_path):
+    """Create the service, with spans exported in memory if tracing"""
+    os.environ.update({'ENABLE_TRACING': 'true' if tracing else 'false',
+                       'PUB_KEY_PATH': public_key_path,
+                       'PUB_KEY_RELOAD_SECONDS': '0'})
+    # the requests are sent from this thread, which keeps the in-memory
+    # database's connection open
+    with patch('contacts.ContactsDb', make_database):
+        if not tracing:
+            return contacts.create_app()
+        # pylint: disable=import-outside-toplevel
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        with patch('opentelemetry.exporter.cloud_trace.CloudTraceSpanExporter',
+                   InMemorySpanExporter):
+            return contacts.create_app()
+
+
+def time_requests(app, token, count):
+    """Return the average seconds of GET /contacts/<username>"""
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    start = time.perf_counter()
+    for _ in range(count):
+        assert client.get(f'/contacts/{USERNAME}', headers=headers).status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    """Time imports and requests with tracing disabled and enabled"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='requests per scenario')
+    parser.add_argument('--imports', type=int, default=5, help='imports per scenario')
+    args = parser.parse_args()
+
+    print(f'{"import":<36}{"ms":>10}{"otel modules":>14}')
+    for name, preload in [('previous eager imports', EAGER_IMPORTS), ('lazy imports', [])]:
+        seconds, modules = time_import(preload, args.imports)
+        print(f'{name:<36}{seconds * 1000:>10.1f}{modules:>14}')
+
+    private_pem, public_key_path = make_keys(tempfile.mkdtemp())
+    now = datetime.datetime.now(datetime.timezone.utc)
+    token = jwt.encode({'user': USERNAME, 'iat': now, 'exp': now + datetime.timedelta(hours=1)},
+                       private_pem, algorithm='RS256')
+
+    # tracing instruments process-wide, so it is enabled last
+    print(f'\n{"GET /contacts/<username>":<36}{"us/request":>10}')
+    for name, tracing in [('tracing disabled', False), ('tracing enabled', True)]:
+        app = create_app(tracing, public_key_path)
+        seconds = time_requests(app, token, args.requests)
+        print(f'{name:<36}{seconds * 1e6:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -28,15 +28,32 @@ from flask import Flask, jsonify, request
 import bleach
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
-from opentelemetry import trace
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.propagate import set_global_textmap
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-
 from db import ContactsDb
+from json_codec import JsonCodec, JSONProvider
+from jwt_keys import PublicKeySet
+
+
+def setup_tracing(app):
+    """Export spans to Cloud Trace and instrument the Flask app.
+
+    OpenTelemetry is only imported here, so that a service running with
+    tracing disabled does not load it.
+    """
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.propagate import set_global_textmap
+    from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+    from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    trace.set_tracer_provider(TracerProvider())
+    cloud_trace_exporter = CloudTraceSpanExporter()
+    trace.get_tracer_provider().add_span_processor(
+        BatchSpanProcessor(cloud_trace_exporter)
+    )
+    set_global_textmap(CloudTraceFormatPropagator())
+    FlaskInstrumentor().instrument_app(app)
 
 
 def create_app():
@@ -74,9 +91,7 @@ def create_app():
         else:
             token = ""
         try:
-            auth_payload = jwt.decode(
-                token, key=app.config["PUBLIC_KEY"], algorithms="RS256"
-            )
+            auth_payload = public_keys.decode(token)
             if username != auth_payload["user"]:
                 raise PermissionError
 
@@ -109,9 +124,7 @@ def create_app():
         else:
             token = ""
         try:
-            auth_payload = jwt.decode(
-                token, key=app.config["PUBLIC_KEY"], algorithms="RS256"
-            )
+            auth_payload = public_keys.decode(token)
             if username != auth_payload["user"]:
                 raise PermissionError
             req = {
@@ -197,27 +210,29 @@ def create_app():
     app.logger.info("Starting contacts service.")
 
     # Set up tracing and export spans to Cloud Trace.
-    if os.environ['ENABLE_TRACING'] == "true":
+    app.config["ENABLE_TRACING"] = os.environ["ENABLE_TRACING"] == "true"
+    if app.config["ENABLE_TRACING"]:
         app.logger.info("✅ Tracing enabled.")
-        # Set up tracing and export spans to Cloud Trace
-        trace.set_tracer_provider(TracerProvider())
-        cloud_trace_exporter = CloudTraceSpanExporter()
-        trace.get_tracer_provider().add_span_processor(
-            BatchSpanProcessor(cloud_trace_exporter)
-        )
-        set_global_textmap(CloudTraceFormatPropagator())
-        FlaskInstrumentor().instrument_app(app)
+        setup_tracing(app)
     else:
         app.logger.info("🚫 Tracing disabled.")
 
     # setup global variables
     app.config["VERSION"] = os.environ.get("VERSION")
     app.config["LOCAL_ROUTING"] = os.environ.get("LOCAL_ROUTING_NUM")
-    app.config["PUBLIC_KEY"] = open(os.environ.get("PUB_KEY_PATH"), "r").read()
+    app.config["PUB_KEY_RELOAD_SECONDS"] = int(os.environ.get("PUB_KEY_RELOAD_SECONDS", "30"))
+    # orjson if it is installed ('auto'), 'orjson' or 'json'
+    app.config["JSON_CODEC"] = os.environ.get("JSON_CODEC", "auto")
+    app.json = JSONProvider(app, JsonCodec(app.config["JSON_CODEC"]))
+
+    # Parse the public keys once, and pick up rotated keys without a restart
+    public_keys = PublicKeySet(os.environ.get("PUB_KEY_PATH"), app.logger)
+    public_keys.watch(app.config["PUB_KEY_RELOAD_SECONDS"])
 
     # Configure database connection
     try:
-        contacts_db = ContactsDb(os.environ.get("ACCOUNTS_DB_URI"), app.logger)
+        contacts_db = ContactsDb(os.environ.get("ACCOUNTS_DB_URI"), app.logger,
+                                 enable_tracing=app.config["ENABLE_TRACING"])
     except OperationalError:
         app.logger.critical("database connection failed")
         sys.exit(1)
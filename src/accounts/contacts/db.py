@@ -18,7 +18,6 @@ db manages interactions with the underlying database
 
 import logging
 from sqlalchemy import create_engine, MetaData, Table, Column, String, Boolean
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 
 
 class ContactsDb:
@@ -27,7 +26,7 @@ class ContactsDb:
     to handle db operations for contact service.
     """
 
-    def __init__(self, uri, logger=logging):
+    def __init__(self, uri, logger=logging, enable_tracing=False):
         self.engine = create_engine(uri)
         self.logger = logger
         self.contacts_table = Table(
@@ -40,11 +39,16 @@ class ContactsDb:
             Column("is_external", Boolean, nullable=False),
         )
 
-        # Set up tracing autoinstrumentation for sqlalchemy
-        SQLAlchemyInstrumentor().instrument(
-            engine=self.engine,
-            service="contacts",
-        )
+        # Set up tracing autoinstrumentation for sqlalchemy. Without
+        # tracing, queries run on the bare engine and the instrumentor
+        # is not even imported.
+        if enable_tracing:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+            SQLAlchemyInstrumentor().instrument(
+                engine=self.engine,
+                service="contacts",
+            )
 
     def add_contact(self, contact):
         """Add a contact under the specified username.
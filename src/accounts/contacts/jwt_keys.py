@@ -0,0 +1,156 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+jwt_keys loads the public keys that verify JWTs and reloads them when they change
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+PEM_BEGIN = "-----BEGIN"
+
+
+def key_id(public_key):
+    """Return the 'kid' of a public key: a digest of its DER encoding."""
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.urlsafe_b64encode(hashlib.sha256(der).digest()[:12]).decode("ascii")
+
+
+class PublicKeySet:
+    """
+    PublicKeySet holds the parsed public keys found at a path and picks the
+    one matching a token's 'kid' header to verify it.
+
+    The path is either a file holding one or more PEM public keys or a
+    directory of such files (e.g. a mounted Kubernetes secret), so a new
+    key can be published next to the old one while keys are rotated.
+    """
+
+    def __init__(self, path, logger=logging, on_reload=None):
+        self.path = path
+        self.logger = logger
+        self.on_reload = on_reload
+        self._keys = {}
+        self._signature = None
+        self.reload()
+
+    def kids(self):
+        """Return the ids of the loaded keys."""
+        return list(self._keys)
+
+    def decode(self, token, **kwargs):
+        """Verify token and return its claims.
+
+        Uses the key named by the token's 'kid' header. Tokens without a
+        known 'kid' are tried against every loaded key.
+        Raises: jwt.exceptions.InvalidTokenError if no key verifies the token
+        """
+        keys = self._keys
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid in keys:
+            candidates = [keys[kid]]
+        else:
+            candidates = list(keys.values())
+        if not candidates:
+            raise jwt.exceptions.InvalidSignatureError("no public key loaded")
+        error = None
+        for key in candidates:
+            try:
+                return jwt.decode(token, key=key, algorithms="RS256", **kwargs)
+            except jwt.exceptions.InvalidSignatureError as err:
+                error = err
+        raise error
+
+    def reload(self):
+        """Parse the keys again if the files at path changed.
+
+        Keeps the current keys if none of the new ones can be parsed.
+        Return: True if a new set of keys was loaded
+        """
+        try:
+            signature = self._files_signature()
+        except OSError as err:
+            self.logger.error("Unable to read public keys at %s: %s", self.path, str(err))
+            return False
+        if signature == self._signature:
+            return False
+
+        keys = {}
+        for file_path, _, _ in signature:
+            keys.update(self._parse_file(file_path))
+        if not keys:
+            self.logger.error("No valid public key found at %s.", self.path)
+            return False
+
+        self._signature = signature
+        self._keys = keys
+        self.logger.info("Loaded public keys %s.", ", ".join(keys))
+        if self.on_reload is not None:
+            self.on_reload()
+        return True
+
+    def watch(self, interval):
+        """Check for changed keys every interval seconds in a daemon thread."""
+        if interval <= 0:
+            return None
+        stopped = threading.Event()
+
+        def _watch():
+            while not stopped.wait(interval):
+                self.reload()
+
+        threading.Thread(target=_watch, name="jwt-key-watcher", daemon=True).start()
+        return stopped
+
+    def _files_signature(self):
+        """Return (path, mtime, size) of every key file, cheap to compare."""
+        if self.path is None:
+            raise FileNotFoundError("public key path not set")
+        if os.path.isdir(self.path):
+            names = sorted(
+                name for name in os.listdir(self.path)
+                if not name.startswith(".")
+                and os.path.isfile(os.path.join(self.path, name))
+            )
+            paths = [os.path.join(self.path, name) for name in names]
+        else:
+            paths = [self.path]
+        signature = []
+        for file_path in paths:
+            stat = os.stat(file_path)
+            signature.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _parse_file(self, file_path):
+        """Return {kid: key} for the PEM public keys in file_path."""
+        keys = {}
+        with open(file_path, "rb") as key_file:
+            data = key_file.read()
+        for block in data.split(PEM_BEGIN.encode())[1:]:
+            try:
+                key = serialization.load_pem_public_key(PEM_BEGIN.encode() + block)
+            except ValueError as err:
+                self.logger.warning("Skipping invalid public key in %s: %s", file_path, str(err))
+                continue
+            keys[key_id(key)] = key
+        return keys
@@ -17,10 +17,12 @@
 Tests for contacts
 """
 
+import os
 import random
+import tempfile
 import unittest
 import json
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -50,31 +52,34 @@ class TestContacts(unittest.TestCase):
 
     def setUp(self):
         """Setup Flask TestClient and mock contacts_db"""
-        # mock opening files
-        with patch("contacts.contacts.open", mock_open(read_data="foo")):
-            # mock env vars
-            with patch(
-                "os.environ",
-                {
-                    "VERSION": "1",
-                    "LOCAL_ROUTING": "123456789",
-                    "PUBLIC_KEY": "1",
-                    "ENABLE_TRACING": "false",
-                },
-            ):
-                # mock db module as MagicMock, context manager handles cleanup
-                with patch("contacts.contacts.ContactsDb") as mock_db:
-                    self.mocked_db = mock_db
-                    # get create flask app
-                    self.flask_app = create_app()
-                    # set testing config
-                    self.flask_app.config["TESTING"] = True
-                    # create test client
-                    self.test_app = self.flask_app.test_client()
-                    # set public key
-                    self.flask_app.config["PUBLIC_KEY"] = EXAMPLE_PUBLIC_KEY
-                    # mock return value of get_contacts to return empty
-                    self.mocked_db.return_value.get_contacts.return_value = []
+        # write the public key to a temporary key file
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        key_path = os.path.join(key_dir.name, "publickey")
+        with open(key_path, "wb") as key_file:
+            key_file.write(EXAMPLE_PUBLIC_KEY)
+        # mock env vars
+        with patch(
+            "os.environ",
+            {
+                "VERSION": "1",
+                "LOCAL_ROUTING": "123456789",
+                "PUB_KEY_PATH": key_path,
+                "PUB_KEY_RELOAD_SECONDS": "0",
+                "ENABLE_TRACING": "false",
+            },
+        ):
+            # mock db module as MagicMock, context manager handles cleanup
+            with patch("contacts.contacts.ContactsDb") as mock_db:
+                self.mocked_db = mock_db
+                # get create flask app
+                self.flask_app = create_app()
+                # set testing config
+                self.flask_app.config["TESTING"] = True
+                # create test client
+                self.test_app = self.flask_app.test_client()
+                # mock return value of get_contacts to return empty
+                self.mocked_db.return_value.get_contacts.return_value = []
 
     def test_version_endpoint_returns_200_status_code_correct_version(self):
         """test if correct version is returned"""
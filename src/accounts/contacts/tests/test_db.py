@@ -18,6 +18,7 @@ Tests for db module
 import random
 
 import unittest
+from unittest.mock import patch
 
 from contacts.db import ContactsDb
 from contacts.tests.constants import EXAMPLE_CONTACT_DB_OBJ
@@ -80,3 +81,18 @@ class TestDb(unittest.TestCase):
         """test getting contacts for a non existent user"""
         # assert None when user does not exist
         self.assertEqual(0, len(self.db.get_contacts("baz")))
+
+    @patch("opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor")
+    def test_init_without_tracing_does_not_instrument_engine(self, mock_instrumentor):
+        """test that queries are not instrumented when tracing is disabled"""
+        ContactsDb("sqlite:///:memory:")
+        mock_instrumentor.assert_not_called()
+
+    @patch("opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor")
+    def test_init_with_tracing_instruments_engine(self, mock_instrumentor):
+        """test that queries are instrumented when tracing is enabled"""
+        db = ContactsDb("sqlite:///:memory:", enable_tracing=True)
+        mock_instrumentor.return_value.instrument.assert_called_once_with(
+            engine=db.engine,
+            service="contacts",
+        )
@@ -0,0 +1,125 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for json_codec module
+"""
+
+import datetime
+import unittest
+from unittest.mock import patch
+
+from flask import Flask, jsonify, request
+
+from contacts.json_codec import JsonCodec, JSONProvider
+
+EXAMPLE_DOCUMENT = {
+    "username": "jdoe",
+    "contacts": [
+        {"label": "Zoë", "account_num": "1234567890", "routing_num": "123456789",
+         "is_external": False},
+        {"label": "Bob", "account_num": "0987654321", "routing_num": "987654321",
+         "is_external": True},
+    ],
+    "count": 2,
+    "ratio": 0.5,
+    "missing": None,
+}
+
+
+class TestJsonCodec(unittest.TestCase):
+    """
+    Test cases for JsonCodec
+    """
+
+    def test_auto_picks_orjson_if_installed(self):
+        """test 'auto' uses orjson, and the json module when it is missing"""
+        self.assertEqual(JsonCodec().name, "orjson")
+        with patch("contacts.json_codec.orjson", None):
+            self.assertEqual(JsonCodec().name, "json")
+
+    def test_unknown_or_missing_codec_raises(self):
+        """test an unknown codec, or orjson when it is missing, raise ValueError"""
+        with self.assertRaises(ValueError):
+            JsonCodec("simplejson")
+        with patch("contacts.json_codec.orjson", None):
+            with self.assertRaises(ValueError):
+                JsonCodec("orjson")
+
+    def test_codecs_produce_the_same_output(self):
+        """test orjson and json serialize and parse alike"""
+        fast, standard = JsonCodec("orjson"), JsonCodec("json")
+        for options in [{}, {"sort_keys": True}, {"indent": True}]:
+            self.assertEqual(fast.dumpb(EXAMPLE_DOCUMENT, **options),
+                             standard.dumpb(EXAMPLE_DOCUMENT, **options))
+        data = standard.dumpb(EXAMPLE_DOCUMENT)
+        self.assertEqual(fast.loads(data), EXAMPLE_DOCUMENT)
+        self.assertEqual(standard.loads(data), EXAMPLE_DOCUMENT)
+        self.assertEqual(fast.loads(data.decode("utf-8")), EXAMPLE_DOCUMENT)
+
+    def test_non_str_keys_are_converted(self):
+        """test int keys are serialized as strings by both codecs"""
+        for name in ("orjson", "json"):
+            self.assertEqual(JsonCodec(name).dumps({1: "a"}), '{"1":"a"}')
+
+    def test_invalid_json_raises_value_error(self):
+        """test parsing invalid JSON raises ValueError"""
+        for name in ("orjson", "json"):
+            with self.assertRaises(ValueError):
+                JsonCodec(name).loads(b'{"label": ')
+
+    def test_unsupported_value_raises_type_error(self):
+        """test a value the default function does not convert raises TypeError"""
+        for name in ("orjson", "json"):
+            with self.assertRaises(TypeError):
+                JsonCodec(name).dumpb({"when": datetime.date(2026, 1, 1)})
+
+
+class TestJSONProvider(unittest.TestCase):
+    """
+    Test cases for JSONProvider
+    """
+
+    def create_app(self, name):
+        """Create an app echoing the JSON body it is sent, using codec name"""
+        app = Flask(__name__)
+        app.json = JSONProvider(app, JsonCodec(name))
+
+        @app.route("/echo", methods=["POST"])
+        def echo():
+            return jsonify(request.get_json())
+
+        @app.route("/when")
+        def when():
+            return jsonify({"when": datetime.datetime(2026, 1, 1, 12, 0)})
+
+        return app.test_client()
+
+    def test_responses_match_across_codecs(self):
+        """test both codecs send the same compact, sorted responses"""
+        bodies = []
+        for name in ("orjson", "json"):
+            response = self.create_app(name).post("/echo", json=EXAMPLE_DOCUMENT)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/json")
+            self.assertEqual(response.get_json(), EXAMPLE_DOCUMENT)
+            bodies.append(response.data)
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertTrue(bodies[0].startswith(b'{"contacts":[{"account_num":'))
+
+    def test_datetimes_are_converted_like_flask(self):
+        """test datetimes are sent as HTTP dates, as Flask's default provider does"""
+        for name in ("orjson", "json"):
+            response = self.create_app(name).get("/when")
+            self.assertEqual(response.get_json(), {"when": "Thu, 01 Jan 2026 12:00:00 GMT"})
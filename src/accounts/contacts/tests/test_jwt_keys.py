@@ -0,0 +1,129 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for jwt_keys module
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from contacts.jwt_keys import PublicKeySet, key_id
+from contacts.tests.constants import (
+    EXAMPLE_PRIVATE_KEY,
+    EXAMPLE_PUBLIC_KEY,
+    EXAMPLE_USER_PAYLOAD,
+    generate_rsa_key,
+)
+
+
+def sign(payload, private_key, public_key=None):
+    """Sign payload, with a kid header if the public key is given"""
+    headers = None
+    if public_key is not None:
+        headers = {"kid": key_id(serialization.load_pem_public_key(public_key))}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers=headers)
+
+
+class TestPublicKeySet(unittest.TestCase):
+    """
+    Test cases for PublicKeySet
+    """
+
+    def setUp(self):
+        """Create a directory for key files"""
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        self.key_dir = key_dir.name
+
+    def write_key(self, name, data):
+        """Write a key file, return its path"""
+        path = os.path.join(self.key_dir, name)
+        with open(path, "wb") as key_file:
+            key_file.write(data)
+        # make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        return path
+
+    def test_decode_token_signed_with_key_from_file(self):
+        """test a token without kid is verified with the only key"""
+        keys = PublicKeySet(self.write_key("publickey", EXAMPLE_PUBLIC_KEY))
+        claims = keys.decode(sign(EXAMPLE_USER_PAYLOAD, EXAMPLE_PRIVATE_KEY))
+        self.assertEqual(claims, EXAMPLE_USER_PAYLOAD)
+
+    def test_decode_token_signed_with_unknown_key_raises(self):
+        """test a token signed by another key is rejected"""
+        other_private_key, _ = generate_rsa_key()
+        keys = PublicKeySet(self.write_key("publickey", EXAMPLE_PUBLIC_KEY))
+        with self.assertRaises(jwt.exceptions.InvalidSignatureError):
+            keys.decode(sign(EXAMPLE_USER_PAYLOAD, other_private_key))
+
+    def test_directory_with_two_keys_selects_key_by_kid(self):
+        """test keys from every file of a directory are loaded"""
+        new_private_key, new_public_key = generate_rsa_key()
+        self.write_key("publickey", EXAMPLE_PUBLIC_KEY)
+        self.write_key("publickey-next", new_public_key)
+        keys = PublicKeySet(self.key_dir)
+        self.assertEqual(2, len(keys.kids()))
+        for private_key, public_key in ((EXAMPLE_PRIVATE_KEY, EXAMPLE_PUBLIC_KEY),
+                                        (new_private_key, new_public_key)):
+            token = sign(EXAMPLE_USER_PAYLOAD, private_key, public_key)
+            self.assertEqual(keys.decode(token), EXAMPLE_USER_PAYLOAD)
+            # tokens without kid are still accepted
+            token = sign(EXAMPLE_USER_PAYLOAD, private_key)
+            self.assertEqual(keys.decode(token), EXAMPLE_USER_PAYLOAD)
+
+    def test_file_with_two_pem_blocks_loads_both_keys(self):
+        """test a single file may hold several keys"""
+        _, new_public_key = generate_rsa_key()
+        path = self.write_key("publickey", EXAMPLE_PUBLIC_KEY + b"\n" + new_public_key)
+        keys = PublicKeySet(path)
+        self.assertEqual(2, len(keys.kids()))
+
+    def test_reload_picks_up_rotated_key_and_calls_on_reload(self):
+        """test changed key files are loaded again"""
+        on_reload = MagicMock()
+        path = self.write_key("publickey", EXAMPLE_PUBLIC_KEY)
+        keys = PublicKeySet(path, on_reload=on_reload)
+        # unchanged files are not parsed again
+        self.assertFalse(keys.reload())
+        new_private_key, new_public_key = generate_rsa_key()
+        self.write_key("publickey", new_public_key)
+        self.assertTrue(keys.reload())
+        self.assertEqual(2, on_reload.call_count)
+        claims = keys.decode(sign(EXAMPLE_USER_PAYLOAD, new_private_key))
+        self.assertEqual(claims, EXAMPLE_USER_PAYLOAD)
+        with self.assertRaises(jwt.exceptions.InvalidSignatureError):
+            keys.decode(sign(EXAMPLE_USER_PAYLOAD, EXAMPLE_PRIVATE_KEY))
+
+    def test_invalid_key_file_keeps_previous_keys(self):
+        """test a broken key file does not drop the loaded keys"""
+        path = self.write_key("publickey", EXAMPLE_PUBLIC_KEY)
+        keys = PublicKeySet(path)
+        kids = keys.kids()
+        self.write_key("publickey", b"-----BEGIN PUBLIC KEY-----\nfoo\n-----END PUBLIC KEY-----\n")
+        self.assertFalse(keys.reload())
+        self.assertEqual(kids, keys.kids())
+
+    def test_missing_key_file_rejects_tokens(self):
+        """test tokens are rejected when no key could be loaded"""
+        keys = PublicKeySet(os.path.join(self.key_dir, "missing"))
+        with self.assertRaises(jwt.exceptions.InvalidTokenError):
+            keys.decode(sign(EXAMPLE_USER_PAYLOAD, EXAMPLE_PRIVATE_KEY))
@@ -0,0 +1,161 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the cost of tracing in the userservice.
+
+Times importing the service in fresh interpreters, next to the previous
+eager OpenTelemetry imports, then GET /login against an in-memory SQLite
+database with tracing disabled and enabled. Enabled spans go to an
+in-memory exporter instead of Cloud Trace. The password is hashed with
+the lowest bcrypt cost, so that it does not hide the tracing overhead.
+
+Usage: python benchmarks/tracing_benchmark.py [--requests N] [--imports N]
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import bcrypt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, SERVICE_DIR)
+
+# pylint: disable=wrong-import-position
+import userservice
+from db import UserDb
+
+USERNAME = 'testuser'
+PASSWORD = 'bankofanthos'
+# what userservice.py and db.py imported at module load before
+EAGER_IMPORTS = [
+    'opentelemetry.trace',
+    'opentelemetry.sdk.trace.export',
+    'opentelemetry.sdk.trace',
+    'opentelemetry.propagate',
+    'opentelemetry.exporter.cloud_trace',
+    'opentelemetry.propagators.cloud_trace_propagator',
+    'opentelemetry.instrumentation.flask',
+    'opentelemetry.instrumentation.sqlalchemy',
+]
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+import userservice
+print(time.perf_counter() - start, sum(m.startswith('opentelemetry') for m in sys.modules))
+'''
+
+
+def time_import(preload, repeat):
+    """Return the median seconds to import the service, and the OpenTelemetry modules loaded"""
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, *preload],
+                                cwd=SERVICE_DIR, check=True, capture_output=True,
+                                text=True).stdout.split()
+        seconds.append(float(output[0]))
+    return statistics.median(seconds), int(output[1])
+
+
+def make_database(_uri, logger, enable_tracing=False):
+    """UserDb on a new in-memory SQLite database holding one user"""
+    users_db = UserDb('sqlite:///:memory:', logger, enable_tracing)
+    users_db.users_table.create(users_db.engine)
+    users_db.add_user({'accountid': '1011226111',
+                       'username': USERNAME,
+                       'passhash': bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(4)),
+                       'firstname': 'Test',
+                       'lastname': 'User',
+                       'birthday': datetime.date(2000, 1, 1),
+                       'timezone': 'GMT',
+                       'address': '1600 Amphitheatre Parkway',
+                       'state': 'CA',
+                       'zip': '94043',
+                       'ssn': '123'})
+    return users_db
+
+
+def make_private_key(directory):
+    """Create an RSA private key. Return its file path"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key_path = os.path.join(directory, 'jwtRS256.key')
+    with open(private_key_path, 'wb') as private_key_file:
+        private_key_file.write(key.private_bytes(serialization.Encoding.PEM,
+                                                 serialization.PrivateFormat.PKCS8,
+                                                 serialization.NoEncryption()))
+    return private_key_path
+
+
+def create_app(tracing, private_key_path):
+    """Create the service, with spans exported in memory if tracing"""
+    os.environ.update({'ENABLE_TRACING': 'true' if tracing else 'false',
+                       'PRIV_KEY_PATH': private_key_path,
+                       'PRIV_KEY_RELOAD_SECONDS': '0',
+                       'TOKEN_EXPIRY_SECONDS': '3600'})
+    # the requests are sent from this thread, which keeps the in-memory
+    # database's connection open
+    with patch('userservice.UserDb', make_database):
+        if not tracing:
+            return userservice.create_app()
+        # pylint: disable=import-outside-toplevel
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        with patch('opentelemetry.exporter.cloud_trace.CloudTraceSpanExporter',
+                   InMemorySpanExporter):
+            return userservice.create_app()
+
+
+def time_requests(app, count):
+    """Return the average seconds of GET /login"""
+    client = app.test_client()
+    query = {'username': USERNAME, 'password': PASSWORD}
+    start = time.perf_counter()
+    for _ in range(count):
+        assert client.get('/login', query_string=query).status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    """Time imports and requests with tracing disabled and enabled"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='requests per scenario')
+    parser.add_argument('--imports', type=int, default=5, help='imports per scenario')
+    args = parser.parse_args()
+
+    print(f'{"import":<36}{"ms":>10}{"otel modules":>14}')
+    for name, preload in [('previous eager imports', EAGER_IMPORTS), ('lazy imports', [])]:
+        seconds, modules = time_import(preload, args.imports)
+        print(f'{name:<36}{seconds * 1000:>10.1f}{modules:>14}')
+
+    private_key_path = make_private_key(tempfile.mkdtemp())
+
+    # tracing instruments process-wide, so it is enabled last
+    print(f'\n{"GET /login":<36}{"us/request":>10}')
+    for name, tracing in [('tracing disabled', False), ('tracing enabled', True)]:
+        app = create_app(tracing, private_key_path)
+        seconds = time_requests(app, args.requests)
+        print(f'{name:<36}{seconds * 1e6:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -19,7 +19,6 @@ db manages interactions with the underlying database
 import logging
 import random
 from sqlalchemy import create_engine, MetaData, Table, Column, String, Date, LargeBinary
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 
 class UserDb:
     """
@@ -27,7 +26,7 @@ class UserDb:
     to handle db operations for userservice
     """
 
-    def __init__(self, uri, logger=logging):
+    def __init__(self, uri, logger=logging, enable_tracing=False):
         self.engine = create_engine(uri)
         self.logger = logger
         self.users_table = Table(
@@ -46,11 +45,16 @@ class UserDb:
             Column('ssn', String, nullable=False),
         )
 
-        # Set up tracing autoinstrumentation for sqlalchemy
-        SQLAlchemyInstrumentor().instrument(
-            engine=self.engine,
-            service='users',
-        )
+        # Set up tracing autoinstrumentation for sqlalchemy. Without
+        # tracing, queries run on the bare engine and the instrumentor
+        # is not even imported.
+        if enable_tracing:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+            SQLAlchemyInstrumentor().instrument(
+                engine=self.engine,
+                service='users',
+            )
 
     def add_user(self, user):
         """Add a user to the database.
@@ -0,0 +1,103 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+jwt_keys loads the private key that signs JWTs and reloads it when it changes
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+
+def key_id(public_key):
+    """Return the 'kid' of a public key: a digest of its DER encoding."""
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.urlsafe_b64encode(hashlib.sha256(der).digest()[:12]).decode('ascii')
+
+
+class SigningKey:
+    """
+    SigningKey holds the parsed private key found at a path and signs tokens
+    with it.
+
+    Every token carries the 'kid' of the key in its header, so services that
+    know several public keys during a key rotation verify it with the right
+    one.
+    """
+
+    def __init__(self, path, logger=logging):
+        self.path = path
+        self.logger = logger
+        # (key, kid), replaced as a whole so signers never mix up the two
+        self._current = (None, None)
+        self._signature = None
+        self.reload()
+
+    @property
+    def kid(self):
+        """The id of the loaded key, None if no key could be loaded."""
+        return self._current[1]
+
+    def sign(self, payload):
+        """Return payload encoded as a RS256 JWT.
+
+        Raises: jwt.exceptions.InvalidKeyError if no key could be loaded
+        """
+        key, kid = self._current
+        if key is None:
+            raise jwt.exceptions.InvalidKeyError('no private key loaded')
+        return jwt.encode(payload, key, algorithm='RS256', headers={'kid': kid})
+
+    def reload(self):
+        """Parse the key again if the file at path changed.
+
+        Keeps the current key if the new one can not be parsed.
+        Return: True if a new key was loaded
+        """
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            with open(self.path, 'rb') as key_file:
+                key = serialization.load_pem_private_key(key_file.read(), password=None)
+        except (OSError, TypeError, ValueError) as err:
+            self.logger.error('Unable to load private key at %s: %s', self.path, str(err))
+            return False
+
+        self._signature = signature
+        self._current = (key, key_id(key.public_key()))
+        self.logger.info('Loaded private key %s.', self.kid)
+        return True
+
+    def watch(self, interval):
+        """Check for a changed key every interval seconds in a daemon thread."""
+        if interval <= 0:
+            return None
+        stopped = threading.Event()
+
+        def _watch():
+            while not stopped.wait(interval):
+                self.reload()
+
+        threading.Thread(target=_watch, name='jwt-key-watcher', daemon=True).start()
+        return stopped
@@ -89,3 +89,18 @@ class TestDb(unittest.TestCase):
         self.assertEqual('5', self.db.generate_accountid())
         # mock_rand was called twice, first generating 4, then 5
         self.assertEqual(2, mock_rand.call_count)
+
+    @patch('opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor')
+    def test_init_without_tracing_does_not_instrument_engine(self, mock_instrumentor):
+        """test that queries are not instrumented when tracing is disabled"""
+        UserDb('sqlite:///:memory:')
+        mock_instrumentor.assert_not_called()
+
+    @patch('opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor')
+    def test_init_with_tracing_instruments_engine(self, mock_instrumentor):
+        """test that queries are instrumented when tracing is enabled"""
+        db = UserDb('sqlite:///:memory:', enable_tracing=True)
+        mock_instrumentor.return_value.instrument.assert_called_once_with(
+            engine=db.engine,
+            service='users',
+        )
@@ -0,0 +1,90 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for jwt_keys module
+"""
+
+import os
+import tempfile
+import unittest
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from userservice.jwt_keys import SigningKey, key_id
+from userservice.tests.constants import (
+    EXAMPLE_PRIVATE_KEY,
+    EXAMPLE_PUBLIC_KEY,
+    generate_rsa_key,
+)
+
+EXAMPLE_PAYLOAD = {'user': 'jdoe', 'acct': '1234512345'}
+
+
+class TestSigningKey(unittest.TestCase):
+    """
+    Test cases for SigningKey
+    """
+
+    def setUp(self):
+        """Create a private key file"""
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        self.key_path = os.path.join(key_dir.name, 'privatekey')
+        self.write_key(EXAMPLE_PRIVATE_KEY)
+
+    def write_key(self, data):
+        """Write the key file and bump its mtime"""
+        with open(self.key_path, 'wb') as key_file:
+            key_file.write(data)
+        stat = os.stat(self.key_path)
+        os.utime(self.key_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_sign_adds_kid_of_public_key(self):
+        """test signed tokens verify with the public key and name it in 'kid'"""
+        token = SigningKey(self.key_path).sign(EXAMPLE_PAYLOAD)
+        expected_kid = key_id(serialization.load_pem_public_key(EXAMPLE_PUBLIC_KEY))
+        self.assertEqual(jwt.get_unverified_header(token)['kid'], expected_kid)
+        claims = jwt.decode(token, key=EXAMPLE_PUBLIC_KEY, algorithms='RS256')
+        self.assertEqual(claims, EXAMPLE_PAYLOAD)
+
+    def test_reload_switches_to_rotated_key(self):
+        """test a changed key file is used for new tokens"""
+        signing_key = SigningKey(self.key_path)
+        old_kid = signing_key.kid
+        # unchanged file is not parsed again
+        self.assertFalse(signing_key.reload())
+        new_private_key, new_public_key = generate_rsa_key()
+        self.write_key(new_private_key)
+        self.assertTrue(signing_key.reload())
+        self.assertNotEqual(old_kid, signing_key.kid)
+        token = signing_key.sign(EXAMPLE_PAYLOAD)
+        claims = jwt.decode(token, key=new_public_key, algorithms='RS256')
+        self.assertEqual(claims, EXAMPLE_PAYLOAD)
+
+    def test_invalid_key_file_keeps_previous_key(self):
+        """test a broken key file does not drop the loaded key"""
+        signing_key = SigningKey(self.key_path)
+        kid = signing_key.kid
+        self.write_key(b'foo')
+        self.assertFalse(signing_key.reload())
+        self.assertEqual(kid, signing_key.kid)
+
+    def test_sign_without_key_raises(self):
+        """test signing fails when no key could be loaded"""
+        signing_key = SigningKey(self.key_path + '.missing')
+        self.assertIsNone(signing_key.kid)
+        with self.assertRaises(jwt.exceptions.InvalidKeyError):
+            signing_key.sign(EXAMPLE_PAYLOAD)
@@ -17,9 +17,11 @@
 Tests for userservice
 """
 
+import os
 import random
+import tempfile
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 
 from sqlalchemy.exc import SQLAlchemyError
 import jwt
@@ -43,28 +45,33 @@ class TestUserservice(unittest.TestCase):
 
     def setUp(self):
         """Setup Flask TestClient and mock userdatabase"""
-        # mock opening files
-        with patch('userservice.userservice.open', mock_open(read_data='foo')):
-            # mock env vars
-            with patch(
-                'os.environ',
-                {
-                    'VERSION': '1',
-                    'TOKEN_EXPIRY_SECONDS': '3600',
-                    'PRIV_KEY_PATH': '1',
-                    'PUB_KEY_PATH': '1',
-                    'ENABLE_TRACING': 'false',
-                },
-            ):
-                # mock db module as MagicMock, context manager handles cleanup
-                with patch('userservice.userservice.UserDb') as mock_db:
-                    self.mocked_db = mock_db
-                    # get create flask app
-                    self.flask_app = create_app()
-                    # set testing config
-                    self.flask_app.config['TESTING'] = True
-                    # create test client
-                    self.test_app = self.flask_app.test_client()
+        # write the private key to a temporary key file
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        key_path = os.path.join(key_dir.name, 'privatekey')
+        with open(key_path, 'wb') as key_file:
+            key_file.write(EXAMPLE_PRIVATE_KEY)
+        # mock env vars
+        with patch(
+            'os.environ',
+            {
+                'VERSION': '1',
+                'TOKEN_EXPIRY_SECONDS': '3600',
+                'PRIV_KEY_PATH': key_path,
+                'PRIV_KEY_RELOAD_SECONDS': '0',
+                'PUB_KEY_PATH': '1',
+                'ENABLE_TRACING': 'false',
+            },
+        ):
+            # mock db module as MagicMock, context manager handles cleanup
+            with patch('userservice.userservice.UserDb') as mock_db:
+                self.mocked_db = mock_db
+                # get create flask app
+                self.flask_app = create_app()
+                # set testing config
+                self.flask_app.config['TESTING'] = True
+                # create test client
+                self.test_app = self.flask_app.test_client()
 
     def test_version_endpoint_returns_200_status_code_correct_version(self):
         """test if correct version is returned"""
@@ -197,8 +204,6 @@ class TestUserservice(unittest.TestCase):
         example_user = EXAMPLE_USER.copy()
         example_user_request = EXAMPLE_USER_REQUEST.copy()
         self.mocked_db.return_value.get_user.return_value = example_user
-        # set private key
-        self.flask_app.config['PRIVATE_KEY'] = EXAMPLE_PRIVATE_KEY
         # send request to test client
         response = self.test_app.get('/login', query_string=example_user_request)
         # assert 200 response
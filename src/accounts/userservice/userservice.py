@@ -24,20 +24,37 @@ import sys
 import re
 
 import bcrypt
-import jwt
 from flask import Flask, jsonify, request
 import bleach
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
-from opentelemetry import trace
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.propagate import set_global_textmap
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-
 from db import UserDb
+from json_codec import JsonCodec, JSONProvider
+from jwt_keys import SigningKey
+
+
+def setup_tracing(app):
+    """Export spans to Cloud Trace and instrument the Flask app.
+
+    OpenTelemetry is only imported here, so that a service running with
+    tracing disabled does not load it.
+    """
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.propagate import set_global_textmap
+    from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+    from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    trace.set_tracer_provider(TracerProvider())
+    cloud_trace_exporter = CloudTraceSpanExporter()
+    trace.get_tracer_provider().add_span_processor(
+        BatchSpanProcessor(cloud_trace_exporter)
+    )
+    set_global_textmap(CloudTraceFormatPropagator())
+    FlaskInstrumentor().instrument_app(app)
+
 
 def create_app():
     """Flask application factory to create instances
@@ -197,7 +214,7 @@ def create_app():
                 'exp': exp_time,
             }
             app.logger.debug('Creating jwt token.')
-            token = jwt.encode(payload, app.config['PRIVATE_KEY'], algorithm='RS256')
+            token = signing_key.sign(payload)
             app.logger.info('Login Successful.')
             return jsonify({'token': token}), 200
 
@@ -222,27 +239,28 @@ def create_app():
     app.logger.info('Starting userservice.')
 
     # Set up tracing and export spans to Cloud Trace.
-    if os.environ['ENABLE_TRACING'] == "true":
+    app.config['ENABLE_TRACING'] = os.environ['ENABLE_TRACING'] == "true"
+    if app.config['ENABLE_TRACING']:
         app.logger.info("✅ Tracing enabled.")
-        # Set up tracing and export spans to Cloud Trace
-        trace.set_tracer_provider(TracerProvider())
-        cloud_trace_exporter = CloudTraceSpanExporter()
-        trace.get_tracer_provider().add_span_processor(
-            BatchSpanProcessor(cloud_trace_exporter)
-        )
-        set_global_textmap(CloudTraceFormatPropagator())
-        FlaskInstrumentor().instrument_app(app)
+        setup_tracing(app)
     else:
         app.logger.info("🚫 Tracing disabled.")
 
     app.config['VERSION'] = os.environ.get('VERSION')
     app.config['EXPIRY_SECONDS'] = int(os.environ.get('TOKEN_EXPIRY_SECONDS'))
-    app.config['PRIVATE_KEY'] = open(os.environ.get('PRIV_KEY_PATH'), 'r').read()
-    app.config['PUBLIC_KEY'] = open(os.environ.get('PUB_KEY_PATH'), 'r').read()
+    app.config['PRIV_KEY_RELOAD_SECONDS'] = int(os.environ.get('PRIV_KEY_RELOAD_SECONDS', '30'))
+    # orjson if it is installed ('auto'), 'orjson' or 'json'
+    app.config['JSON_CODEC'] = os.environ.get('JSON_CODEC', 'auto')
+    app.json = JSONProvider(app, JsonCodec(app.config['JSON_CODEC']))
+
+    # Parse the private key once, and pick up a rotated key without a restart
+    signing_key = SigningKey(os.environ.get('PRIV_KEY_PATH'), app.logger)
+    signing_key.watch(app.config['PRIV_KEY_RELOAD_SECONDS'])
 
     # Configure database connection
     try:
-        users_db = UserDb(os.environ.get("ACCOUNTS_DB_URI"), app.logger)
+        users_db = UserDb(os.environ.get("ACCOUNTS_DB_URI"), app.logger,
+                          enable_tracing=app.config['ENABLE_TRACING'])
     except OperationalError:
         app.logger.critical("users_db database connection failed")
         sys.exit(1)
@@ -0,0 +1,142 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Adaptive admission control of the requests a worker serves"""
+
+import logging
+import threading
+import time
+
+CRITICAL = 'critical'
+NORMAL = 'normal'
+PRIORITIES = (CRITICAL, NORMAL)
+# weight of each latency sample in the moving averages of its route: the
+# recent latency follows about the last 10 requests, the baseline about the
+# last 100, so that a few slow requests (e.g. cache misses) are averaged out.
+# Until a route served that many, both are the mean of its requests.
+RECENT_WEIGHT = 0.1
+BASELINE_WEIGHT = 0.01
+# the limit shrinks by this factor while the recent latency is too high
+BACKOFF_FACTOR = 0.9
+
+
+class AdmissionTicket:
+    """An admitted request, to be passed back to AdmissionController.release"""
+
+    def __init__(self, route, priority, start, timed):
+        """Initialize the ticket of a request to route started at start"""
+        self.route = route
+        self.priority = priority
+        self.start = start
+        self.timed = timed
+
+
+class AdmissionController:  # pylint: disable=too-many-instance-attributes
+    """Thread-safe adaptive concurrency limit with two priorities.
+
+    Requests are admitted while fewer than ``limit`` are in flight;
+    normal requests only while fewer than ``limit * (1 - reserved)`` are,
+    so that the rest of the capacity is kept for critical ones.
+
+    The limit adapts to the latency of the requests served (AIMD), compared
+    per route with moving averages: when the recent latency exceeds
+    ``latency_tolerance`` times the baseline, the backends are saturated
+    and the limit shrinks by BACKOFF_FACTOR, at most once per recent
+    latency. It grows by one for every ``limit`` requests completing while
+    the recent latency is back below halfway to that threshold; in between
+    it holds, so that it does not oscillate around the threshold. The
+    limit only changes while it is at least half used: when fewer
+    requests are in flight, it is not what slows them down.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, *, initial_limit=20, min_limit=2, max_limit=100,
+                 latency_tolerance=2.0, reserved=0.25, logger=logging):
+        """Initialize with no request in flight"""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.recovery_ratio = 1 + (latency_tolerance - 1) / 2
+        self.reserved = reserved
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._next_decrease = 0.0
+        # route -> [recent latency, baseline latency, requests], moving averages
+        self._latencies = {}
+        self._counts = {'admitted_' + priority: 0 for priority in PRIORITIES}
+        self._counts.update({'rejected_' + priority: 0 for priority in PRIORITIES})
+        self._counts['decreases'] = 0
+
+    @property
+    def limit(self):
+        """The current concurrency limit"""
+        return int(self._limit)
+
+    def try_acquire(self, route, priority, *, timed=True):
+        """Return an AdmissionTicket if a request to route may be served now, else None
+
+        The latency of requests that are not timed, e.g. long downloads, does
+        not change the limit.
+        """
+        with self._lock:
+            capacity = self._limit if priority == CRITICAL else self._limit * (1 - self.reserved)
+            if self._in_flight >= max(capacity, 1):
+                self._counts['rejected_' + priority] += 1
+                return None
+            self._in_flight += 1
+            self._counts['admitted_' + priority] += 1
+        return AdmissionTicket(route, priority, time.monotonic(), timed)
+
+    def release(self, ticket):
+        """Record the end of an admitted request and adapt the limit to its latency"""
+        now = time.monotonic()
+        latency = now - ticket.start
+        with self._lock:
+            utilized = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+            if not ticket.timed:
+                return
+            recent, baseline = self._update_latencies(ticket.route, latency)
+            if not utilized:
+                return
+            if recent > baseline * self.latency_tolerance:
+                if now >= self._next_decrease and self._limit > self.min_limit:
+                    self._limit = max(self.min_limit, self._limit * BACKOFF_FACTOR)
+                    self._next_decrease = now + recent
+                    self._counts['decreases'] += 1
+                    self.logger.debug('Admission limit lowered to %d, %s takes %.3fs.',
+                                      self._limit, ticket.route, recent)
+            elif recent <= baseline * self.recovery_ratio:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _update_latencies(self, route, latency):
+        """Record latency and return the recent and baseline latency of route.
+
+        Caller holds the lock.
+        """
+        averages = self._latencies.setdefault(route, [0.0, 0.0, 0])
+        averages[2] += 1
+        averages[0] += max(RECENT_WEIGHT, 1 / averages[2]) * (latency - averages[0])
+        averages[1] += max(BASELINE_WEIGHT, 1 / averages[2]) * (latency - averages[1])
+        return averages[0], averages[1]
+
+    def stats(self):
+        """Return the limit, the requests in flight and the admission counters"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats['limit'] = round(self._limit, 2)
+            stats['in_flight'] = self._in_flight
+            return stats
@@ -14,9 +14,14 @@
 
 """API calls"""
 
-from requests import get
+import contextvars
+import time
+
+import requests
 from requests.exceptions import RequestException
 
+from metrics import observe_backend_call
+
 
 class ApiRequest:
     """Class for defining an API request"""
@@ -28,25 +33,106 @@ class ApiRequest:
         self.timeout = timeout
 
 
-class ApiCall:
+class ApiCall:  # pylint: disable=too-many-instance-attributes
     """Class for initializing and making an API call"""
 
-    def __init__(self, display_name, api_request, logger):
-        """Initialize an API call"""
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, display_name, api_request, logger, *, session=None, hedger=None,
+                 breaker=None, single_flight=None, timing=None, json_codec=None):
+        """Initialize an API call
+
+        If a session is given, the call is made through it so that the
+        underlying keep-alive connection can be reused. If a hedger is given,
+        a slow call is sent a second time (see hedging.Hedger). If a circuit
+        breaker is given, the call fails right away while it is open. If a
+        single_flight is given, fetch_json shares one backend call among
+        identical concurrent calls (see single_flight.SingleFlight). If a
+        timing is given, the time fetch_json takes is recorded in it (see
+        server_timing.ServerTiming). Responses are parsed with json_codec
+        if given (see json_codec.JsonCodec).
+        """
         self.display_name = display_name
         self.api_request = api_request
         self.logger = logger
+        self.session = session
+        self.hedger = hedger
+        self.breaker = breaker
+        self.single_flight = single_flight
+        self.timing = timing
+        self.json_codec = json_codec
 
     def make_call(self):
         """Making an API call"""
+        if self.hedger is not None:
+            return self.hedger.call(self.display_name, self._get)
+        return self._get()
+
+    def _get(self):
+        """Send the GET request, return the response or None on error"""
         response = None
+        if self.breaker is not None and not self.breaker.allow():
+            self.logger.error('Error getting %s: circuit breaker is %s',
+                              self.display_name, self.breaker.state)
+            return response
 
+        http = self.session if self.session is not None else requests
+        start = time.perf_counter()
         try:
-            response = get(url=self.api_request.url,
-                           headers=self.api_request.headers,
-                           timeout=self.api_request.timeout)
+            response = http.get(url=self.api_request.url,
+                                headers=self.api_request.headers,
+                                timeout=self.api_request.timeout)
         except (RequestException, ValueError) as err:
             self.logger.error('Error getting %s: %s',
                               self.display_name, str(err))
+        except BaseException:
+            # e.g. a gevent Timeout or GreenletExit: no outcome to record,
+            # but a half-open breaker must not wait for it forever
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+        observe_backend_call(self.display_name, time.perf_counter() - start, response)
 
+        if self.breaker is not None:
+            # a 4xx is the caller's fault, the backend itself is healthy
+            if response is None or response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
         return response
+
+    def fetch_json(self):
+        """Make the API call and return its parsed JSON response, None on error
+
+        With a single_flight, calls for the same URL and headers made while
+        one is running get its parsed response too. It is shared: callers
+        must not modify it.
+        """
+        if self.timing is None:
+            return self._fetch_shared()
+        with self.timing.phase(self.display_name):
+            return self._fetch_shared()
+
+    def _fetch_shared(self):
+        if self.single_flight is None:
+            return self._fetch_json()
+        key = (self.api_request.url, tuple(sorted(self.api_request.headers.items())))
+        return self.single_flight.do(key, self._fetch_json)
+
+    def _fetch_json(self):
+        response = self.make_call()
+        if not response:
+            return None
+        if self.json_codec is not None:
+            return self.json_codec.loads(response.content)
+        return response.json()
+
+    def fetch_json_async(self):
+        """Start fetch_json on the event loop of an async (gevent) worker
+
+        Returns a greenlet; its get() waits for and returns the result of
+        fetch_json. The caller's context, including the tracing span, is
+        carried over to the greenlet.
+        """
+        # gevent is only imported when the frontend serves in async mode
+        import gevent  # pylint: disable=import-outside-toplevel
+        return gevent.spawn(contextvars.copy_context().run, self.fetch_json)
@@ -0,0 +1,111 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the /home backend fan-out executor.
+
+Compares building a new executor for every page view (the previous
+behavior) with the process-wide shared executor, counting how many OS
+threads each strategy starts.
+
+Usage: python benchmarks/executor_benchmark.py [--requests N] [--threads N]
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+from opentelemetry import trace
+from traced_thread_pool_executor import TracedThreadPoolExecutor
+
+CALLS_PER_PAGE = 3
+
+
+def fake_backend_call(latency):
+    """Stand-in for ApiCall.make_call"""
+    time.sleep(latency)
+    return threading.current_thread().name
+
+
+def page_view_new_executor(tracer, latency):
+    """One page view, executor created and torn down per request"""
+    with TracedThreadPoolExecutor(tracer, max_workers=CALLS_PER_PAGE) as executor:
+        futures = [executor.submit(fake_backend_call, latency) for _ in range(CALLS_PER_PAGE)]
+        return [f.result() for f in concurrent.futures.as_completed(futures)]
+
+
+def page_view_shared_executor(executor, latency):
+    """One page view on the shared executor"""
+    futures = [executor.submit(fake_backend_call, latency) for _ in range(CALLS_PER_PAGE)]
+    return [f.result() for f in concurrent.futures.as_completed(futures)]
+
+
+def run(page_view, requests, threads):
+    """Serve requests page views from threads request threads"""
+    worker_names = set()
+    lock = threading.Lock()
+
+    def request_thread(count):
+        for _ in range(count):
+            names = page_view()
+            with lock:
+                worker_names.update(names)
+
+    per_thread = requests // threads
+    start = time.perf_counter()
+    request_threads = [threading.Thread(target=request_thread, args=(per_thread,))
+                       for _ in range(threads)]
+    for thread in request_threads:
+        thread.start()
+    for thread in request_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads, elapsed, len(worker_names)
+
+
+def main():
+    """Run both strategies and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='page views to simulate')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn request threads')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='simulated backend latency in seconds')
+    args = parser.parse_args()
+
+    tracer = trace.get_tracer(__name__)
+    shared = TracedThreadPoolExecutor(tracer, max_workers=CALLS_PER_PAGE * args.threads,
+                                      thread_name_prefix='fanout')
+    strategies = [
+        ('per-request executor',
+         lambda: page_view_new_executor(tracer, args.latency)),
+        ('shared executor',
+         lambda: page_view_shared_executor(shared, args.latency)),
+    ]
+
+    print(f'{"strategy":<22}{"requests":>10}{"req/s":>12}{"us/req":>10}{"threads started":>18}')
+    for name, page_view in strategies:
+        requests, elapsed, started = run(page_view, args.requests, args.threads)
+        print(f'{name:<22}{requests:>10}{requests / elapsed:>12.0f}'
+              f'{elapsed / requests * 1e6:>10.0f}{started:>18}')
+    print('shared executor stats:', shared.stats())
+    shared.shutdown()
+
+
+if __name__ == '__main__':
+    main()
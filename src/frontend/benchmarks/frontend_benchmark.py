@@ -0,0 +1,295 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the pages and forms of the frontend against stub backends.
+
+Starts the stub backends and the real frontend app in this process. For
+each scenario (GET /home, POST /payment, /login and /signup), concurrent
+clients then send requests through the app's WSGI interface for a fixed
+duration. Reports throughput, latency percentiles and the CPU time the
+frontend spent per request: the CPU time of the process minus that of
+the stubs, so it includes the small cost of the test clients.
+
+Clients, stubs and app share one interpreter, so the numbers are meant to
+be compared between runs on the same machine, not with production. Save
+a run with --save and compare a later one with --compare: it exits with
+status 1 if a scenario got slower than --tolerance allows, or failed
+requests when it did not before.
+
+Usage: python benchmarks/frontend_benchmark.py [--scenarios home,payment,login,signup]
+           [--clients N] [--duration S] [--latency S] [--service-latency SERVICE=S ...]
+           [--history-rows N] [--contacts N] [--env NAME=VALUE ...]
+           [--save FILE] [--compare FILE] [--tolerance PERCENT]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import stub_backends
+from serving_mode_benchmark import percentile
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, FRONTEND_DIR)
+
+# pylint: disable=wrong-import-position
+import frontend
+
+SIGNUP_FORM = {'password': 'password',
+               'password-repeat': 'password',
+               'firstname': 'Test',
+               'lastname': 'User',
+               'birthday': '2000-01-01',
+               'timezone': '0',
+               'address': '1 Main St',
+               'state': 'CA',
+               'zip': '94000',
+               'ssn': '111-22-3333'}
+# clients, stubs and app share the GIL: waiting for it would look like
+# saturated backends to admission control, which would shed the load measured
+DEFAULT_ENV = {'ADMISSION_CONTROL': 'false'}
+# metric -> True if higher is better. Regressions of these fail --compare,
+# p99 is reported only, being too noisy on short runs.
+GATED_METRICS = {'rps': True, 'p50_ms': False, 'cpu_ms': False}
+
+
+def home(client):
+    """View the home page"""
+    resp = client.get('/home')
+    return resp.status_code == 200 and len(resp.data) > 0
+
+
+def payment(client):
+    """Pay a contact one cent with a new form"""
+    resp = client.post('/payment', data={'account_num': stub_backends.CONTACT_ACCOUNT_ID,
+                                         'amount': '0.01',
+                                         'uuid': str(uuid.uuid4())})
+    return resp.status_code == 303 and 'successful' in resp.location
+
+
+def login(client):
+    """Log in with a username and password"""
+    resp = client.post('/login', data={'username': stub_backends.USERNAME,
+                                       'password': 'password'})
+    return resp.status_code == 302 and resp.location.endswith('/home')
+
+
+def signup(client):
+    """Create a user, which logs it in"""
+    resp = client.post('/signup', data=dict(SIGNUP_FORM, username=f'user{uuid.uuid4().hex[:12]}'))
+    return resp.status_code == 302 and resp.location.endswith('/home')
+
+
+SCENARIOS = {'home': home, 'payment': payment, 'login': login, 'signup': signup}
+
+
+def run_scenario(app, token, scenario, clients, duration):
+    """Send scenario from clients concurrent clients. Return (latencies, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client_loop():
+        client = app.test_client()
+        client.set_cookie('token', token)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = scenario(client)
+            except Exception:  # pylint: disable=broad-except
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors[0]
+
+
+def measure(app, token, state, name, args):
+    """Warm up, then run scenario name. Return its results as a dict"""
+    warmup = app.test_client()
+    warmup.set_cookie('token', token)
+    for _ in range(10):
+        SCENARIOS[name](warmup)
+    cpu_start = time.process_time()
+    stub_cpu_start = state.cpu_seconds
+    latencies, errors = run_scenario(app, token, SCENARIOS[name], args.clients, args.duration)
+    cpu = time.process_time() - cpu_start - (state.cpu_seconds - stub_cpu_start)
+    served = len(latencies) + errors
+    return {'requests': len(latencies),
+            'errors': errors,
+            'rps': len(latencies) / args.duration,
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p90_ms': percentile(latencies, 0.9) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'cpu_ms': cpu / served * 1000 if served else float('nan')}
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of every metric from baseline. Return the regressions."""
+    regressions = []
+    print(f'\n{"vs baseline":<10}' + ''.join(f'{metric:>11}' for metric in
+                                             ('rps', 'p50_ms', 'p99_ms', 'cpu_ms')))
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f'{name:<10}{"(not in baseline)":>22}')
+            continue
+        line = f'{name:<10}'
+        for metric in ('rps', 'p50_ms', 'p99_ms', 'cpu_ms'):
+            if not before[metric]:
+                line += f'{"n/a":>11}'
+                continue
+            change = (result[metric] - before[metric]) / before[metric] * 100
+            line += f'{change:>+10.1f}%'
+            higher_is_better = GATED_METRICS.get(metric)
+            if higher_is_better is None:
+                continue
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f'{name} {metric} {before[metric]:.2f} -> {result[metric]:.2f}')
+        print(line)
+        if result['errors'] and not before['errors']:
+            regressions.append(f'{name} failed {result["errors"]} requests')
+    return regressions
+
+
+def parse_env(values):
+    """Map NAME=VALUE strings to a dict"""
+    env = {}
+    for value in values or []:
+        name, sep, setting = value.partition('=')
+        if not sep:
+            raise ValueError(f'expected NAME=VALUE, got {value!r}')
+        env[name] = setting
+    return env
+
+
+def parse_args():
+    """Parse and check the command line. Return (args, scenario names, service latencies, env)"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='comma separated, among ' + ', '.join(SCENARIOS))
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='seconds added to every backend response')
+    parser.add_argument('--service-latency', action='append', metavar='SERVICE=S',
+                        help='seconds added to the responses of one of '
+                             + ', '.join(stub_backends.SERVICES))
+    parser.add_argument('--history-rows', type=int, default=100,
+                        help='transactions returned by transactionhistory')
+    parser.add_argument('--contacts', type=int, default=5)
+    parser.add_argument('--env', action='append', metavar='NAME=VALUE',
+                        help='frontend setting, e.g. RESPONSE_CACHE_TTL=0. '
+                             'ADMISSION_CONTROL is false unless set')
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='results saved by an earlier run')
+    parser.add_argument('--tolerance', type=float, default=15.0,
+                        help='percent a gated metric (rps, p50_ms, cpu_ms) may worsen')
+    args = parser.parse_args()
+    names = args.scenarios.split(',')
+    try:
+        service_latencies = stub_backends.parse_service_latencies(args.service_latency)
+        env = dict(DEFAULT_ENV, **parse_env(args.env))
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f'unknown scenarios {", ".join(unknown)}')
+    except ValueError as err:
+        parser.error(str(err))
+    return args, names, service_latencies, env
+
+
+def start_frontend(args, service_latencies, env):
+    """Start the stub backends and the frontend app. Return (server, state, app, token)"""
+    private_pem, public_key_path = stub_backends.generate_keys(tempfile.mkdtemp())
+    state = stub_backends.StubState(private_pem, args.latency, args.history_rows,
+                                    args.contacts, service_latencies)
+    server = stub_backends.start(state)
+    os.environ.update(stub_backends.frontend_env(f'127.0.0.1:{server.server_port}',
+                                                 public_key_path))
+    os.environ.update(env)
+    return server, state, frontend.create_app(), stub_backends.make_token(private_pem)
+
+
+def run_scenarios(app, token, state, names, args):
+    """Measure and print each scenario. Return the results by scenario"""
+    print(f'{"scenario":<10}{"req/s":>10}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}'
+          f'{"CPU ms":>10}{"errors":>8}')
+    results = {}
+    for name in names:
+        result = measure(app, token, state, name, args)
+        results[name] = result
+        print(f'{name:<10}{result["rps"]:>10.1f}{result["p50_ms"]:>10.1f}'
+              f'{result["p90_ms"]:>10.1f}{result["p99_ms"]:>10.1f}'
+              f'{result["cpu_ms"]:>10.2f}{result["errors"]:>8}')
+    return results
+
+
+def compare_with_file(results, settings, path, tolerance):
+    """Compare results with those saved in path. Exit with status 1 on regressions"""
+    with open(path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline['settings'] != json.loads(json.dumps(settings)):
+        print('\nwarning: the baseline was run with other settings: '
+              + json.dumps(baseline['settings']))
+    regressions = compare(results, baseline['results'], tolerance)
+    if regressions:
+        print(f'\nregressions beyond {tolerance:g}%:')
+        for regression in regressions:
+            print('  ' + regression)
+        sys.exit(1)
+
+
+def main():
+    """Run the scenarios, print a report, save or compare it"""
+    args, names, service_latencies, env = parse_args()
+    server, state, app, token = start_frontend(args, service_latencies, env)
+    settings = {'clients': args.clients,
+                'duration': args.duration,
+                'latency': args.latency,
+                'service_latencies': service_latencies,
+                'history_rows': args.history_rows,
+                'contacts': args.contacts,
+                'env': env}
+    print(f'{args.clients} clients, {args.duration:.0f}s per scenario, backend latency '
+          f'{args.latency * 1000:.0f}ms, {args.history_rows} history rows'
+          + ''.join(f', {name}={value}' for name, value in env.items()))
+    try:
+        results = run_scenarios(app, token, state, names, args)
+    finally:
+        server.shutdown()
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as save_file:
+            json.dump({'settings': settings, 'results': results}, save_file, indent=2)
+    if args.compare:
+        compare_with_file(results, settings, args.compare, args.tolerance)
+
+
+if __name__ == '__main__':
+    main()
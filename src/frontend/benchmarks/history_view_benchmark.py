@@ -0,0 +1,78 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark formatting the transaction history of the home page.
+
+Compares the previous per-row template helpers (two strptime calls and a
+Decimal per row) with building the history view model once.
+
+Usage: python benchmarks/history_view_benchmark.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+from decimal import Decimal
+
+from stub_backends import ACCOUNT_ID, make_history
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+from history_view import build_history, get_timezone
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def format_per_row(account_id, transactions):
+    """What index.html used to do for every row"""
+    rows = []
+    for trans in transactions:
+        month = datetime.datetime.strptime(trans['timestamp'], TIMESTAMP_FORMAT).strftime('%b')
+        day = datetime.datetime.strptime(trans['timestamp'], TIMESTAMP_FORMAT).strftime('%d')
+        amount = '${:0,.2f}'.format(abs(Decimal(trans['amount']) / 100))
+        sign = '+' if trans['toAccountNum'] == account_id else '-'
+        rows.append((month, day, sign + amount))
+    return rows
+
+
+def main():
+    """Time both ways of formatting and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100, help='transactions in the history')
+    parser.add_argument('--repeat', type=int, default=500, help='page views to simulate')
+    args = parser.parse_args()
+
+    transactions = make_history(args.rows)
+    timezone = get_timezone('America/New_York', datetime.timezone.utc)
+    strategies = [
+        ('per-row template helpers',
+         lambda: format_per_row(ACCOUNT_ID, transactions)),
+        ('history view model',
+         lambda: build_history(ACCOUNT_ID, transactions, [], timezone, TIMESTAMP_FORMAT)),
+    ]
+
+    print(f'{"strategy":<28}{"rows":>8}{"us/page":>12}')
+    for name, format_history in strategies:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            format_history()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<28}{args.rows:>8}{elapsed / args.repeat * 1e6:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
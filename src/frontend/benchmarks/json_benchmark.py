@@ -0,0 +1,115 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark parsing and serializing transaction histories as JSON.
+
+Decodes a transactionhistory response the previous way, with
+requests' Response.json(), and with both JSON codecs. Then encodes the
+/api/home body built from it with Flask's default provider and with both
+codecs plugged in as the app's JSON provider.
+
+Usage: python benchmarks/json_benchmark.py [--rows N [N ...]] [--repeat N]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import requests
+from flask import Flask
+
+from stub_backends import ACCOUNT_ID, make_history
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+from history_view import build_history
+from json_codec import JsonCodec, JSONProvider
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def make_response(body):
+    """A requests response holding body, as received from a backend"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = body  # pylint: disable=protected-access
+    return response
+
+
+def make_app(codec=None):
+    """A Flask app with the default JSON provider, or one using codec"""
+    app = Flask(__name__)
+    if codec is not None:
+        app.json = JSONProvider(app, codec)
+    return app
+
+
+def time_it(function, repeat):
+    """Return the average microseconds function takes"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    """Time decoding and encoding with every strategy and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000],
+                        help='transactions in the history')
+    parser.add_argument('--repeat', type=int, default=500, help='times each is run')
+    args = parser.parse_args()
+
+    codecs = [JsonCodec('json')]
+    if JsonCodec().name == 'orjson':
+        codecs.append(JsonCodec('orjson'))
+    else:
+        print('orjson is not installed, only the json module is measured\n')
+
+    print(f'{"decode history response":<36}{"rows":>8}{"KiB":>8}{"us":>10}')
+    for rows in args.rows:
+        body = JsonCodec('json').dumpb(make_history(rows))
+        response = make_response(body)
+        strategies = [('requests Response.json()', response.json)]
+        strategies += [(f'JsonCodec({codec.name!r}).loads', lambda c=codec, b=body: c.loads(b))
+                       for codec in codecs]
+        for name, decode in strategies:
+            print(f'{name:<36}{rows:>8}{len(body) / 1024:>8.0f}'
+                  f'{time_it(decode, args.repeat):>10.0f}')
+
+    print(f'\n{"encode /api/home":<36}{"rows":>8}{"KiB":>8}{"us":>10}')
+    for rows in args.rows:
+        history = build_history(ACCOUNT_ID, make_history(rows), [], datetime.timezone.utc,
+                                TIMESTAMP_FORMAT)
+        document = {'account_id': ACCOUNT_ID,
+                    'balance': 10000000,
+                    'transactions': [row._asdict() for row in history],
+                    'next_cursor': None,
+                    'contacts': []}
+        strategies = [('Flask default provider', make_app())]
+        strategies += [(f'JSONProvider({codec.name!r})', make_app(codec)) for codec in codecs]
+        for name, app in strategies:
+            with app.app_context():
+                size = len(app.json.response(document).data)
+                seconds = time_it(lambda a=app, d=document: a.json.response(d),
+                                  args.repeat)
+            print(f'{name:<36}{rows:>8}{size / 1024:>8.0f}{seconds:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
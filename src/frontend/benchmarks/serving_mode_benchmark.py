@@ -0,0 +1,155 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare /home throughput of the threaded and async serving modes.
+
+Starts the stub backends and, for each SERVING_MODE, one gunicorn worker
+running the real frontend. Concurrent clients then load /home for a fixed
+duration.
+
+Usage: python benchmarks/serving_mode_benchmark.py [--clients N] [--duration S]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from stub_backends import frontend_env
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def free_port():
+    """Return a TCP port nobody listens on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_stubs(latency, history_rows):
+    """Run the stub backends in a child process. Return (process, settings)"""
+    process = subprocess.Popen([sys.executable, os.path.join(FRONTEND_DIR, 'benchmarks',
+                                                             'stub_backends.py'),
+                                '--latency', str(latency),
+                                '--history-rows', str(history_rows)],
+                               stdout=subprocess.PIPE, text=True)
+    return process, json.loads(process.stdout.readline())
+
+
+def start_frontend(mode, stubs, extra_env=None):
+    """Run one gunicorn worker of the frontend. Return (process, base url)"""
+    port = free_port()
+    env = dict(os.environ)
+    env.update(frontend_env(stubs['address'], stubs['public_key_path']))
+    env.update({'SERVING_MODE': mode, 'BACKEND_POOL_SIZE': '100'})
+    env.update(extra_env or {})
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn',
+                                '-c', 'gunicorn.conf.py',
+                                '-b', f'127.0.0.1:{port}',
+                                '-w', '1',
+                                '--log-level', 'warning',
+                                'frontend:create_app()'],
+                               cwd=FRONTEND_DIR, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            if requests.get(base_url + '/ready', timeout=1).ok:
+                return process, base_url
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'frontend in {mode} mode did not start')
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def load(url, token, clients, duration):
+    """Hit url from clients concurrent clients. Return (latencies, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        session.cookies.set('token', token)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=30).status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors[0]
+
+
+def main():
+    """Benchmark both serving modes against the same stubs"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=100, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per mode')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='stub backend latency in seconds')
+    parser.add_argument('--history-rows', type=int, default=20)
+    parser.add_argument('--modes', default='threaded,async')
+    args = parser.parse_args()
+
+    stubs_process, stubs = start_stubs(args.latency, args.history_rows)
+    try:
+        print(f'{args.clients} clients, {args.duration:.0f}s per mode, '
+              f'backend latency {args.latency * 1000:.0f}ms, 1 worker')
+        print(f'{"mode":<10}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}')
+        for mode in args.modes.split(','):
+            frontend, base_url = start_frontend(mode, stubs)
+            try:
+                latencies, errors = load(base_url + '/home', stubs['token'],
+                                         args.clients, args.duration)
+            finally:
+                frontend.terminate()
+                frontend.wait()
+            print(f'{mode:<10}{len(latencies) / args.duration:>10.1f}'
+                  f'{percentile(latencies, 0.5) * 1000:>10.1f}'
+                  f'{percentile(latencies, 0.99) * 1000:>10.1f}{errors:>8}')
+    finally:
+        stubs_process.terminate()
+        stubs_process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark how long create_app() takes to return.
+
+Times the app creation against a metadata server that never answers (as
+off GCP), one that answers, and with the values already cached on disk,
+next to the previous blocking lookups, one after the other, each with the
+full BACKEND_TIMEOUT.
+
+Usage: python benchmarks/startup_benchmark.py [--repeat N] [--backend-timeout S]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from stub_backends import frontend_env, generate_keys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+import frontend
+
+
+class MetadataHandler(BaseHTTPRequestHandler):
+    """Answers the two lookups of the frontend like the GCE metadata server"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return the cluster name or zone"""
+        answers = {'/computeMetadata/v1/instance/attributes/cluster-name': 'benchmark-cluster',
+                   '/computeMetadata/v1/instance/zone': 'projects/1/zones/benchmark-zone'}
+        body = answers.get(self.path, '').encode()
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the benchmark output quiet"""
+
+
+def silent_server():
+    """Return a listening socket that never answers, and its address"""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(16)
+    return sock, f'127.0.0.1:{sock.getsockname()[1]}'
+
+
+def answering_server():
+    """Return a running metadata server, and its address"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MetadataHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'127.0.0.1:{server.server_port}'
+
+
+def blocking_lookups(metadata_server, timeout):
+    """What create_app used to do: both lookups in turn, waiting for each"""
+    url = f'http://{metadata_server}/computeMetadata/v1/'
+    for path in ('instance/attributes/cluster-name', 'instance/zone'):
+        try:
+            requests.get(url + path, headers={'Metadata-Flavor': 'Google'}, timeout=timeout)
+        except requests.exceptions.RequestException:
+            pass
+
+
+def fill_cache(metadata_server, directory):
+    """Let the lookups of a first run cache the values on disk. Return the path"""
+    cache_path = os.path.join(directory, 'metadata.json')
+    for thread in frontend.InstanceMetadata(metadata_server, {}, cache_path=cache_path).start():
+        thread.join()
+    return cache_path
+
+
+def create_app(metadata_server, cache_path):
+    """Create the app like a new worker does"""
+    os.environ['METADATA_SERVER'] = metadata_server
+    os.environ['METADATA_CACHE_PATH'] = cache_path
+    frontend.create_app()
+
+
+def main():
+    """Time app creation in every scenario and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='apps to create per scenario')
+    parser.add_argument('--backend-timeout', type=float, default=4.0,
+                        help='BACKEND_TIMEOUT the previous lookups waited for')
+    args = parser.parse_args()
+
+    key_dir = tempfile.mkdtemp()
+    _, public_key_path = generate_keys(key_dir)
+    os.environ.update(frontend_env('127.0.0.1:9', public_key_path))
+    silent, silent_address = silent_server()
+    answering, answering_address = answering_server()
+    warm_cache = fill_cache(answering_address, key_dir)
+
+    # the blocking lookups take seconds, once is enough
+    scenarios = [
+        ('blocking lookups, no answer',
+         lambda: blocking_lookups(silent_address, args.backend_timeout), 1),
+        ('create_app, no answer',
+         lambda: create_app(silent_address, ''), args.repeat),
+        ('create_app, answering',
+         lambda: create_app(answering_address, ''), args.repeat),
+        ('create_app, cached on disk',
+         lambda: create_app(silent_address, warm_cache), args.repeat),
+    ]
+
+    print(f'{"scenario":<32}{"ms":>10}')
+    for name, run, repeat in scenarios:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<32}{elapsed / repeat * 1000:>10.1f}')
+    silent.close()
+    answering.shutdown()
+
+
+if __name__ == '__main__':
+    main()
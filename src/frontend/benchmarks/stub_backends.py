@@ -0,0 +1,279 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lightweight stand-ins for the frontend's backend services.
+
+A single HTTP server answers the balancereader, transactionhistory,
+contacts, userservice and ledgerwriter APIs used by the frontend, with a
+configurable artificial latency, per service if need be, and payload
+size. It also creates the RSA key pair that signs the JWTs handed out by
+its /login endpoint.
+
+Usage: python benchmarks/stub_backends.py [--port N] [--latency S] [--history-rows N]
+                                          [--service-latency SERVICE=S ...]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+LOCAL_ROUTING_NUM = '883745000'
+ACCOUNT_ID = '1011226111'
+USERNAME = 'testuser'
+CONTACT_ACCOUNT_ID = '1033623433'
+SERVICES = ('balancereader', 'transactionhistory', 'contacts', 'userservice', 'ledgerwriter')
+
+
+def generate_keys(directory):
+    """Create an RSA key pair. Return (private key PEM, public key file path)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(serialization.Encoding.PEM,
+                                    serialization.PrivateFormat.PKCS8,
+                                    serialization.NoEncryption())
+    public_pem = key.public_key().public_bytes(serialization.Encoding.PEM,
+                                               serialization.PublicFormat.SubjectPublicKeyInfo)
+    public_key_path = os.path.join(directory, 'jwtRS256.key.pub')
+    with open(public_key_path, 'wb') as public_key_file:
+        public_key_file.write(public_pem)
+    return private_pem, public_key_path
+
+
+def make_token(private_pem, username=USERNAME, account_id=ACCOUNT_ID, expiry_seconds=3600):
+    """Sign a token with the same claims as userservice, with a PEM or a loaded key"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    payload = {'user': username,
+               'acct': account_id,
+               'name': 'Test User',
+               'iat': now,
+               'exp': now + datetime.timedelta(seconds=expiry_seconds)}
+    return jwt.encode(payload, private_pem, algorithm='RS256')
+
+
+def make_history(rows, account_id=ACCOUNT_ID):
+    """Build a transaction history of rows entries, newest first"""
+    first = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    history = []
+    for i in range(rows):
+        incoming = i % 2 == 0
+        timestamp = first + datetime.timedelta(minutes=rows - i)
+        history.append({
+            'transactionId': rows - i,
+            'fromAccountNum': CONTACT_ACCOUNT_ID if incoming else account_id,
+            'fromRoutingNum': LOCAL_ROUTING_NUM,
+            'toAccountNum': account_id if incoming else CONTACT_ACCOUNT_ID,
+            'toRoutingNum': LOCAL_ROUTING_NUM,
+            'amount': 1000 + i,
+            'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + '+00:00',
+        })
+    return history
+
+
+def service_of(method, path):
+    """Name of the backend service answering method on path"""
+    if path.startswith('/balances/'):
+        return 'balancereader'
+    if path.startswith('/transactions'):
+        return 'ledgerwriter' if method == 'POST' else 'transactionhistory'
+    if path.startswith('/contacts/'):
+        return 'contacts'
+    return 'userservice'
+
+
+def parse_service_latencies(values):
+    """Map SERVICE=SECONDS strings to {service: seconds}"""
+    latencies = {}
+    for value in values or []:
+        service, _, seconds = value.partition('=')
+        if service not in SERVICES:
+            raise ValueError(f'unknown service {service!r}, expected one of {", ".join(SERVICES)}')
+        latencies[service] = float(seconds)
+    return latencies
+
+
+class StubState:  # pylint: disable=too-many-instance-attributes
+    """Data served by the stubs, shared by all handler threads"""
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, private_pem, latency=0.0, history_rows=20, contacts=5,
+                 service_latencies=None):
+        self.private_pem = private_pem
+        # loading the PEM checks the key, which takes longer than signing
+        self.signing_key = serialization.load_pem_private_key(private_pem, password=None)
+        self.latency = latency
+        self.service_latencies = dict(service_latencies or {})
+        self.lock = threading.Lock()
+        self.balance = 10000000
+        self.history = make_history(history_rows)
+        # encoded once: histories of many thousand rows would otherwise make
+        # the stubs, not the frontend, the bottleneck
+        self.history_body = json.dumps(self.history).encode()
+        self.contacts = [{'label': f'Contact {i}',
+                          'account_num': f'{int(CONTACT_ACCOUNT_ID) + i:010d}',
+                          'routing_num': LOCAL_ROUTING_NUM,
+                          'is_external': False} for i in range(contacts)]
+        self.requests = {}
+        # CPU seconds spent by the handler threads, to tell them apart from
+        # the frontend's when both run in one process
+        self.cpu_seconds = 0.0
+
+    def latency_of(self, service):
+        """Seconds added to the responses of service"""
+        return self.service_latencies.get(service, self.latency)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes the backend APIs the frontend calls"""
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, Nagle's algorithm would hold
+    # the body back until the client's delayed ACK
+    disable_nagle_algorithm = True
+    state = None
+
+    def handle_one_request(self):
+        """Serve one request, counting the CPU time it took"""
+        cpu_start = time.thread_time()
+        try:
+            super().handle_one_request()
+        finally:
+            with self.state.lock:
+                self.state.cpu_seconds += time.thread_time() - cpu_start
+
+    # pylint: disable=invalid-name
+    def do_GET(self):
+        """Serve balances, transaction history, contacts and login"""
+        path = self._begin('GET')
+        if path.startswith('/balances/'):
+            self._send_json(200, self.state.balance)
+        elif path.startswith('/transactions/'):
+            self._send_json(200, self.state.history_body)
+        elif path.startswith('/contacts/'):
+            self._send_json(200, self.state.contacts)
+        elif path == '/login':
+            self._send_json(200, {'token': make_token(self.state.signing_key)})
+        elif path == '/ready':
+            self._send_json(200, 'ok')
+        else:
+            self._send_json(404, 'not found')
+
+    def do_POST(self):
+        """Accept new transactions, contacts and users"""
+        path = self._begin('POST')
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if path == '/transactions':
+            transaction = json.loads(body)
+            with self.state.lock:
+                if transaction['toAccountNum'] == ACCOUNT_ID:
+                    self.state.balance += transaction['amount']
+                else:
+                    self.state.balance -= transaction['amount']
+            self._send_json(201, 'ok')
+        elif path.startswith('/contacts/') or path == '/users':
+            self._send_json(201, {})
+        else:
+            self._send_json(404, 'not found')
+
+    def _begin(self, method):
+        """Count the request and apply the artificial latency"""
+        path = self.path.split('?')[0]
+        key = f'{method} /{path.split("/")[1]}'
+        with self.state.lock:
+            self.state.requests[key] = self.state.requests.get(key, 0) + 1
+        latency = self.state.latency_of(service_of(method, path))
+        if latency:
+            time.sleep(latency)
+        return path
+
+    def _send_json(self, status, body):
+        """Send body, encoded as JSON unless it is bytes already"""
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the benchmark output quiet"""
+
+
+def start(state, port=0):
+    """Serve state in a background thread. Return the server"""
+    handler = type('BoundStubHandler', (StubHandler,), {'state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def frontend_env(address, public_key_path):
+    """Environment variables pointing a frontend at the stubs"""
+    return {'TRANSACTIONS_API_ADDR': address,
+            'BALANCES_API_ADDR': address,
+            'HISTORY_API_ADDR': address,
+            'CONTACTS_API_ADDR': address,
+            'USERSERVICE_API_ADDR': address,
+            'PUB_KEY_PATH': public_key_path,
+            'LOCAL_ROUTING_NUM': LOCAL_ROUTING_NUM,
+            'ENABLE_TRACING': 'false',
+            # don't wait on a metadata server that isn't there
+            'METADATA_SERVER': '127.0.0.1:9',
+            'CLUSTER_NAME': 'benchmark',
+            'POD_ZONE': 'benchmark'}
+
+
+def main():
+    """Run the stubs in the foreground"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to every response')
+    parser.add_argument('--service-latency', action='append', metavar='SERVICE=S',
+                        help=f'seconds added to the responses of one of {", ".join(SERVICES)}')
+    parser.add_argument('--history-rows', type=int, default=20)
+    parser.add_argument('--contacts', type=int, default=5)
+    parser.add_argument('--key-dir', default=None,
+                        help='directory for the generated public key (default: a temp dir)')
+    args = parser.parse_args()
+    try:
+        service_latencies = parse_service_latencies(args.service_latency)
+    except ValueError as err:
+        parser.error(str(err))
+
+    private_pem, public_key_path = generate_keys(args.key_dir or tempfile.mkdtemp())
+    state = StubState(private_pem, args.latency, args.history_rows, args.contacts,
+                      service_latencies)
+    server = start(state, args.port)
+    # first line is machine readable so that benchmarks can spawn the stubs
+    print(json.dumps({'address': f'127.0.0.1:{server.server_port}',
+                      'public_key_path': public_key_path,
+                      'token': make_token(private_pem)}), flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the cost of tracing in the frontend.
+
+Times importing the frontend in fresh interpreters, next to the previous
+eager OpenTelemetry imports, then /home against the stub backends with
+tracing disabled and enabled. Enabled spans go to an in-memory exporter
+instead of Cloud Trace. The response cache is off, so that every page
+view fans out to the backends.
+
+Usage: python benchmarks/tracing_benchmark.py [--requests N] [--imports N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import stub_backends
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, FRONTEND_DIR)
+
+# pylint: disable=wrong-import-position
+import frontend
+
+# what frontend.py and traced_thread_pool_executor.py imported at module load before
+EAGER_IMPORTS = [
+    'opentelemetry.trace',
+    'opentelemetry.context',
+    'opentelemetry.sdk.trace.export',
+    'opentelemetry.sdk.trace',
+    'opentelemetry.propagate',
+    'opentelemetry.exporter.cloud_trace',
+    'opentelemetry.propagators.cloud_trace_propagator',
+    'opentelemetry.instrumentation.flask',
+    'opentelemetry.instrumentation.requests',
+    'opentelemetry.instrumentation.jinja2',
+]
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+import frontend
+print(time.perf_counter() - start, sum(m.startswith('opentelemetry') for m in sys.modules))
+'''
+
+
+def time_import(preload, repeat):
+    """Return the median seconds to import the frontend, and the OpenTelemetry modules loaded"""
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, *preload],
+                                cwd=FRONTEND_DIR, check=True, capture_output=True,
+                                text=True).stdout.split()
+        seconds.append(float(output[0]))
+    return statistics.median(seconds), int(output[1])
+
+
+def create_app(tracing):
+    """Create the frontend, with spans exported in memory if tracing"""
+    os.environ['ENABLE_TRACING'] = 'true' if tracing else 'false'
+    if not tracing:
+        return frontend.create_app()
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    with patch('opentelemetry.exporter.cloud_trace.CloudTraceSpanExporter',
+               InMemorySpanExporter):
+        return frontend.create_app()
+
+
+def time_requests(app, token, count):
+    """Return the average seconds of GET /home"""
+    client = app.test_client()
+    client.set_cookie('token', token)
+    start = time.perf_counter()
+    for _ in range(count):
+        assert client.get('/home').status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    """Time imports and page views with tracing disabled and enabled"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='page views per scenario')
+    parser.add_argument('--imports', type=int, default=5, help='imports per scenario')
+    args = parser.parse_args()
+
+    print(f'{"import":<36}{"ms":>10}{"otel modules":>14}')
+    for name, preload in [('previous eager imports', EAGER_IMPORTS), ('lazy imports', [])]:
+        seconds, modules = time_import(preload, args.imports)
+        print(f'{name:<36}{seconds * 1000:>10.1f}{modules:>14}')
+
+    private_pem, public_key_path = stub_backends.generate_keys(tempfile.mkdtemp())
+    server = stub_backends.start(stub_backends.StubState(private_pem))
+    os.environ.update(stub_backends.frontend_env(f'127.0.0.1:{server.server_port}',
+                                                 public_key_path))
+    os.environ['RESPONSE_CACHE_TTL'] = '0'
+    token = stub_backends.make_token(private_pem)
+
+    # tracing instruments process-wide, so it is enabled last
+    print(f'\n{"GET /home":<36}{"us/request":>10}')
+    for name, tracing in [('tracing disabled', False), ('tracing enabled', True)]:
+        app = create_app(tracing)
+        seconds = time_requests(app, token, args.requests)
+        print(f'{name:<36}{seconds * 1e6:>10.0f}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
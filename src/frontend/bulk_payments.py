@@ -0,0 +1,102 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parsing and validation of bulk payments"""
+
+import csv
+import io
+import re
+import uuid
+from collections import namedtuple
+from decimal import Decimal, DecimalException
+
+# One payment of a batch. row counts from 1, amount is in cents.
+Transfer = namedtuple('Transfer', ['row', 'account_num', 'amount', 'uuid'])
+
+ACCOUNT_NUM = re.compile(r'^[0-9]{10}$')
+# payments without a uuid of their own get one derived from the batch id
+# and their row, so that sending a batch again does not pay twice
+BATCH_NAMESPACE = uuid.UUID('8f1c5a3e-2b7d-4c61-9e0a-5d4b3c2a1f60')
+
+
+def parse_rows(data, content_type):
+    """Return the payments of a JSON or CSV document as a list of dicts
+
+    JSON is a list of objects, or an object holding it in "payments". CSV
+    has a header row. Both have account_num, amount and optionally uuid.
+
+    Raises:
+        ValueError: if the document cannot be parsed
+    """
+    if content_type == 'application/json':
+        document = data
+        if isinstance(document, dict):
+            document = document.get('payments')
+        if not isinstance(document, list) or not all(isinstance(row, dict) for row in document):
+            raise ValueError('expected a list of payments')
+        return document
+    try:
+        reader = csv.DictReader(io.StringIO(data))
+        if reader.fieldnames is None or not {'account_num', 'amount'} <= set(reader.fieldnames):
+            raise ValueError('expected a CSV header with account_num and amount')
+        return list(reader)
+    except csv.Error as err:
+        raise ValueError(f'invalid CSV: {err}') from err
+
+
+def derived_uuid(account_id, batch_id, row):
+    """Return the idempotency uuid of row of batch batch_id of account_id
+
+    Batch ids are chosen by clients, so two accounts may use the same one.
+    """
+    return str(uuid.uuid5(BATCH_NAMESPACE, f'{account_id}/{batch_id}/{row}'))
+
+
+def validate(rows, account_id, batch_id, max_rows):
+    """Check every payment before any is sent
+
+    Return: (transfers, errors) - the Transfers, and a list of
+            {'row': n, 'error': message}, empty if all payments are valid
+    """
+    if not rows:
+        return [], [{'row': 0, 'error': 'no payments'}]
+    if len(rows) > max_rows:
+        return [], [{'row': 0, 'error': f'more than {max_rows} payments'}]
+    transfers = []
+    errors = []
+    seen_uuids = set()
+    for row, fields in enumerate(rows, start=1):
+        account_num = str(fields.get('account_num') or '').strip()
+        amount = str(fields.get('amount') or '').strip()
+        request_uuid = (str(fields.get('uuid') or '').strip()
+                        or derived_uuid(account_id, batch_id, row))
+        error = None
+        try:
+            cents = Decimal(amount) * 100
+        except DecimalException:
+            cents = None
+        if not ACCOUNT_NUM.match(account_num):
+            error = 'account_num must be 10 digits'
+        elif account_num == account_id:
+            error = 'cannot pay your own account'
+        elif cents is None or not cents.is_finite() or cents <= 0 or cents != int(cents):
+            error = f'{amount!r} is not a positive amount with at most 2 decimals'
+        elif request_uuid in seen_uuids:
+            error = 'duplicate uuid'
+        if error is not None:
+            errors.append({'row': row, 'error': error})
+            continue
+        seen_uuids.add(request_uuid)
+        transfers.append(Transfer(row, account_num, int(cents), request_uuid))
+    return transfers, errors
@@ -0,0 +1,155 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Circuit breakers for backend calls"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# counter of the transitions into each state
+TRANSITION_COUNTERS = {CLOSED: 'closed', OPEN: 'opened', HALF_OPEN: 'half_opened'}
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Thread-safe circuit breaker of one backend.
+
+    The breaker is closed while the backend works. After
+    ``failure_threshold`` failures in a row it opens and calls are refused
+    without being sent. After ``reset_timeout`` seconds it is half-open:
+    one trial call is let through, its success closes the breaker, its
+    failure opens it again.
+
+    ``on_transition(name, state)`` is called on every state change, e.g.
+    to export it as a metric.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, name, failure_threshold=5, reset_timeout=10, logger=logging,
+                 on_transition=None):
+        """Initialize a closed circuit breaker"""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.logger = logger
+        self.on_transition = on_transition
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._counts = {'rejected': 0, 'opened': 0, 'half_opened': 0, 'closed': 0}
+
+    @property
+    def state(self):
+        """closed, open or half_open"""
+        return self._state
+
+    def allow(self):
+        """Return True if a call may be sent now"""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self._counts['rejected'] += 1
+            return False
+
+    def record_success(self):
+        """Record a call that worked"""
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """Record a call that failed"""
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and
+                                            self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def release(self):
+        """Record a call that ended without an outcome, e.g. it was interrupted.
+
+        A half-open breaker lets another trial call through.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def _transition(self, state):
+        """Caller holds the lock."""
+        self.logger.warning('Circuit breaker for %s: %s -> %s.', self.name, self._state, state)
+        self._state = state
+        self._counts[TRANSITION_COUNTERS[state]] += 1
+        if self.on_transition is not None:
+            self.on_transition(self.name, state)
+
+    def stats(self):
+        """Return the state and the number of state changes and refused calls"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats['state'] = self._state
+            stats['consecutive_failures'] = self._failures
+            return stats
+
+
+class CircuitBreakers:
+    """Thread-safe set of circuit breakers, one per backend.
+
+    Like for SessionPool, a backend is identified by the scheme, host and
+    port of the URL being called. It is the name of its breaker.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=10, logger=logging,
+                 on_transition=None):
+        """Initialize a set of circuit breakers"""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.logger = logger
+        self.on_transition = on_transition
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def breaker_for(self, url):
+        """Return the circuit breaker of the backend serving url"""
+        parts = urlsplit(url)
+        backend = f'{parts.scheme}://{parts.netloc}'
+        with self._lock:
+            breaker = self._breakers.get(backend)
+            if breaker is None:
+                breaker = CircuitBreaker(backend, self.failure_threshold,
+                                         self.reset_timeout, self.logger,
+                                         self.on_transition)
+                self._breakers[backend] = breaker
+            return breaker
+
+    def stats(self):
+        """Return the stats of every breaker by backend"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {backend: breaker.stats() for backend, breaker in breakers.items()}
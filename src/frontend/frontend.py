@@ -14,41 +14,94 @@
 
 """Web service for frontend
 """
+# pylint: disable=too-many-lines
 
 # Module imports
-import concurrent.futures
 import datetime
-import json
+import functools
+import hashlib
 import logging
 import os
 import socket
+import uuid
+from contextlib import nullcontext
 from decimal import Decimal, DecimalException
-from time import sleep
+from time import perf_counter, sleep
+from urllib.parse import urlsplit
 
 import requests
 from requests.exceptions import HTTPError, RequestException
 import jwt
-from flask import Flask, abort, jsonify, make_response, redirect, \
-    render_template, request, url_for
-
-from opentelemetry import trace
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.propagate import set_global_textmap
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.instrumentation.jinja2 import Jinja2Instrumentor
+from flask import Flask, Response, abort, before_render_template, g, has_app_context, jsonify, \
+    make_response, redirect, render_template, request, stream_template, \
+    stream_with_context, template_rendered, url_for
 
 # Local imports
+from admission_control import CRITICAL, NORMAL, AdmissionController
 from api_call import ApiCall, ApiRequest
+from bulk_payments import parse_rows, validate as validate_payments
+from circuit_breaker import CircuitBreakers
+from hedging import Hedger
+from history_view import build_history, contact_labels, format_cents, get_timezone, \
+    history_page
+from idempotency import IdempotencyStore
+from instance_metadata import InstanceMetadata
+from json_codec import JsonCodec, JSONProvider
+from jwt_keys import PublicKeySet
+import metrics
+from propagation import PropagationWaiter
+from response_cache import ResponseCache
+from server_timing import ServerTiming
+from session_pool import SessionPool
+from single_flight import SingleFlight
+from static_assets import StaticAssets, compress_response, etag_matches
+from token_cache import VerifiedTokenCache
 from traced_thread_pool_executor import TracedThreadPoolExecutor
+from transaction_export import export_rows, iter_json_array, to_csv, to_ndjson
 
 # Local constants
 BALANCE_NAME = "balance"
 CONTACTS_NAME = "contacts"
 TRANSACTION_LIST_NAME = "transaction_list"
+# endpoints always served, even when admission control sheds load
+ADMISSION_EXEMPT = frozenset(['prometheus_metrics', 'readiness', 'static', 'stats', 'version',
+                              'whereami'])
+# endpoints whose latency depends on the data sent, not on the load
+ADMISSION_UNTIMED = frozenset(['export_transactions'])
+# characters of a streamed page sent at once
+STREAM_CHUNK_SIZE = 8192
+# bytes of the transactionhistory response read at once by an export
+EXPORT_CHUNK_SIZE = 65536
+
+
+def setup_tracing(app):
+    """Export spans to Cloud Trace, instrument Flask, jinja and requests.
+
+    OpenTelemetry is only imported here, so that a frontend running with
+    tracing disabled does not load it. Returns the tracer.
+    """
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.propagate import set_global_textmap
+    from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+    from opentelemetry.propagators.cloud_trace_propagator import CloudTraceFormatPropagator
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    from opentelemetry.instrumentation.jinja2 import Jinja2Instrumentor
+    trace.set_tracer_provider(TracerProvider())
+    cloud_trace_exporter = CloudTraceSpanExporter()
+    trace.get_tracer_provider().add_span_processor(
+        BatchSpanProcessor(cloud_trace_exporter)
+    )
+    set_global_textmap(CloudTraceFormatPropagator())
+    # Add tracing auto-instrumentation for Flask, jinja and requests
+    FlaskInstrumentor().instrument_app(app)
+    RequestsInstrumentor().instrument()
+    Jinja2Instrumentor().instrument()
+    return trace.get_tracer(__name__)
+
 
 # pylint: disable-msg=too-many-locals
 # pylint: disable-msg=too-many-branches
@@ -56,7 +109,8 @@ def create_app():
     """Flask application factory to create instances
     of the Frontend Flask App
     """
-    app = Flask(__name__)
+    # static files are served by the 'static' route below
+    app = Flask(__name__, static_folder=None)
 
     # Disabling unused-variable for lines with route decorated functions
     # as pylint thinks they are unused
@@ -81,7 +135,169 @@ def create_app():
         Returns the cluster name + zone name where this Pod is running.
 
         """
-        return "Cluster: " + cluster_name + ", Pod: " + pod_name + ", Zone: " + pod_zone, 200
+        return ("Cluster: " + instance_metadata.cluster_name + ", Pod: " + pod_name
+                + ", Zone: " + instance_metadata.pod_zone), 200
+
+    @app.route('/static/<path:filename>', endpoint='static')
+    def static_file(filename):
+        """
+        Serves a static asset, precompressed if the client accepts it.
+        """
+        return static_assets.response(filename, request)
+
+    @app.after_request
+    def compress(response):
+        """
+        Gzips dynamic responses of at least COMPRESS_MIN_SIZE bytes.
+        """
+        return compress_response(response, request, app.config['COMPRESS_MIN_SIZE'])
+
+    @app.route('/stats', methods=['GET'])
+    def stats():
+        """
+        Returns runtime counters of the worker process serving the request as
+        JSON, with backends named by service rather than by address.
+
+        Fails if STATS_ENDPOINT is not enabled: /stats is not authenticated.
+        """
+        if not app.config['STATS_ENDPOINT']:
+            return abort(404)
+        backend_pool = backend_sessions.stats()
+        backend_pool['backends'] = _by_service(backend_pool['backends'])
+        return jsonify({'admission_control': (admission.stats()
+                                              if admission is not None else None),
+                        'backend_pool': backend_pool,
+                        'bulk_executor': bulk_executor.stats(),
+                        'circuit_breakers': _by_service(backend_breakers.stats()),
+                        'fanout_executor': fanout_executor.stats(),
+                        'hedging': hedger.stats() if hedger is not None else None,
+                        'idempotency': submissions.stats(),
+                        'response_cache': response_cache.stats(),
+                        'single_flight': (single_flight.stats()
+                                          if single_flight is not None else None),
+                        'transaction_propagation': propagation.stats(),
+                        'token_cache': verified_tokens.stats()}), 200
+
+    def _by_service(stats_by_backend):
+        """
+        Returns per-backend stats keyed by the services served at each backend address.
+        """
+        return {backend_services.get(backend, 'other'): backend_stats
+                for backend, backend_stats in stats_by_backend.items()}
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        """
+        Returns the metrics of every worker process in the Prometheus format.
+        """
+        body, content_type = metrics.exposition()
+        return Response(body, content_type=content_type)
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_start = perf_counter()
+        metrics.REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        """
+        Records the latency and status of the request by route. For a
+        streamed response, the time until the response starts.
+        """
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe_request(route, request.method, response.status_code,
+                                perf_counter() - g.request_start)
+        return response
+
+    @app.before_request
+    def start_server_timing():
+        if app.config['SERVER_TIMING']:
+            g.server_timing = ServerTiming()
+
+    @app.after_request
+    def add_server_timing(response):
+        """
+        Sends the phases of the request in a Server-Timing header. Phases
+        of a streamed response that end after its headers are not included.
+        """
+        timing = g.get('server_timing')
+        if timing is not None:
+            timing.add('total', perf_counter() - g.request_start)
+            response.headers['Server-Timing'] = timing.header()
+        return response
+
+    def _timing(name, description=None):
+        """
+        Returns a context manager recording its block as a Server-Timing
+        phase of this request, or doing nothing if SERVER_TIMING is off.
+        """
+        timing = g.get('server_timing')
+        return timing.phase(name, description) if timing is not None else nullcontext()
+
+    @app.before_request
+    def admit_request():
+        """
+        Rejects the request with a fast 503 while the worker is saturated
+        (see admission_control.AdmissionController). Posted forms, e.g.
+        payments and logins, are critical, page views are shed first.
+        """
+        if admission is None or request.endpoint in ADMISSION_EXEMPT or request.endpoint is None:
+            return None
+        priority = CRITICAL if request.method == 'POST' else NORMAL
+        ticket = admission.try_acquire(f'{request.method} {request.url_rule.rule}', priority,
+                                       timed=request.endpoint not in ADMISSION_UNTIMED)
+        if ticket is None:
+            metrics.ADMISSION_REJECTED.labels(priority).inc()
+            resp = make_response('The service is overloaded, please retry.', 503)
+            resp.headers['Retry-After'] = '1'
+            return resp
+        g.admission_ticket = ticket
+        return None
+
+    @app.teardown_request
+    def release_admission(_error):
+        """
+        Ends the admission of the request, once a streamed response is sent too.
+        """
+        ticket = g.pop('admission_ticket', None)
+        if ticket is not None:
+            admission.release(ticket)
+            metrics.ADMISSION_LIMIT.set(admission.limit)
+
+    @app.teardown_request
+    def end_request_metrics(_error):
+        metrics.REQUESTS_IN_FLIGHT.dec()
+
+    @before_render_template.connect_via(app)
+    def start_render_metrics(_sender, template, **_extra):
+        g.setdefault('render_starts', {})[template.name] = perf_counter()
+
+    @template_rendered.connect_via(app)
+    def record_render_metrics(_sender, template, **_extra):
+        start = g.get('render_starts', {}).pop(template.name, None)
+        if start is not None:
+            seconds = perf_counter() - start
+            metrics.TEMPLATE_RENDER_SECONDS.labels(template.name).observe(seconds)
+            timing = g.get('server_timing')
+            if timing is not None:
+                timing.add('render', seconds, template.name)
+
+    def _timed_backend_call(call, send):
+        """
+        Returns send(), a request to a backend, and records its latency as call.
+        May be called from the threads sending bulk payments.
+        """
+        start = perf_counter()
+        response = None
+        try:
+            response = send()
+            return response
+        finally:
+            seconds = perf_counter() - start
+            metrics.observe_backend_call(call, seconds, response)
+            timing = g.get('server_timing') if has_app_context() else None
+            if timing is not None:
+                timing.add(call, seconds)
 
     @app.route("/")
     def root():
@@ -107,10 +323,206 @@ def create_app():
                                     _scheme=app.config['SCHEME']))
         token_data = decode_token(token)
         display_name = token_data['name']
-        username = token_data['user']
         account_id = token_data['acct']
 
+        api_calls, cache_keys = _home_api_calls(token, token_data)
+
+        # a message means we were redirected here after a payment or deposit,
+        # which may have been handled by another frontend replica
+        pending = _start_backends_cached(api_calls, cache_keys,
+                                         use_cached=not request.args.get('msg'))
+
+        context = {'account_id': account_id,
+                   'bank_name': os.getenv('BANK_NAME', 'Bank of Anthos'),
+                   'cluster_name': instance_metadata.cluster_name,
+                   'cymbal_logo': os.getenv('CYMBAL_LOGO', 'false'),
+                   'message': request.args.get('msg', None),
+                   'name': display_name,
+                   'platform': platform,
+                   'platform_display_name': platform_display_name,
+                   'pod_name': pod_name,
+                   'pod_zone': instance_metadata.pod_zone}
+        if app.config['STREAM_HOME']:
+            return Response(stream_with_context(_stream_home(context, pending)),
+                            mimetype='text/html')
+
+        with _timing('backends'):
+            balance = pending[BALANCE_NAME]()
+            contacts = pending[CONTACTS_NAME]() or []
+            transactions = pending[TRANSACTION_LIST_NAME]()
+        history, next_cursor = _history_view(account_id, transactions, contacts)
+        return render_template('index.html',
+                               balance=balance,
+                               contacts=contacts,
+                               history=history,
+                               next_cursor=next_cursor,
+                               **context)
+
+    @app.route("/api/home")
+    def api_home():
+        """
+        Returns the data of the home page as JSON: balance, the first page
+        of the labelled transaction history and contacts.
+
+        The strong ETag is a digest of the backend responses, so a request
+        whose If-None-Match matches is answered with 304 before anything
+        is formatted or serialized.
+
+        Fails if:
+        - token is not valid
+        """
+        token = request.cookies.get(app.config['TOKEN_NAME'])
+        if not verify_token(token):
+            return abort(401)
+        token_data = decode_token(token)
+        account_id = token_data['acct']
+        api_calls, cache_keys = _home_api_calls(token, token_data)
+        pending = _start_backends_cached(api_calls, cache_keys)
+        with _timing('backends'):
+            backend_data = {name: wait() for name, wait in pending.items()}
+
+        # everything the response body depends on
+        etag = hashlib.sha256(json_codec.dumpb(
+            [account_id,
+             token_data['name'],
+             request.cookies.get(app.config['TIMEZONE_COOKIE']),
+             app.config['HISTORY_PAGE_SIZE'],
+             backend_data],
+            sort_keys=True)).hexdigest()
+        if etag_matches(request, etag):
+            resp = make_response('', 304)
+        else:
+            contacts = backend_data[CONTACTS_NAME] or []
+            history, next_cursor = _history_view(account_id,
+                                                 backend_data[TRANSACTION_LIST_NAME],
+                                                 contacts)
+            resp = jsonify({'account_id': account_id,
+                            'name': token_data['name'],
+                            'balance': backend_data[BALANCE_NAME],
+                            'transactions': None if history is None else
+                                            [row._asdict() for row in history],
+                            'next_cursor': next_cursor,
+                            'contacts': contacts})
+        resp.set_etag(etag)
+        # per user, clients must revalidate before reusing it
+        resp.headers['Cache-Control'] = 'private, no-cache'
+        resp.vary.add('Cookie')
+        return resp
+
+    @app.route("/history")
+    def history_next_page():
+        """
+        Returns the page of the transaction history after the 'cursor'
+        transaction id, as HTML table rows for infinite scrolling or, with
+        format=json, as JSON. The cursor of the following page is returned in
+        the X-Next-Cursor header (and in the JSON), empty on the last page.
+
+        Fails if:
+        - token is not valid
+        - cursor is not a transaction id
+        - transactionhistory fails and nothing is cached
+        """
+        token = request.cookies.get(app.config['TOKEN_NAME'])
+        if not verify_token(token):
+            return abort(401)
+        try:
+            cursor = int(request.args['cursor'])
+        except (KeyError, ValueError):
+            return abort(400)
+        token_data = decode_token(token)
+        api_calls, cache_keys = _home_api_calls(token, token_data)
+        api_calls = [api_call for api_call in api_calls
+                     if api_call.display_name in (TRANSACTION_LIST_NAME, CONTACTS_NAME)]
+        pending = _start_backends_cached(api_calls, cache_keys)
+        with _timing('backends'):
+            contacts = pending[CONTACTS_NAME]() or []
+            transactions = pending[TRANSACTION_LIST_NAME]()
+        history, next_cursor = _history_view(token_data['acct'], transactions, contacts, cursor)
+        if history is None:
+            return abort(503)
+        if request.args.get('format') == 'json':
+            resp = jsonify({'transactions': [row._asdict() for row in history],
+                            'next_cursor': next_cursor})
+        else:
+            resp = make_response(render_template('home/history_rows.html', history=history))
+        resp.headers['X-Next-Cursor'] = '' if next_cursor is None else str(next_cursor)
+        return resp
+
+    @app.route('/export/transactions')
+    def export_transactions():
+        """
+        Streams the transaction history as CSV, or as NDJSON with
+        ?format=ndjson, labelled with the contacts like the home page.
+
+        The history is parsed as it arrives from transactionhistory and
+        sent row by row, so the memory an export takes does not depend on
+        its length.
+
+        Fails if:
+        - token is not valid
+        - transactionhistory cannot be reached
+        """
+        token = request.cookies.get(app.config['TOKEN_NAME'])
+        if not verify_token(token):
+            return abort(401)
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return abort(400)
+        token_data = decode_token(token)
+        account_id = token_data['acct']
+        api_calls, cache_keys = _home_api_calls(token, token_data)
+        pending = _start_backends_cached(
+            [api_call for api_call in api_calls if api_call.display_name == CONTACTS_NAME],
+            cache_keys)
+
+        url = f'{app.config["HISTORY_URI"]}/{account_id}'
+        session = backend_sessions.session_for(url)
+        try:
+            resp = _timed_backend_call('transaction_export', lambda: session.get(
+                url=url,
+                headers={'Authorization': 'Bearer ' + token},
+                timeout=app.config['BACKEND_TIMEOUT'],
+                stream=True))
+            resp.raise_for_status()
+        except RequestException as err:
+            app.logger.error('Error exporting transactions: %s', str(err))
+            return abort(503)
+        labels = contact_labels(pending[CONTACTS_NAME]())
+        timezone = get_timezone(request.cookies.get(app.config['TIMEZONE_COOKIE']),
+                                app.config['DEFAULT_TIMEZONE'])
+
+        def generate():
+            try:
+                rows = export_rows(account_id,
+                                   iter_json_array(resp.iter_content(EXPORT_CHUNK_SIZE)),
+                                   labels,
+                                   timezone,
+                                   app.config['TIMESTAMP_FORMAT'],
+                                   logger=app.logger)
+                if export_format == 'csv':
+                    yield from to_csv(rows)
+                else:
+                    yield from to_ndjson(rows, json_codec)
+            except (RequestException, ValueError) as err:
+                # the status line is sent already, the export ends early
+                app.logger.error('Error exporting transactions: %s', str(err))
+            finally:
+                resp.close()
+
+        mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        filename = f'transactions-{account_id}.{export_format}'
+        return Response(stream_with_context(generate()), mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename="{filename}"',
+                                 'Cache-Control': 'private, no-store'})
+
+    def _home_api_calls(token, token_data):
+        """
+        Returns the backend calls of the home page and their response cache keys.
+        """
+        username = token_data['user']
+        account_id = token_data['acct']
         hed = {'Authorization': 'Bearer ' + token}
+        timing = g.get('server_timing')
 
         api_calls = [
             # get balance
@@ -118,87 +530,170 @@ def create_app():
                     api_request=ApiRequest(url=f'{app.config["BALANCES_URI"]}/{account_id}',
                                            headers=hed,
                                            timeout=app.config['BACKEND_TIMEOUT']),
-                    logger=app.logger),
+                    logger=app.logger,
+                    session=backend_sessions.session_for(app.config["BALANCES_URI"]),
+                    hedger=hedger,
+                    breaker=backend_breakers.breaker_for(app.config["BALANCES_URI"]),
+                    single_flight=single_flight,
+                    timing=timing,
+                    json_codec=json_codec),
             # get history
             ApiCall(display_name=TRANSACTION_LIST_NAME,
                     api_request=ApiRequest(url=f'{app.config["HISTORY_URI"]}/{account_id}',
                                            headers=hed,
                                            timeout=app.config['BACKEND_TIMEOUT']),
-                    logger=app.logger),
+                    logger=app.logger,
+                    session=backend_sessions.session_for(app.config["HISTORY_URI"]),
+                    hedger=hedger,
+                    breaker=backend_breakers.breaker_for(app.config["HISTORY_URI"]),
+                    single_flight=single_flight,
+                    timing=timing,
+                    json_codec=json_codec),
             # get contacts
             ApiCall(display_name=CONTACTS_NAME,
                     api_request=ApiRequest(url=f'{app.config["CONTACTS_URI"]}/{username}',
                                            headers=hed,
                                            timeout=app.config['BACKEND_TIMEOUT']),
-                    logger=app.logger)
+                    logger=app.logger,
+                    session=backend_sessions.session_for(app.config["CONTACTS_URI"]),
+                    breaker=backend_breakers.breaker_for(app.config["CONTACTS_URI"]),
+                    single_flight=single_flight,
+                    timing=timing,
+                    json_codec=json_codec)
         ]
 
-        api_response = {BALANCE_NAME: None,
-                        TRANSACTION_LIST_NAME: None,
-                        CONTACTS_NAME: []}
-
-        tracer = trace.get_tracer(__name__)
-        with TracedThreadPoolExecutor(tracer, max_workers=3) as executor:
-            futures = []
-
-            future_to_api_call = {
-                executor.submit(api_call.make_call):
-                    api_call for api_call in api_calls
-            }
-
-            for future in concurrent.futures.as_completed(future_to_api_call):
-                if future.result():
-                    api_call = future_to_api_call[future]
-                    api_response[api_call.display_name] = future.result().json()
-
-        _populate_contact_labels(account_id,
-                                 api_response[TRANSACTION_LIST_NAME],
-                                 api_response[CONTACTS_NAME])
+        cache_keys = {BALANCE_NAME: (BALANCE_NAME, account_id),
+                      TRANSACTION_LIST_NAME: (TRANSACTION_LIST_NAME, account_id),
+                      CONTACTS_NAME: (CONTACTS_NAME, username)}
+        return api_calls, cache_keys
 
-        return render_template('index.html',
-                               account_id=account_id,
-                               balance=api_response[BALANCE_NAME],
-                               bank_name=os.getenv('BANK_NAME', 'Bank of Anthos'),
-                               cluster_name=cluster_name,
-                               contacts=api_response[CONTACTS_NAME],
-                               cymbal_logo=os.getenv('CYMBAL_LOGO', 'false'),
-                               history=api_response[TRANSACTION_LIST_NAME],
-                               message=request.args.get('msg', None),
-                               name=display_name,
-                               platform=platform,
-                               platform_display_name=platform_display_name,
-                               pod_name=pod_name,
-                               pod_zone=pod_zone)
-
-    def _populate_contact_labels(account_id, transactions, contacts):
+    def _history_view(account_id, transactions, contacts, cursor=None):
+        """
+        Returns the rows of one page of the transaction history, labelled and
+        in the user's time zone, and the cursor of the next page.
         """
-        Populate contact labels for the passed transactions.
+        with _timing('history'):
+            page, next_cursor = history_page(transactions, cursor,
+                                             app.config['HISTORY_PAGE_SIZE'])
+            timezone = get_timezone(request.cookies.get(app.config['TIMEZONE_COOKIE']),
+                                    app.config['DEFAULT_TIMEZONE'])
+            return build_history(account_id,
+                                 page,
+                                 contacts,
+                                 timezone,
+                                 app.config['TIMESTAMP_FORMAT']), next_cursor
+
+    def _stream_home(context, pending):
+        """
+        Render the home page section by section, as the backends answer.
 
-        Side effect:
-            Take each transaction and set the 'accountLabel' field with the label of
-            the contact each transaction was associated with. If there was no
-            associated contact, set 'accountLabel' to None.
-            If any parameter is None, nothing happens.
+        The page header and balance card are sent as soon as the balance is
+        known. The transaction history, which needs the contacts for its
+        labels, follows in chunks of about STREAM_CHUNK_SIZE characters,
+        then the payment and deposit forms.
+        """
+        context['balance'] = pending[BALANCE_NAME]()
+        yield from _buffered(stream_template('home/summary.html', **context))
+        context['contacts'] = pending[CONTACTS_NAME]() or []
+        context['history'], context['next_cursor'] = _history_view(
+            context['account_id'], pending[TRANSACTION_LIST_NAME](), context['contacts'])
+        yield from _buffered(stream_template('home/history.html', **context))
+        yield from _buffered(stream_template('home/modals.html', **context))
+
+    def _buffered(parts):
+        """
+        Join the small strings rendered by a template stream into chunks of
+        about STREAM_CHUNK_SIZE characters. The rest is sent at the end.
+        """
+        chunk = []
+        size = 0
+        for part in parts:
+            chunk.append(part)
+            size += len(part)
+            if size >= STREAM_CHUNK_SIZE:
+                yield ''.join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield ''.join(chunk)
+
+    def _start_backends(api_calls):
+        """
+        Start the passed API calls concurrently.
 
-        Params: account_id - the account id for the user owning the transaction list
-                transactions - a list of transactions as key/value dicts
-                            [{transaction1}, {transaction2}, ...]
-                contacts - a list of contacts as key/value dicts
-                        [{contact1}, {contact2}, ...]
+        Return: a dict mapping the display name of each call to a function
+                that waits for it and returns its parsed JSON response, or
+                None if the call failed
         """
-        app.logger.debug('Populating contact labels.')
-        if account_id is None or transactions is None or contacts is None:
-            return
+        if app.config['SERVING_MODE'] == 'async':
+            # one greenlet per call on the worker's event loop
+            return {api_call.display_name: api_call.fetch_json_async().get
+                    for api_call in api_calls}
+        return {api_call.display_name: fanout_executor.submit(api_call.fetch_json).result
+                for api_call in api_calls}
+
+    def _start_backends_cached(api_calls, cache_keys, use_cached=True):
+        """
+        Like _start_backends, but answer from the response cache when possible.
 
-        # Map contact accounts to their labels. If no label found, default to None.
-        contact_map = {c['account_num']: c.get('label') for c in contacts}
+        Stale cached responses are served right away and refreshed in the
+        background. If a backend fails, its last response is served instead,
+        as long as it is not older than RESPONSE_CACHE_STALE_IF_ERROR.
 
-        # Populate the 'accountLabel' field. If no match found, default to None.
-        for trans in transactions:
-            if trans['toAccountNum'] == account_id:
-                trans['accountLabel'] = contact_map.get(trans['fromAccountNum'])
-            elif trans['fromAccountNum'] == account_id:
-                trans['accountLabel'] = contact_map.get(trans['toAccountNum'])
+        Params: cache_keys - maps the display name of each call to its cache key
+                use_cached - if False, every backend is called, the responses
+                             are still stored
+        """
+        pending = {}
+        to_fetch = []
+        for api_call in api_calls:
+            key = cache_keys[api_call.display_name]
+            value, refresh = response_cache.lookup(key) if use_cached else (None, False)
+            if value is None:
+                to_fetch.append(api_call)
+                continue
+            pending[api_call.display_name] = lambda value=value: value
+            if api_call.timing is not None:
+                api_call.timing.add(api_call.display_name, description='cached')
+            if refresh:
+                fanout_executor.submit(_refresh_cached, api_call, key, response_cache.generation)
+
+        generation = response_cache.generation
+        for name, wait in _start_backends(to_fetch).items():
+            pending[name] = functools.partial(_fetch_cached, wait, cache_keys[name], generation)
+        return pending
+
+    def _fetch_cached(wait, key, generation):
+        """
+        Wait for a backend call and store its response in the response cache.
+        Return the cached response instead if the call failed.
+        """
+        try:
+            value = wait()
+        except ValueError as err:
+            # the backend answered, but not with JSON
+            app.logger.error('Error parsing %s: %s', key[0], str(err))
+            value = None
+        if value is not None:
+            response_cache.put(key, value, generation)
+            return value
+        value = response_cache.fallback(key)
+        if value is not None:
+            app.logger.warning('Serving cached %s.', key[0])
+        return value
+
+    def _refresh_cached(api_call, key, generation):
+        """
+        Fetch a stale response again and store it in the response cache.
+        """
+        try:
+            value = api_call.fetch_json()
+            if value is not None:
+                response_cache.put(key, value, generation)
+        except ValueError as err:
+            app.logger.error('Error refreshing %s: %s', api_call.display_name, str(err))
+        finally:
+            response_cache.end_refresh(key)
 
     @app.route('/payment', methods=['POST'])
     def payment():
@@ -218,15 +713,10 @@ def create_app():
         try:
             account_id = decode_token(token)['acct']
             recipient = request.form['account_num']
+            label = None
             if recipient == 'add':
                 recipient = request.form['contact_account_num']
                 label = request.form.get('contact_label', None)
-                if label:
-                    # new contact. Add to contacts list
-                    _add_contact(label,
-                                 recipient,
-                                 app.config['LOCAL_ROUTING'],
-                                 False)
 
             user_input = request.form['amount']
             payment_amount = int(Decimal(user_input) * 100)
@@ -236,8 +726,22 @@ def create_app():
                                 "toRoutingNum": app.config['LOCAL_ROUTING'],
                                 "amount": payment_amount,
                                 "uuid": request.form['uuid']}
-            _submit_transaction(transaction_data)
-            app.logger.info('Payment initiated successfully.')
+
+            def submit():
+                if label:
+                    # new contact. Add to contacts list
+                    _add_contact(label,
+                                 recipient,
+                                 app.config['LOCAL_ROUTING'],
+                                 False)
+                _submit_transaction(transaction_data)
+
+            # a form sent again, e.g. by a double-click, is submitted once
+            _, replayed = submissions.submit((account_id, transaction_data['uuid']), submit)
+            if replayed:
+                app.logger.info('Payment %s was already submitted.', transaction_data['uuid'])
+            else:
+                app.logger.info('Payment initiated successfully.')
             return redirect(code=303,
                             location=url_for('home',
                                              msg='Payment successful',
@@ -280,20 +784,15 @@ def create_app():
         try:
             # get account id from token
             account_id = decode_token(token)['acct']
+            external_label = None
             if request.form['account'] == 'add':
                 external_account_num = request.form['external_account_num']
                 external_routing_num = request.form['external_routing_num']
                 if external_routing_num == app.config['LOCAL_ROUTING']:
                     raise UserWarning("invalid routing number")
                 external_label = request.form.get('external_label', None)
-                if external_label:
-                    # new contact. Add to contacts list
-                    _add_contact(external_label,
-                                 external_account_num,
-                                 external_routing_num,
-                                 True)
             else:
-                account_details = json.loads(request.form['account'])
+                account_details = json_codec.loads(request.form['account'])
                 external_account_num = account_details['account_num']
                 external_routing_num = account_details['routing_num']
 
@@ -303,8 +802,21 @@ def create_app():
                                 "toRoutingNum": app.config['LOCAL_ROUTING'],
                                 "amount": int(Decimal(request.form['amount']) * 100),
                                 "uuid": request.form['uuid']}
-            _submit_transaction(transaction_data)
-            app.logger.info('Deposit submitted successfully.')
+
+            def submit():
+                if external_label:
+                    # new contact. Add to contacts list
+                    _add_contact(external_label,
+                                 external_account_num,
+                                 external_routing_num,
+                                 True)
+                _submit_transaction(transaction_data)
+
+            _, replayed = submissions.submit((account_id, transaction_data['uuid']), submit)
+            if replayed:
+                app.logger.info('Deposit %s was already submitted.', transaction_data['uuid'])
+            else:
+                app.logger.info('Deposit submitted successfully.')
             return redirect(code=303,
                             location=url_for('home',
                                              msg='Deposit successful',
@@ -326,22 +838,165 @@ def create_app():
                                 _external=True,
                                 _scheme=app.config['SCHEME']))
 
-    def _submit_transaction(transaction_data):
-        app.logger.debug('Submitting transaction.')
+    @app.route('/payment/bulk', methods=['POST'])
+    def bulk_payment():
+        """
+        Submits a batch of payments to ledgerwriter: a JSON list, or CSV
+        sent as the body or as a file upload named "file" (see
+        bulk_payments.parse_rows). Returns the outcome of each as JSON.
+
+        Every payment is validated before any is sent. They are then sent
+        BULK_PAYMENT_WORKERS at a time, and the balance is polled once for
+        the whole batch. Payments without a uuid get one derived from
+        batch_id: sending a batch again with the batch_id returned skips
+        the payments already made.
+
+        Fails if:
+        - token is not valid
+        - the document cannot be parsed or a payment is invalid
+        """
         token = request.cookies.get(app.config['TOKEN_NAME'])
+        if not verify_token(token):
+            app.logger.error('Error submitting bulk payment: user is not authenticated.')
+            return abort(401)
+        account_id = decode_token(token)['acct']
+        batch_id = request.values.get('batch_id')
+        try:
+            if request.mimetype == 'application/json':
+                document = request.get_json(silent=True)
+                if isinstance(document, dict):
+                    batch_id = document.get('batch_id', batch_id)
+                rows = parse_rows(document, 'application/json')
+            elif 'file' in request.files:
+                rows = parse_rows(request.files['file'].read().decode('utf-8'), 'text/csv')
+            else:
+                rows = parse_rows(request.get_data(as_text=True), 'text/csv')
+        except ValueError as err:
+            app.logger.error('Error submitting bulk payment: %s', str(err))
+            return jsonify({'error': str(err)}), 400
+        batch_id = str(batch_id or uuid.uuid4())
+        transfers, errors = validate_payments(rows, account_id, batch_id,
+                                              app.config['BULK_PAYMENT_MAX_ROWS'])
+        if errors:
+            app.logger.error('Error submitting bulk payment: %d invalid payments.', len(errors))
+            return jsonify({'batch_id': batch_id, 'errors': errors}), 400
+
+        balance_before = _get_balance(account_id, token)
+        with _timing('bulk_submit'):
+            results = [future.result() for future in
+                       [bulk_executor.submit(_post_transfer, transfer, account_id, token)
+                        for transfer in transfers]]
+        sent = sum(transfer.amount for transfer, result in zip(transfers, results)
+                   if result['status'] == 'submitted')
+        # once for the batch: the balance is final once every payment was seen
+        visible = True
+        if sent and balance_before is None:
+            sleep(0.25)
+        elif sent:
+            visible = propagation.wait(
+                lambda: _get_balance(account_id, token) == balance_before - sent)
+        response_cache.invalidate(
+            *[(name, acct)
+              for name in (BALANCE_NAME, TRANSACTION_LIST_NAME)
+              for acct in {account_id, *[transfer.account_num for transfer in transfers]}])
+        app.logger.info('Bulk payment %s: %d payments submitted.', batch_id,
+                        sum(result['status'] == 'submitted' for result in results))
+        return jsonify({'batch_id': batch_id,
+                        'visible': visible,
+                        'results': results}), 200
+
+    def _post_transfer(transfer, account_id, token):
+        """
+        Posts one payment of a bulk payment. Runs on the bulk executor.
+
+        Return: its outcome; status is submitted, duplicate if it was
+                already made, or failed
+        """
+        result = {'row': transfer.row,
+                  'account_num': transfer.account_num,
+                  'amount': format_cents(transfer.amount),
+                  'uuid': transfer.uuid,
+                  'status': 'submitted'}
+        try:
+            _post_transaction({"fromAccountNum": account_id,
+                               "fromRoutingNum": app.config['LOCAL_ROUTING'],
+                               "toAccountNum": transfer.account_num,
+                               "toRoutingNum": app.config['LOCAL_ROUTING'],
+                               "amount": transfer.amount,
+                               "uuid": transfer.uuid}, token)
+        except UserWarning as warn:
+            duplicate = 'duplicate transaction uuid' in str(warn)
+            result['status'] = 'duplicate' if duplicate else 'failed'
+            result['error'] = str(warn)
+        except requests.exceptions.RequestException as err:
+            app.logger.error('Error submitting payment: %s', str(err))
+            result['status'] = 'failed'
+            result['error'] = 'ledgerwriter is unavailable'
+        return result
+
+    def _post_transaction(transaction_data, token):
+        """
+        Posts a transaction to ledgerwriter.
+
+        Raise: UserWarning  if the response status is 4xx or 5xx.
+        """
         hed = {'Authorization': 'Bearer ' + token,
                'content-type': 'application/json'}
-        resp = requests.post(url=app.config["TRANSACTIONS_URI"],
-                             data=jsonify(transaction_data).data,
-                             headers=hed,
-                             timeout=app.config['BACKEND_TIMEOUT'])
+        session = backend_sessions.session_for(app.config["TRANSACTIONS_URI"])
+        resp = _timed_backend_call('transaction_submit', lambda: session.post(
+            url=app.config["TRANSACTIONS_URI"],
+            data=json_codec.dumpb(transaction_data),
+            headers=hed,
+            timeout=app.config['BACKEND_TIMEOUT']))
         try:
             resp.raise_for_status()  # Raise on HTTP Status code 4XX or 5XX
         except requests.exceptions.HTTPError as http_request_err:
             raise UserWarning(resp.text) from http_request_err
-        # Short delay to allow the transaction to propagate to balancereader
-        # and transaction-history
-        sleep(0.25)
+
+    def _submit_transaction(transaction_data):
+        app.logger.debug('Submitting transaction.')
+        token = request.cookies.get(app.config['TOKEN_NAME'])
+        account_id = decode_token(token)['acct']
+        change = 0
+        if transaction_data['fromAccountNum'] == account_id:
+            change -= transaction_data['amount']
+        if transaction_data['toAccountNum'] == account_id:
+            change += transaction_data['amount']
+        # the balance of the page the form was sent from if it is fresh in
+        # the response cache, else it is read from balancereader
+        balance_before = response_cache.peek((BALANCE_NAME, account_id))
+        if balance_before is None and change:
+            balance_before = _get_balance(account_id, token)
+        _post_transaction(transaction_data, token)
+        # Wait until the balance changed in balancereader, so the redirect to
+        # /home shows it. Other transactions of the account may change it
+        # too, so the new balance is not compared with an expected one.
+        # transactionhistory reads the same ledger and is not polled. If
+        # balancereader failed, wait the whole timeout.
+        if change and balance_before is None:
+            sleep(app.config['PROPAGATION_TIMEOUT'])
+        elif change:
+            propagation.wait(
+                lambda: _get_balance(account_id, token) not in (None, balance_before))
+        response_cache.invalidate(
+            *[(name, transaction_data[acct])
+              for name in (BALANCE_NAME, TRANSACTION_LIST_NAME)
+              for acct in ('fromAccountNum', 'toAccountNum')])
+
+    def _get_balance(account_id, token):
+        """
+        Returns the balance of account_id, or None if balancereader fails.
+        """
+        url = f'{app.config["BALANCES_URI"]}/{account_id}'
+        hed = {'Authorization': 'Bearer ' + token}
+        try:
+            resp = _timed_backend_call('balance_poll', lambda: backend_sessions.session_for(
+                url).get(url=url, headers=hed, timeout=app.config['BACKEND_TIMEOUT']))
+            resp.raise_for_status()
+            return json_codec.loads(resp.content)
+        except (requests.exceptions.RequestException, ValueError) as err:
+            app.logger.warning('Unable to read balance: %s', str(err))
+            return None
 
     def _add_contact(label, acct_num, routing_num, is_external_acct=False):
         """
@@ -361,14 +1016,16 @@ def create_app():
         }
         token_data = decode_token(token)
         url = '{}/{}'.format(app.config["CONTACTS_URI"], token_data['user'])
-        resp = requests.post(url=url,
-                             data=jsonify(contact_data).data,
-                             headers=hed,
-                             timeout=app.config['BACKEND_TIMEOUT'])
+        resp = _timed_backend_call('contact_add', lambda: backend_sessions.session_for(
+            url).post(url=url,
+                      data=json_codec.dumpb(contact_data),
+                      headers=hed,
+                      timeout=app.config['BACKEND_TIMEOUT']))
         try:
             resp.raise_for_status()  # Raise on HTTP Status code 4XX or 5XX
         except requests.exceptions.HTTPError as http_request_err:
             raise UserWarning(resp.text) from http_request_err
+        response_cache.invalidate((CONTACTS_NAME, token_data['user']))
 
     @app.route("/login", methods=['GET'])
     def login_page():
@@ -415,7 +1072,7 @@ def create_app():
         return render_template('login.html',
                                app_name=app_name,
                                bank_name=os.getenv('BANK_NAME', 'Bank of Anthos'),
-                               cluster_name=cluster_name,
+                               cluster_name=instance_metadata.cluster_name,
                                cymbal_logo=os.getenv('CYMBAL_LOGO', 'false'),
                                default_password=os.getenv('DEFAULT_PASSWORD', ''),
                                default_user=os.getenv('DEFAULT_USERNAME', ''),
@@ -423,7 +1080,7 @@ def create_app():
                                platform=platform,
                                platform_display_name=platform_display_name,
                                pod_name=pod_name,
-                               pod_zone=pod_zone,
+                               pod_zone=instance_metadata.pod_zone,
                                redirect_uri=redirect_uri,
                                response_type=response_type,
                                state=state)
@@ -442,13 +1099,15 @@ def create_app():
     def _login_helper(username, password, request_args):
         try:
             app.logger.debug('Logging in.')
-            req = requests.get(url=app.config["LOGIN_URI"],
-                               params={'username': username, 'password': password},
-                               timeout=app.config['BACKEND_TIMEOUT']*2)
+            session = backend_sessions.session_for(app.config["LOGIN_URI"])
+            req = _timed_backend_call('login', lambda: session.get(
+                url=app.config["LOGIN_URI"],
+                params={'username': username, 'password': password},
+                timeout=app.config['BACKEND_TIMEOUT']*2))
             req.raise_for_status()  # Raise on HTTP Status code 4XX or 5XX
 
             # login success
-            token = req.json()['token']
+            token = json_codec.loads(req.content)['token']
             claims = decode_token(token)
             max_age = claims['exp'] - claims['iat']
 
@@ -497,12 +1156,12 @@ def create_app():
             return render_template('consent.html',
                                    app_name=app_name,
                                    bank_name=os.getenv('BANK_NAME', 'Bank of Anthos'),
-                                   cluster_name=cluster_name,
+                                   cluster_name=instance_metadata.cluster_name,
                                    cymbal_logo=os.getenv('CYMBAL_LOGO', 'false'),
                                    platform=platform,
                                    platform_display_name=platform_display_name,
                                    pod_name=pod_name,
-                                   pod_zone=pod_zone,
+                                   pod_zone=instance_metadata.pod_zone,
                                    redirect_uri=redirect_uri,
                                    state=state)
 
@@ -567,12 +1226,12 @@ def create_app():
                                     _scheme=app.config['SCHEME']))
         return render_template('signup.html',
                                bank_name=os.getenv('BANK_NAME', 'Bank of Anthos'),
-                               cluster_name=cluster_name,
+                               cluster_name=instance_metadata.cluster_name,
                                cymbal_logo=os.getenv('CYMBAL_LOGO', 'false'),
                                platform=platform,
                                platform_display_name=platform_display_name,
                                pod_name=pod_name,
-                               pod_zone=pod_zone)
+                               pod_zone=instance_metadata.pod_zone)
 
     @app.route("/signup", methods=['POST'])
     def signup():
@@ -584,9 +1243,11 @@ def create_app():
         try:
             # create user
             app.logger.debug('Creating new user.')
-            resp = requests.post(url=app.config["USERSERVICE_URI"],
-                                 data=request.form,
-                                 timeout=app.config['BACKEND_TIMEOUT'])
+            session = backend_sessions.session_for(app.config["USERSERVICE_URI"])
+            resp = _timed_backend_call('signup', lambda: session.post(
+                url=app.config["USERSERVICE_URI"],
+                data=request.form,
+                timeout=app.config['BACKEND_TIMEOUT']))
             if resp.status_code == 201:
                 # user created. Attempt login
                 app.logger.info('New user created.')
@@ -614,6 +1275,13 @@ def create_app():
         return resp
 
     def decode_token(token):
+        """
+        Returns the claims of token. Claims verified during this request are
+        reused, other tokens are decoded without verifying them.
+        """
+        verified = g.get('verified_token')
+        if verified is not None and verified[0] == token and verified[1] is not None:
+            return verified[1]
         return jwt.decode(algorithms='RS256',
                           jwt=token,
                           options={"verify_signature": False})
@@ -622,38 +1290,40 @@ def create_app():
         """
         Validates token using userservice public key
         """
-        app.logger.debug('Verifying token.')
+        return _verified_claims(token) is not None
+
+    def _verified_claims(token):
+        """
+        Returns the claims of token if its signature is valid, None otherwise.
+
+        A token is verified at most once per request; the outcome is kept in
+        flask.g. Valid tokens are also remembered across requests until they
+        expire, so repeat visits skip the RSA signature check.
+        """
         if token is None:
-            return False
-        try:
-            jwt.decode(algorithms='RS256',
-                       jwt=token,
-                       key=app.config['PUBLIC_KEY'],
-                       options={"verify_signature": True})
-            app.logger.debug('Token verified.')
-            return True
-        except jwt.exceptions.InvalidTokenError as err:
-            app.logger.error('Error validating token: %s', str(err))
-            return False
+            return None
+        verified = g.get('verified_token')
+        if verified is not None and verified[0] == token:
+            return verified[1]
+        with _timing('auth'):
+            claims = verified_tokens.get(token)
+            if claims is None:
+                app.logger.debug('Verifying token.')
+                try:
+                    claims = public_keys.decode(token)
+                    app.logger.debug('Token verified.')
+                    verified_tokens.put(token, claims)
+                except jwt.exceptions.InvalidTokenError as err:
+                    app.logger.error('Error validating token: %s', str(err))
+        g.verified_token = (token, claims)
+        return claims
 
     # register html template formatters
-    def format_timestamp_day(timestamp):
-        """ Format the input timestamp day in a human readable way """
-        # TODO: time zones?
-        date = datetime.datetime.strptime(timestamp, app.config['TIMESTAMP_FORMAT'])
-        return date.strftime('%d')
-
-    def format_timestamp_month(timestamp):
-        """ Format the input timestamp month in a human readable way """
-        # TODO: time zones?
-        date = datetime.datetime.strptime(timestamp, app.config['TIMESTAMP_FORMAT'])
-        return date.strftime('%b')
-
     def format_currency(int_amount):
         """ Format the input currency in a human readable way """
         if int_amount is None:
             return '$---'
-        amount_str = '${:0,.2f}'.format(abs(Decimal(int_amount)/100))
+        amount_str = format_cents(int_amount)
         if int_amount < 0:
             amount_str = '-' + amount_str
         return amount_str
@@ -671,73 +1341,216 @@ def create_app():
         os.environ.get('USERSERVICE_API_ADDR'))
     app.config["CONTACTS_URI"] = 'http://{}/contacts'.format(
         os.environ.get('CONTACTS_API_ADDR'))
-    app.config['PUBLIC_KEY'] = open(os.environ.get('PUB_KEY_PATH'), 'r').read()
+    # the services served at each backend address, e.g. 'balancereader',
+    # or 'contacts+userservice' if they share one
+    services_at = {}
+    for service, uri in [('balancereader', app.config['BALANCES_URI']),
+                         ('contacts', app.config['CONTACTS_URI']),
+                         ('ledgerwriter', app.config['TRANSACTIONS_URI']),
+                         ('transactionhistory', app.config['HISTORY_URI']),
+                         ('userservice', app.config['USERSERVICE_URI'])]:
+        parts = urlsplit(uri)
+        services_at.setdefault(f'{parts.scheme}://{parts.netloc}', []).append(service)
+    backend_services = {backend: '+'.join(services) for backend, services in services_at.items()}
     app.config['LOCAL_ROUTING'] = os.getenv('LOCAL_ROUTING_NUM')
     # timeout in seconds for calls to the backend
     app.config['BACKEND_TIMEOUT'] = int(os.getenv('BACKEND_TIMEOUT', '4'))
     app.config['TOKEN_NAME'] = 'token'
     app.config['CONSENT_COOKIE'] = 'consented'
     app.config['TIMESTAMP_FORMAT'] = '%Y-%m-%dT%H:%M:%S.%f%z'
+    # transaction dates are shown in the browser's time zone, sent by the
+    # page scripts in a cookie, or else in DEFAULT_TIMEZONE
+    app.config['TIMEZONE_COOKIE'] = 'tz'
+    # transactions shown on /home, older ones are loaded page by page
+    app.config['HISTORY_PAGE_SIZE'] = int(os.getenv('HISTORY_PAGE_SIZE', '20'))
+    app.config['DEFAULT_TIMEZONE'] = get_timezone(os.getenv('DEFAULT_TIMEZONE', 'UTC'),
+                                                  datetime.timezone.utc)
     app.config['SCHEME'] = os.environ.get('SCHEME', 'http')
-
-    # where am I?
-    metadata_server = os.getenv('METADATA_SERVER', 'metadata.google.internal')
-    metadata_url = f'http://{metadata_server}/computeMetadata/v1/'
-    metadata_headers = {'Metadata-Flavor': 'Google'}
-
-    # get GKE cluster name
-    cluster_name = os.getenv('CLUSTER_NAME', 'unknown')
-    try:
-        req = requests.get(metadata_url + 'instance/attributes/cluster-name',
-                           headers=metadata_headers,
-                           timeout=app.config['BACKEND_TIMEOUT'])
-        if req.ok:
-            cluster_name = str(req.text)
-    except (RequestException, HTTPError) as err:
-        app.logger.warning(
-            "Unable to retrieve cluster name from metadata server %s.", metadata_server)
-
-    # get GKE pod name
-    pod_name = "unknown"
-    pod_name = socket.gethostname()
-
-    # get GKE node zone
-    pod_zone = os.getenv('POD_ZONE', 'unknown')
-    try:
-        req = requests.get(metadata_url + 'instance/zone',
-                           headers=metadata_headers,
-                           timeout=app.config['BACKEND_TIMEOUT'])
-        if req.ok:
-            pod_zone = str(req.text.split("/")[3])
-    except (RequestException, HTTPError) as err:
-        app.logger.warning("Unable to retrieve zone from metadata server %s.", metadata_server)
-
-    # register formater functions
-    app.jinja_env.globals.update(format_currency=format_currency)
-    app.jinja_env.globals.update(format_timestamp_month=format_timestamp_month)
-    app.jinja_env.globals.update(format_timestamp_day=format_timestamp_day)
+    # backend responses, JSON pages and request bodies are parsed and
+    # serialized with orjson if it is installed ('auto'), 'orjson' or 'json'
+    app.config['JSON_CODEC'] = os.getenv('JSON_CODEC', 'auto')
+    json_codec = JsonCodec(app.config['JSON_CODEC'])
+    app.json = JSONProvider(app, json_codec)
+    # per-worker runtime counters at /stats, for debugging. They are not
+    # authenticated, so the endpoint is off unless enabled.
+    app.config['STATS_ENDPOINT'] = os.getenv('STATS_ENDPOINT', 'false') == 'true'
+    # dynamic responses smaller than this many bytes are not compressed,
+    # 0 disables compression
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    static_assets = StaticAssets(os.path.join(app.root_path, 'static'))
+    # send /home in sections as the backends answer instead of all at once
+    app.config['STREAM_HOME'] = os.getenv('STREAM_HOME', 'false') == 'true'
+    # send the duration of the phases of each request, e.g. token
+    # verification, backend calls and rendering, in a Server-Timing header
+    app.config['SERVER_TIMING'] = os.getenv('SERVER_TIMING', 'false') == 'true'
+    # 'threaded' or 'async', must match the gunicorn worker (see gunicorn.conf.py)
+    app.config['SERVING_MODE'] = os.getenv('SERVING_MODE', 'threaded')
+    # keep-alive connections kept per backend, and seconds before an idle
+    # backend's connections are closed
+    app.config['BACKEND_POOL_SIZE'] = int(os.getenv('BACKEND_POOL_SIZE', '10'))
+    app.config['BACKEND_POOL_IDLE_TIMEOUT'] = int(os.getenv('BACKEND_POOL_IDLE_TIMEOUT', '60'))
+
+    # shared by every request thread of this process
+    backend_sessions = SessionPool(pool_size=app.config['BACKEND_POOL_SIZE'],
+                                   idle_timeout=app.config['BACKEND_POOL_IDLE_TIMEOUT'])
+    # backends failing BREAKER_FAILURE_THRESHOLD calls in a row are not called
+    # for BREAKER_RESET_SECONDS, /home is rendered without their data.
+    # 0 disables the circuit breakers.
+    app.config['BREAKER_FAILURE_THRESHOLD'] = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))
+    app.config['BREAKER_RESET_SECONDS'] = float(os.getenv('BREAKER_RESET_SECONDS', '10'))
+    backend_breakers = CircuitBreakers(
+        failure_threshold=app.config['BREAKER_FAILURE_THRESHOLD'],
+        reset_timeout=app.config['BREAKER_RESET_SECONDS'],
+        logger=app.logger,
+        on_transition=lambda backend, state: metrics.observe_breaker_transition(
+            backend_services.get(backend, 'other'), state))
+    # every breaker starts closed
+    for service in backend_services.values():
+        metrics.BREAKER_STATE.labels(service).set(0)
+
+    # max threads running backend calls in parallel for all requests of
+    # this process (gunicorn threads * calls per page view)
+    app.config['FANOUT_WORKERS'] = int(os.getenv('FANOUT_WORKERS', '12'))
+
+    # requests served at once by this process, lowered while latency rises
+    # so that excess requests get a fast 503 instead of timing out; page
+    # views may only use the share of the limit not reserved for posts.
+    # Off unless enabled. Only in async mode: a threaded worker never runs
+    # more requests than it has threads, the others wait in gunicorn where
+    # the limit cannot see them. It grows up to the worker's capacity, the
+    # WORKER_CONNECTIONS of gunicorn.conf.py.
+    app.config['ADMISSION_CONTROL'] = os.getenv('ADMISSION_CONTROL', 'false') == 'true'
+    app.config['WORKER_CONNECTIONS'] = int(os.getenv('WORKER_CONNECTIONS', '500'))
+    app.config['ADMISSION_MAX_LIMIT'] = min(
+        int(os.getenv('ADMISSION_MAX_LIMIT', str(app.config['WORKER_CONNECTIONS']))),
+        app.config['WORKER_CONNECTIONS'])
+    app.config['ADMISSION_LATENCY_TOLERANCE'] = float(
+        os.getenv('ADMISSION_LATENCY_TOLERANCE', '2'))
+    app.config['ADMISSION_RESERVED'] = float(os.getenv('ADMISSION_RESERVED', '0.25'))
+    if app.config['ADMISSION_CONTROL'] and app.config['SERVING_MODE'] != 'async':
+        app.logger.warning('ADMISSION_CONTROL needs SERVING_MODE=async, it is off.')
+        app.config['ADMISSION_CONTROL'] = False
+    admission = None
+    if app.config['ADMISSION_CONTROL']:
+        admission = AdmissionController(
+            max_limit=app.config['ADMISSION_MAX_LIMIT'],
+            latency_tolerance=app.config['ADMISSION_LATENCY_TOLERANCE'],
+            reserved=app.config['ADMISSION_RESERVED'],
+            logger=app.logger)
+
+    # verified tokens remembered across requests until they expire
+    app.config['TOKEN_CACHE_SIZE'] = int(os.getenv('TOKEN_CACHE_SIZE', '1024'))
+    verified_tokens = VerifiedTokenCache(max_size=app.config['TOKEN_CACHE_SIZE'])
+
+    # parsed public keys, reloaded in the background when rotated. Tokens
+    # verified with the previous keys must be verified again.
+    app.config['PUB_KEY_RELOAD_SECONDS'] = int(os.getenv('PUB_KEY_RELOAD_SECONDS', '30'))
+    public_keys = PublicKeySet(os.environ.get('PUB_KEY_PATH'), app.logger,
+                               on_reload=verified_tokens.clear)
+    public_keys.watch(app.config['PUB_KEY_RELOAD_SECONDS'])
+
+    # max seconds a payment or deposit waits for the new balance to be
+    # visible to balancereader before redirecting to /home
+    app.config['PROPAGATION_TIMEOUT'] = float(os.getenv('PROPAGATION_TIMEOUT', '0.25'))
+    propagation = PropagationWaiter(timeout=app.config['PROPAGATION_TIMEOUT'])
+
+    # outcome of the payments and deposits made, by account and form uuid:
+    # a form sent again gets it without calling ledgerwriter again
+    app.config['IDEMPOTENCY_CACHE_SIZE'] = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '4096'))
+    app.config['IDEMPOTENCY_TTL'] = float(os.getenv('IDEMPOTENCY_TTL', '600'))
+    submissions = IdempotencyStore(max_size=app.config['IDEMPOTENCY_CACHE_SIZE'],
+                                   ttl=app.config['IDEMPOTENCY_TTL'])
+
+    # identical backend reads running at the same time, e.g. after a
+    # double-click, share one call and its parsed response
+    app.config['COALESCE_BACKEND_CALLS'] = os.getenv('COALESCE_BACKEND_CALLS', 'true') == 'true'
+    single_flight = SingleFlight() if app.config['COALESCE_BACKEND_CALLS'] else None
+
+    # backend responses for /home: fresh for RESPONSE_CACHE_TTL seconds, then
+    # served while being refreshed until RESPONSE_CACHE_STALE_TTL, and served
+    # when the backend fails until RESPONSE_CACHE_STALE_IF_ERROR
+    app.config['RESPONSE_CACHE_SIZE'] = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+    app.config['RESPONSE_CACHE_TTL'] = float(os.getenv('RESPONSE_CACHE_TTL', '2'))
+    app.config['RESPONSE_CACHE_STALE_TTL'] = float(os.getenv('RESPONSE_CACHE_STALE_TTL', '10'))
+    app.config['RESPONSE_CACHE_STALE_IF_ERROR'] = float(
+        os.getenv('RESPONSE_CACHE_STALE_IF_ERROR', '300'))
+    response_cache = ResponseCache(max_size=app.config['RESPONSE_CACHE_SIZE'],
+                                   ttl=app.config['RESPONSE_CACHE_TTL'],
+                                   stale_ttl=app.config['RESPONSE_CACHE_STALE_TTL'],
+                                   stale_if_error=app.config['RESPONSE_CACHE_STALE_IF_ERROR'])
 
     # Set up logging
     app.logger.handlers = logging.getLogger('gunicorn.error').handlers
     app.logger.setLevel(logging.getLogger('gunicorn.error').level)
     app.logger.info('Starting frontend service.')
 
-    # Set up tracing and export spans to Cloud Trace.
-    if os.environ['ENABLE_TRACING'] == "true":
+    # Set up tracing and export spans to Cloud Trace. Without a tracer, the
+    # executors below do not carry the tracing context over to their threads.
+    app.config['ENABLE_TRACING'] = os.environ['ENABLE_TRACING'] == "true"
+    tracer = None
+    if app.config['ENABLE_TRACING']:
         app.logger.info("✅ Tracing enabled.")
-        trace.set_tracer_provider(TracerProvider())
-        cloud_trace_exporter = CloudTraceSpanExporter()
-        trace.get_tracer_provider().add_span_processor(
-            BatchSpanProcessor(cloud_trace_exporter)
-        )
-        set_global_textmap(CloudTraceFormatPropagator())
-        # Add tracing auto-instrumentation for Flask, jinja and requests
-        FlaskInstrumentor().instrument_app(app)
-        RequestsInstrumentor().instrument()
-        Jinja2Instrumentor().instrument()
+        tracer = setup_tracing(app)
     else:
         app.logger.info("🚫 Tracing disabled.")
 
+    # long-lived, shared by every request thread of this process
+    fanout_executor = TracedThreadPoolExecutor(
+        tracer,
+        max_workers=app.config['FANOUT_WORKERS'],
+        thread_name_prefix='fanout',
+        queue_gauge=metrics.EXECUTOR_QUEUE_DEPTH.labels('fanout'))
+
+    # payments of bulk payments sent at once by this process, and the most
+    # payments of one batch
+    app.config['BULK_PAYMENT_WORKERS'] = int(os.getenv('BULK_PAYMENT_WORKERS', '8'))
+    app.config['BULK_PAYMENT_MAX_ROWS'] = int(os.getenv('BULK_PAYMENT_MAX_ROWS', '500'))
+    bulk_executor = TracedThreadPoolExecutor(
+        tracer,
+        max_workers=app.config['BULK_PAYMENT_WORKERS'],
+        thread_name_prefix='bulk',
+        queue_gauge=metrics.EXECUTOR_QUEUE_DEPTH.labels('bulk'))
+
+    # balance and history reads slower than HEDGE_PERCENTILE of their recent
+    # latencies are sent twice, for at most HEDGE_BUDGET of the reads.
+    # 0 disables hedging.
+    app.config['HEDGE_PERCENTILE'] = float(os.getenv('HEDGE_PERCENTILE', '0'))
+    app.config['HEDGE_BUDGET'] = float(os.getenv('HEDGE_BUDGET', '0.1'))
+    hedger = None
+    if app.config['HEDGE_PERCENTILE'] > 0:
+        # slow requests that lost the race keep running here until they end
+        hedge_executor = TracedThreadPoolExecutor(
+            tracer,
+            max_workers=app.config['FANOUT_WORKERS'] * 2,
+            thread_name_prefix='hedge',
+            queue_gauge=metrics.EXECUTOR_QUEUE_DEPTH.labels('hedge'))
+        hedger = Hedger(hedge_executor,
+                        percentile=app.config['HEDGE_PERCENTILE'],
+                        budget_ratio=app.config['HEDGE_BUDGET'])
+
+    # where am I? Looked up in the background, create_app does not wait
+    # for the metadata server, which never answers off GCP
+    app.config['METADATA_TIMEOUT'] = float(os.getenv('METADATA_TIMEOUT', '1'))
+    # cluster and zone found by a previous run of this pod, '' disables it
+    app.config['METADATA_CACHE_PATH'] = os.getenv('METADATA_CACHE_PATH',
+                                                  '/tmp/frontend-metadata.json')
+    instance_metadata = InstanceMetadata(
+        os.getenv('METADATA_SERVER', 'metadata.google.internal'),
+        {'cluster_name': os.getenv('CLUSTER_NAME', 'unknown'),
+         'pod_zone': os.getenv('POD_ZONE', 'unknown')},
+        timeout=app.config['METADATA_TIMEOUT'],
+        cache_path=app.config['METADATA_CACHE_PATH'],
+        logger=app.logger)
+    instance_metadata.start()
+
+    # get GKE pod name
+    pod_name = "unknown"
+    pod_name = socket.gethostname()
+
+    # register formater functions
+    app.jinja_env.globals.update(format_currency=format_currency)
+    app.jinja_env.globals.update(asset_url=static_assets.url)
+
     platform = os.getenv('ENV_PLATFORM', None)
     platform_display_name = None
     if platform is not None:
@@ -0,0 +1,54 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Gunicorn settings for the frontend
+
+SERVING_MODE selects how a worker process serves requests:
+- threaded (default): a small pool of request threads, backend calls are
+  fanned out to a shared thread pool
+- async: a gevent event loop, every request is a greenlet and backend calls
+  run concurrently on the loop, so one worker can hold hundreds of requests
+
+The workers write their Prometheus metrics to PROMETHEUS_MULTIPROC_DIR, so
+that /metrics reports the sum over all of them whichever worker answers.
+"""
+
+import os
+import shutil
+
+# gunicorn reads its settings from lower case module attributes
+# pylint: disable=invalid-name
+
+if os.getenv('SERVING_MODE', 'threaded') == 'async':
+    worker_class = 'gevent'
+    worker_connections = int(os.getenv('WORKER_CONNECTIONS', '500'))
+else:
+    worker_class = 'gthread'
+    threads = int(os.getenv('WORKER_THREADS', '4'))
+
+# set before the app, and so prometheus_client, is imported by the workers
+METRICS_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/frontend-metrics')
+
+
+def on_starting(_server):
+    """Drop the metrics files of a previous run, whose counters would otherwise be added"""
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR)
+
+
+def child_exit(_server, worker):
+    """Stop reporting the in-flight gauges of a worker that exited"""
+    # pylint: disable=import-outside-toplevel
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
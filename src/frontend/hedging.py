@@ -0,0 +1,126 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hedged backend requests"""
+
+import concurrent.futures
+import threading
+import time
+from collections import deque
+
+
+class Hedger:  # pylint: disable=too-many-instance-attributes
+    """Sends a second, identical request when the first one is slow.
+
+    For every backend the latencies of the last ``window`` requests are
+    kept. Once ``min_samples`` are known, a request that has not answered
+    within the ``percentile`` of those latencies is sent again, and the
+    first successful response is used.
+
+    Hedges are limited by a budget: every request earns ``budget_ratio``
+    tokens, up to ``max_tokens``, and every hedge spends one. So at most
+    about ``budget_ratio`` of the requests are hedged, even when a backend
+    is slow for everyone.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, executor, *, percentile=95, budget_ratio=0.1, max_tokens=10,
+                 window=100, min_samples=20):
+        """Initialize a hedger running the requests on executor"""
+        self.executor = executor
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._tokens = max_tokens
+        self._counts = {'requests': 0, 'hedged': 0, 'hedge_won': 0, 'over_budget': 0}
+
+    def call(self, backend, request):
+        """Return request(), hedged if it is slower than usual for backend.
+
+        request must be idempotent and return a falsy value on failure.
+        """
+        delay = self._hedge_delay(backend)
+        primary = self.executor.submit(self._timed, backend, request)
+        if delay is None:
+            return primary.result()
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        if not self._spend_token():
+            return primary.result()
+
+        hedge = self.executor.submit(self._timed, backend, request)
+        response = None
+        for future in concurrent.futures.as_completed([primary, hedge]):
+            response = future.result()
+            if response:
+                if future is hedge:
+                    with self._lock:
+                        self._counts['hedge_won'] += 1
+                break
+        return response
+
+    def _timed(self, backend, request):
+        start = time.monotonic()
+        try:
+            return request()
+        finally:
+            self._record(backend, time.monotonic() - start)
+
+    def _hedge_delay(self, backend):
+        """Return seconds to wait before hedging, None if it is too early to tell"""
+        with self._lock:
+            self._counts['requests'] += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.budget_ratio)
+            return self._delay_for(backend)
+
+    def _delay_for(self, backend):
+        """Caller holds the lock."""
+        latencies = self._latencies.get(backend)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def _spend_token(self):
+        with self._lock:
+            if self._tokens < 1:
+                self._counts['over_budget'] += 1
+                return False
+            self._tokens -= 1
+            self._counts['hedged'] += 1
+            return True
+
+    def _record(self, backend, seconds):
+        with self._lock:
+            latencies = self._latencies.get(backend)
+            if latencies is None:
+                latencies = deque(maxlen=self.window)
+                self._latencies[backend] = latencies
+            latencies.append(seconds)
+
+    def stats(self):
+        """Return hedge counters and the current hedge delay of each backend"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats['percentile'] = self.percentile
+            stats['budget_tokens'] = self._tokens
+            stats['hedge_delay_seconds'] = {backend: self._delay_for(backend)
+                                            for backend in self._latencies}
+            return stats
@@ -0,0 +1,108 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""View model of the transaction history shown on the home page"""
+
+import datetime
+from collections import namedtuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# One row of the history table, every field ready to be printed.
+# credit is True for money received, False for money sent.
+HistoryRow = namedtuple('HistoryRow', ['month', 'day', 'credit', 'account', 'label', 'amount'])
+
+
+def format_cents(int_amount):
+    """Format an amount of cents as dollars, without sign, e.g. $1,234.50"""
+    dollars, cents = divmod(abs(int_amount), 100)
+    return f'${dollars:,}.{cents:02d}'
+
+
+def get_timezone(name, default):
+    """Return the ZoneInfo called name, or default if it is unknown or None"""
+    if not name:
+        return default
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return default
+
+
+def parse_timestamp(timestamp, timestamp_format):
+    """Parse a transaction timestamp into an aware datetime"""
+    try:
+        return datetime.datetime.fromisoformat(timestamp)
+    except ValueError:
+        return datetime.datetime.strptime(timestamp, timestamp_format)
+
+
+def contact_labels(contacts):
+    """Map the account numbers of a list of contacts, or None, to their labels"""
+    return {c['account_num']: c.get('label') for c in contacts or []}
+
+
+def build_history(account_id, transactions, contacts, timezone, timestamp_format):
+    """
+    Return the rows of the history table for account_id.
+
+    Each timestamp is parsed once and shown in timezone. The other account
+    of each transaction is labelled with the matching contact, if any.
+    Transactions that account_id is not part of are left out.
+
+    Params: account_id - the account id for the user owning the transaction list
+            transactions - a list of transactions as key/value dicts, or None
+            contacts - a list of contacts as key/value dicts, or None
+    Return: a list of HistoryRow, None if transactions is None
+    """
+    if transactions is None:
+        return None
+    contact_map = contact_labels(contacts)
+    rows = []
+    for trans in transactions:
+        if trans['toAccountNum'] == account_id:
+            credit, other = True, trans['fromAccountNum']
+        elif trans['fromAccountNum'] == account_id:
+            credit, other = False, trans['toAccountNum']
+        else:
+            continue
+        date = parse_timestamp(trans['timestamp'], timestamp_format).astimezone(timezone)
+        rows.append(HistoryRow(month=date.strftime('%b'),
+                               day=date.strftime('%d'),
+                               credit=credit,
+                               account=other,
+                               label=contact_map.get(other),
+                               amount=('+' if credit else '-') + format_cents(trans['amount'])))
+    return rows
+
+
+def history_page(transactions, cursor, size):
+    """
+    Return one page of a transaction history and the cursor of the next one.
+
+    Transactions are ordered newest first and transaction ids grow over
+    time, so a page starts after the transaction id given as cursor, even
+    if newer transactions arrived in between.
+
+    Params: transactions - a list of transactions as key/value dicts, or None
+            cursor - transaction id the page starts after, None for the first page
+            size - the maximum number of transactions of the page
+    Return: (page, next_cursor), next_cursor is None on the last page
+    """
+    if transactions is None:
+        return None, None
+    if cursor is not None:
+        transactions = [trans for trans in transactions if trans['transactionId'] < cursor]
+    page = transactions[:size]
+    next_cursor = page[-1]['transactionId'] if len(transactions) > size else None
+    return page, next_cursor
@@ -0,0 +1,110 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Idempotency of the transactions submitted by the forms"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from single_flight import SingleFlight
+
+
+class IdempotencyStore:
+    """Bounded, thread-safe record of the outcome of recent submissions.
+
+    The first caller of :meth:`submit` for a key, e.g. an account and the
+    uuid of a form, runs the submission. Callers with the same key wait for
+    it while it runs (see SingleFlight), and get its outcome without
+    running it again until ``ttl`` seconds after it succeeded. Failed
+    submissions are not remembered: their waiters get the same exception,
+    the next caller runs the submission anew. When the store is full the
+    oldest outcome is dropped.
+    """
+
+    def __init__(self, max_size=1024, ttl=600):
+        """Initialize an empty store"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (outcome, expiry), oldest first
+        self._outcomes = OrderedDict()
+        self._flights = SingleFlight()
+        self._counts = {'submitted': 0, 'replayed': 0, 'joined': 0}
+
+    def submit(self, key, function):
+        """Run function for key unless it already ran or is running
+
+        Return: (outcome, replayed) - the return value of function, and
+                whether it was run by an earlier or concurrent caller
+        """
+        entry = self._recall(key)
+        if entry is not None:
+            return entry[0], True
+        # what run did, if this caller ran it: True if it ran function
+        ran = []
+
+        def run():
+            # the outcome is remembered before the flight ends, but a
+            # submission may have ended since it was looked up above
+            entry = self._recall(key)
+            if entry is not None:
+                ran.append(False)
+                return entry[0]
+            ran.append(True)
+            with self._lock:
+                self._counts['submitted'] += 1
+            outcome = function()
+            with self._lock:
+                self._remember(key, outcome)
+            return outcome
+
+        try:
+            outcome = self._flights.do(key, run)
+        finally:
+            if not ran:
+                with self._lock:
+                    self._counts['joined'] += 1
+        return outcome, ran != [True]
+
+    def _recall(self, key):
+        """Return the (outcome, expiry) of key, None if it has none or it expired"""
+        with self._lock:
+            entry = self._outcomes.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            self._counts['replayed'] += 1
+            return entry
+
+    def _remember(self, key, outcome):
+        """Store the outcome of key, drop expired ones. Caller holds the lock."""
+        if self.max_size <= 0:
+            return
+        now = time.monotonic()
+        self._outcomes.pop(key, None)
+        self._outcomes[key] = (outcome, now + self.ttl)
+        # every outcome lives ttl seconds: the oldest expire first
+        while self._outcomes and (len(self._outcomes) > self.max_size
+                                  or next(iter(self._outcomes.values()))[1] <= now):
+            self._outcomes.popitem(last=False)
+
+    def stats(self):
+        """Return size, submissions run, replayed and joined while running"""
+        in_flight = self._flights.stats()['in_flight']
+        with self._lock:
+            stats = dict(self._counts)
+            stats['size'] = len(self._outcomes)
+            stats['max_size'] = self.max_size
+            stats['in_flight'] = in_flight
+            return stats
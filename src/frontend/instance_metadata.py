@@ -0,0 +1,124 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Where the frontend runs, looked up from the GCE metadata server"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+import requests
+from requests.exceptions import RequestException
+
+# value name -> (metadata path, function extracting the value from the response)
+METADATA_VALUES = {
+    'cluster_name': ('instance/attributes/cluster-name', str),
+    # projects/<project number>/zones/<zone>
+    'pod_zone': ('instance/zone', lambda text: text.split('/')[3]),
+}
+
+
+class InstanceMetadata:
+    """Cluster name and zone of this pod, filled in the background.
+
+    The values start as the given defaults, or as the ones cached on disk
+    by a previous run of the pod, so that creating the app never waits for
+    the metadata server. :meth:`start` looks up the values that were not
+    cached concurrently, each with its own short timeout, and caches the
+    ones found. Off GCP, the lookups fail and the defaults are kept.
+    """
+
+    def __init__(self, server, defaults, *, timeout=1.0, cache_path=None, logger=logging):
+        """Initialize with defaults, a dict of value name -> default"""
+        self.url = f'http://{server}/computeMetadata/v1/'
+        self.timeout = timeout
+        self.cache_path = cache_path
+        self.logger = logger
+        self._cache_lock = threading.Lock()
+        self._values = dict(defaults)
+        self._cached = self._read_cache()
+        self._values.update(self._cached)
+
+    @property
+    def cluster_name(self):
+        """GKE cluster name"""
+        return self._values['cluster_name']
+
+    @property
+    def pod_zone(self):
+        """Zone of the node running this pod"""
+        return self._values['pod_zone']
+
+    def start(self):
+        """Look up the values missing from the disk cache in daemon threads.
+
+        Return the started threads, empty if every value was cached.
+        """
+        threads = [threading.Thread(target=self._lookup, args=(name,),
+                                    name=f'metadata-{name}', daemon=True)
+                   for name in METADATA_VALUES if name not in self._cached]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _lookup(self, name):
+        path, extract = METADATA_VALUES[name]
+        try:
+            response = requests.get(self.url + path,
+                                    headers={'Metadata-Flavor': 'Google'},
+                                    timeout=self.timeout)
+            response.raise_for_status()
+            value = extract(response.text)
+        except (RequestException, IndexError) as err:
+            self.logger.warning('Unable to retrieve %s from metadata server: %s', name, err)
+            return
+        self._values[name] = value
+        self._write_cache(name, value)
+
+    def _read_cache(self):
+        """Return the values cached on disk, empty if there are none."""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                cached = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            self.logger.warning('Ignoring metadata cache %s: %s', self.cache_path, err)
+            return {}
+        if not isinstance(cached, dict):
+            return {}
+        return {name: value for name, value in cached.items()
+                if name in METADATA_VALUES and isinstance(value, str)}
+
+    def _write_cache(self, name, value):
+        """Add a value to the disk cache, replacing the file atomically."""
+        if not self.cache_path:
+            return
+        # other workers of the pod may be writing it too, the last one wins
+        with self._cache_lock:
+            cached = self._read_cache()
+            cached[name] = value
+            try:
+                cache_dir = os.path.dirname(os.path.abspath(self.cache_path))
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir,
+                                                 delete=False) as cache_file:
+                    json.dump(cached, cache_file)
+                os.replace(cache_file.name, self.cache_path)
+            except OSError as err:
+                self.logger.warning('Unable to write metadata cache %s: %s',
+                                    self.cache_path, err)
@@ -0,0 +1,115 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON encoding and decoding
+
+orjson, when it is installed, parses and serializes JSON several times
+faster than the standard library. JsonCodec uses it if available and the
+json module otherwise; JSONProvider plugs a codec into Flask, so that
+jsonify and request.get_json use it too.
+"""
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec:
+    """Parses and serializes JSON with orjson or the json module.
+
+    Both produce the same compact UTF-8 output. Values neither supports
+    natively, and datetimes, are converted by the default function.
+    """
+
+    def __init__(self, name='auto'):
+        """Initialize with codec name: 'orjson', 'json' or 'auto', orjson if installed
+
+        Raises:
+            ValueError: if name is unknown, or 'orjson' while it is not installed
+        """
+        if name == 'auto':
+            name = 'json' if orjson is None else 'orjson'
+        if name not in ('orjson', 'json'):
+            raise ValueError(f'unknown JSON codec {name!r}')
+        if name == 'orjson' and orjson is None:
+            raise ValueError('the orjson JSON codec is not installed')
+        self.name = name
+
+    def loads(self, data):
+        """Parse data, a str or UTF-8 bytes
+
+        Raises:
+            ValueError: if data is not valid JSON
+        """
+        if self.name == 'orjson':
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def dumpb(self, obj, *, default=None, sort_keys=False, indent=False):
+        """Serialize obj as UTF-8 JSON bytes, indented by 2 spaces if indent
+
+        Raises:
+            TypeError: if obj holds a value that default does not convert
+        """
+        if self.name == 'orjson':
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=default, option=option)
+        return json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+                          indent=2 if indent else None,
+                          separators=(',', ': ') if indent else (',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        """Like dumpb, but return a str"""
+        return self.dumpb(obj, **kwargs).decode('utf-8')
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using a JsonCodec
+
+    Values are converted and keys sorted like Flask's default provider,
+    but non-ASCII characters are sent as UTF-8 rather than escaped.
+    """
+
+    def __init__(self, app, codec):
+        """Initialize the provider of app"""
+        super().__init__(app)
+        self.codec = codec
+
+    def dumps(self, obj, **kwargs):
+        """Serialize obj as a JSON str"""
+        return self.codec.dumps(obj,
+                                default=kwargs.get('default', self.default),
+                                sort_keys=kwargs.get('sort_keys', self.sort_keys),
+                                indent=bool(kwargs.get('indent')))
+
+    def loads(self, s, **kwargs):
+        """Parse s, a str or UTF-8 bytes"""
+        return self.codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Return a response with the arguments serialized as JSON, like jsonify"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self.codec.dumpb(obj, default=self.default, sort_keys=self.sort_keys,
+                                indent=indent)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,105 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prometheus metrics of the frontend
+
+Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set before the workers start
+(see gunicorn.conf.py): every worker writes its samples to files there and
+the worker answering /metrics reports the sum over all of them. Without
+it, e.g. when running the app directly, each process reports its own.
+"""
+
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN
+
+# backend calls and page views mostly take tens of milliseconds, timeouts
+# are several seconds
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 10)
+RENDER_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25)
+# value of the circuit breaker state gauge, the higher the worse
+BREAKER_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BACKEND_CALL_SECONDS = Histogram(
+    'frontend_backend_call_duration_seconds',
+    'Latency of backend calls, by call and HTTP status ("error" if none was received)',
+    ['call', 'status'], buckets=LATENCY_BUCKETS)
+TEMPLATE_RENDER_SECONDS = Histogram(
+    'frontend_template_render_duration_seconds',
+    'Time spent rendering each template',
+    ['template'], buckets=RENDER_BUCKETS)
+REQUEST_SECONDS = Histogram(
+    'frontend_http_request_duration_seconds',
+    'Latency of the requests served, until the response starts, by route and status',
+    ['route', 'method', 'status'], buckets=LATENCY_BUCKETS)
+REQUEST_ERRORS = Counter(
+    'frontend_http_request_errors_total',
+    'Requests answered with a 5xx status, by route',
+    ['route', 'status'])
+REQUESTS_IN_FLIGHT = Gauge(
+    'frontend_http_requests_in_flight',
+    'Requests being served',
+    multiprocess_mode='livesum')
+ADMISSION_REJECTED = Counter(
+    'frontend_admission_rejected_total',
+    'Requests rejected with a 503 by admission control, by priority',
+    ['priority'])
+ADMISSION_LIMIT = Gauge(
+    'frontend_admission_limit',
+    'Concurrency limit of admission control',
+    multiprocess_mode='livesum')
+BREAKER_STATE = Gauge(
+    'frontend_circuit_breaker_state',
+    'State of the circuit breaker of each backend: 0 closed, 1 half-open, 2 open',
+    ['service'], multiprocess_mode='livemax')
+BREAKER_TRANSITIONS = Counter(
+    'frontend_circuit_breaker_transitions_total',
+    'State changes of the circuit breakers, by backend and new state',
+    ['service', 'state'])
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    'frontend_executor_queue_depth',
+    'Tasks waiting for a free thread of a shared executor',
+    ['executor'], multiprocess_mode='livesum')
+
+
+def observe_backend_call(call, seconds, response):
+    """Record a backend call that took seconds and returned response, None on error"""
+    status = 'error' if response is None else str(response.status_code)
+    BACKEND_CALL_SECONDS.labels(call, status).observe(seconds)
+
+
+def observe_breaker_transition(service, state):
+    """Record the circuit breaker of service changing to state"""
+    BREAKER_STATE.labels(service).set(BREAKER_STATE_VALUES[state])
+    BREAKER_TRANSITIONS.labels(service, state).inc()
+
+
+def observe_request(route, method, status, seconds):
+    """Record a served request"""
+    REQUEST_SECONDS.labels(route, method, str(status)).observe(seconds)
+    if status >= 500:
+        REQUEST_ERRORS.labels(route, str(status)).inc()
+
+
+def exposition():
+    """Return the metrics of every worker in the Prometheus text format, and its content type"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
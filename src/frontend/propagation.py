@@ -0,0 +1,80 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wait for submitted transactions to become visible to the readers"""
+
+import threading
+import time
+
+
+class PropagationWaiter:
+    """Bounded poll with exponential backoff, with thread-safe timing stats.
+
+    The ledger readers pick up new transactions asynchronously. After a
+    transaction is written, :meth:`wait` polls until the write is visible,
+    starting with a ``first_delay`` second pause that doubles up to
+    ``max_delay``, and gives up after ``timeout`` seconds.
+    """
+
+    def __init__(self, timeout=0.25, first_delay=0.02, max_delay=0.2):
+        """Initialize a propagation waiter"""
+        self.timeout = timeout
+        self.first_delay = first_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._counts = {'visible': 0, 'timed_out': 0, 'polls': 0}
+        self._seconds = {'total': 0.0, 'max': 0.0}
+
+    def wait(self, is_visible):
+        """Poll is_visible() until it returns True or the timeout is reached.
+
+        Return: True if the write became visible in time
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        delay = self.first_delay
+        polls = 0
+        visible = False
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            time.sleep(min(delay, deadline - now))
+            delay = min(delay * 2, self.max_delay)
+            polls += 1
+            if is_visible():
+                visible = True
+                break
+        self._record(time.monotonic() - start, polls, visible)
+        return visible
+
+    def _record(self, seconds, polls, visible):
+        with self._lock:
+            self._counts['visible' if visible else 'timed_out'] += 1
+            self._counts['polls'] += polls
+            if visible:
+                self._seconds['total'] += seconds
+                self._seconds['max'] = max(self._seconds['max'], seconds)
+
+    def stats(self):
+        """Return how often and how fast writes became visible"""
+        with self._lock:
+            visible = self._counts['visible']
+            return {'visible': visible,
+                    'timed_out': self._counts['timed_out'],
+                    'polls': self._counts['polls'],
+                    'timeout_seconds': self.timeout,
+                    'propagation_seconds_max': self._seconds['max'],
+                    'propagation_seconds_avg':
+                        self._seconds['total'] / visible if visible else 0.0}
@@ -0,0 +1,143 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of backend responses with stale-while-revalidate"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:  # pylint: disable=too-many-instance-attributes
+    """Bounded, thread-safe cache of parsed backend responses.
+
+    Keys identify a backend and the account or user it was asked about,
+    e.g. ``('balance', '1011226111')``. An entry younger than ``ttl`` seconds
+    is fresh. Until ``stale_ttl`` seconds it is still served, but the first
+    reader is told to refresh it in the background. Older entries are only
+    handed out by :meth:`fallback` when the backend fails, up to
+    ``stale_if_error`` seconds. When the cache is full the least recently
+    used entry is evicted.
+
+    Every invalidation bumps :attr:`generation`. A response fetched before
+    an invalidation is not stored, so a refresh racing with a write never
+    puts the old value back.
+    """
+
+    def __init__(self, max_size=1024, ttl=2, stale_ttl=10, stale_if_error=300):
+        """Initialize a response cache"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self.generation = 0
+        self._lock = threading.Lock()
+        # key -> (value, monotonic time it was stored)
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._counts = {'hits': 0, 'stale_hits': 0, 'misses': 0,
+                        'stale_on_error': 0, 'invalidations': 0}
+        self._staleness = {'total': 0.0, 'max': 0.0}
+
+    def lookup(self, key):
+        """Return (value, refresh) for key.
+
+        value is None if there is no servable entry. refresh is True if the
+        entry is stale and the caller should fetch it again; it is given to
+        one caller at a time, which must call :meth:`end_refresh` afterwards.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = None if entry is None else now - entry[1]
+            if age is None or age >= self.stale_ttl:
+                if age is not None and age >= self.stale_if_error:
+                    del self._entries[key]
+                self._counts['misses'] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if age < self.ttl:
+                self._counts['hits'] += 1
+                return entry[0], False
+            self._counts['stale_hits'] += 1
+            self._record_staleness(age)
+            refresh = key not in self._refreshing
+            if refresh:
+                self._refreshing.add(key)
+            return entry[0], refresh
+
+    def fallback(self, key):
+        """Return the last value of key if fetching it failed, None if too old"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] >= self.stale_if_error:
+                return None
+            self._counts['stale_on_error'] += 1
+            self._record_staleness(now - entry[1])
+            return entry[0]
+
+    def peek(self, key):
+        """Return the value of key if it is fresh, without counting a read"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] >= self.ttl:
+                return None
+            return entry[0]
+
+    def put(self, key, value, generation):
+        """Store value for key unless the cache was invalidated since generation"""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def end_refresh(self, key):
+        """Allow key to be refreshed again"""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, *keys):
+        """Drop keys, e.g. after a write changed what the backend returns"""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counts['invalidations'] += 1
+
+    def _record_staleness(self, age):
+        """Caller holds the lock."""
+        self._staleness['total'] += age
+        self._staleness['max'] = max(self._staleness['max'], age)
+
+    def stats(self):
+        """Return size, hit ratio and staleness of the served entries"""
+        with self._lock:
+            counts = dict(self._counts)
+            lookups = counts['hits'] + counts['stale_hits'] + counts['misses']
+            stale_served = counts['stale_hits'] + counts['stale_on_error']
+            counts.update({
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hit_ratio': (counts['hits'] + counts['stale_hits']) / lookups if lookups else 0.0,
+                'staleness_seconds_max': self._staleness['max'],
+                'staleness_seconds_avg':
+                    self._staleness['total'] / stale_served if stale_served else 0.0})
+            return counts
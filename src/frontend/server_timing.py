@@ -0,0 +1,63 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-Timing response header"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ServerTiming:
+    """Thread-safe collection of the phases of one request.
+
+    Phases are recorded from the request thread and from the threads or
+    greenlets running its backend calls, then sent as a Server-Timing
+    header (https://www.w3.org/TR/server-timing/), which browser developer
+    tools show next to the request. A phase may be recorded several times,
+    e.g. every poll of a balance.
+    """
+
+    def __init__(self):
+        """Initialize with no phase recorded"""
+        self._lock = threading.Lock()
+        self._entries = []
+
+    def add(self, name, seconds=None, description=None):
+        """Record phase name that took seconds, or a phase without duration"""
+        with self._lock:
+            self._entries.append((name, seconds, description))
+
+    @contextmanager
+    def phase(self, name, description=None):
+        """Record the time the with block takes as phase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, description)
+
+    def header(self):
+        """Return the value of the Server-Timing header, durations in milliseconds"""
+        with self._lock:
+            entries = list(self._entries)
+        metrics = []
+        for name, seconds, description in entries:
+            metric = name
+            if seconds is not None:
+                metric += f';dur={seconds * 1000:.1f}'
+            if description is not None:
+                metric += ';desc="' + description.replace('\\', '').replace('"', '') + '"'
+            metrics.append(metric)
+        return ', '.join(metrics)
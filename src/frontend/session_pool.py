@@ -0,0 +1,125 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pooled keep-alive HTTP sessions for backend calls"""
+
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """Thread-safe set of keep-alive sessions, one per backend.
+
+    A backend is identified by the scheme, host and port of the URL being
+    called. Each backend gets its own :class:`requests.Session` whose
+    connection pool holds up to ``pool_size`` idle keep-alive connections.
+    Sessions that have not been used for ``idle_timeout`` seconds are closed
+    so that connections to rescheduled backend pods do not linger.
+    """
+
+    def __init__(self, pool_size=10, idle_timeout=60):
+        """Initialize a session pool"""
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._last_used = {}
+        self._last_eviction = time.monotonic()
+        # counters of sessions that were already evicted
+        self._evicted = {'hits': 0, 'misses': 0}
+
+    def session_for(self, url):
+        """Return the shared session for the backend serving url"""
+        parts = urlsplit(url)
+        backend = f'{parts.scheme}://{parts.netloc}'
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_eviction > self.idle_timeout:
+                self._evict_idle(now)
+            session = self._sessions.get(backend)
+            if session is None:
+                session = self._new_session()
+                self._sessions[backend] = session
+            self._last_used[backend] = now
+            return session
+
+    def _new_session(self):
+        """Create a keep-alive session that never stores cookies"""
+        session = Session()
+        # The session is shared by every user of this process. Never let
+        # a cookie set by a backend leak into another user's request.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _evict_idle(self, now):
+        """Close sessions not used for idle_timeout seconds. Caller holds the lock."""
+        self._last_eviction = now
+        for backend, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout:
+                session = self._sessions.pop(backend)
+                del self._last_used[backend]
+                hits, misses = _connection_counts(session)
+                self._evicted['hits'] += hits
+                self._evicted['misses'] += misses
+                session.close()
+
+    def stats(self):
+        """Return connection reuse counters per backend and in total.
+
+        A hit is a request served on an already open keep-alive connection,
+        a miss is a request that had to open a new connection.
+        """
+        with self._lock:
+            backends = {}
+            total_hits = self._evicted['hits']
+            total_misses = self._evicted['misses']
+            for backend, session in self._sessions.items():
+                hits, misses = _connection_counts(session)
+                backends[backend] = {'hits': hits, 'misses': misses}
+                total_hits += hits
+                total_misses += misses
+        return {'backends': backends,
+                'hits': total_hits,
+                'misses': total_misses,
+                'pool_size': self.pool_size}
+
+    def close(self):
+        """Close every session in the pool"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._last_used.clear()
+
+
+def _connection_counts(session):
+    """Return (hits, misses) of the urllib3 connection pools behind session"""
+    requests_made = 0
+    connections_made = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                requests_made += pool.num_requests
+                connections_made += pool.num_connections
+    return requests_made - connections_made, connections_made
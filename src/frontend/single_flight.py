@@ -0,0 +1,70 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Coalescing of identical concurrent backend calls"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Thread-safe request coalescing.
+
+    The first caller of :meth:`do` for a key runs the call. Callers asking
+    for the same key while it runs wait for it and get the same result, or
+    the same exception, instead of running it again. Once the call ended,
+    the next caller for the key runs it anew: results are shared, not
+    cached.
+    """
+
+    def __init__(self):
+        """Initialize with no call in flight"""
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._counts = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key, function):
+        """Return function(), or the result of the running call for key"""
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._in_flight[key] = flight
+                self._counts['calls'] += 1
+            else:
+                self._counts['coalesced'] += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            flight.set_result(function())
+        except Exception as err:  # pylint: disable=broad-except
+            flight.set_exception(err)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            if not flight.done():
+                # interrupted, e.g. the greenlet was killed: release the waiters
+                flight.set_exception(RuntimeError(f'call for {key!r} was interrupted'))
+        return flight.result()
+
+    def stats(self):
+        """Return the number of calls run and of calls that joined a running one"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats['in_flight'] = len(self._in_flight)
+        total = stats['calls'] + stats['coalesced']
+        stats['coalesced_ratio'] = stats['coalesced'] / total if total else 0.0
+        return stats
@@ -15,6 +15,9 @@
  */
  
 document.addEventListener("DOMContentLoaded", function(event) {
+  // Transaction dates are shown in the browser's time zone
+  document.cookie = "tz=" + Intl.DateTimeFormat().resolvedOptions().timeZone + "; path=/; SameSite=Lax";
+
   // Deposit modal client-side validation
   var depositForm = document.querySelector("#deposit-form");
   depositForm.addEventListener("submit", function(e) {
@@ -98,4 +101,39 @@ document.addEventListener("DOMContentLoaded", function(event) {
       document.querySelector("#deposit-uuid").value = uuidv4();
   }
   RefreshModals();
+
+  // Load older transactions when the end of the history table is reached
+  var moreTransactions = document.querySelector("#transaction-list-more");
+  if (moreTransactions && "IntersectionObserver" in window) {
+    var loading = false;
+    var observer = new IntersectionObserver(function(entries) {
+      if (loading || !entries[0].isIntersecting) {
+        return;
+      }
+      loading = true;
+      fetch("history?cursor=" + encodeURIComponent(moreTransactions.dataset.nextCursor), {credentials: "same-origin"})
+        .then(function(response) {
+          if (!response.ok) {
+            throw new Error(response.statusText);
+          }
+          return response.text().then(function(rows) {
+            document.querySelector("#transaction-list").insertAdjacentHTML("beforeend", rows);
+            var nextCursor = response.headers.get("X-Next-Cursor");
+            if (nextCursor) {
+              moreTransactions.dataset.nextCursor = nextCursor;
+            } else {
+              observer.disconnect();
+              moreTransactions.remove();
+            }
+          });
+        })
+        .catch(function(err) {
+          observer.disconnect();
+        })
+        .finally(function() {
+          loading = false;
+        });
+    });
+    observer.observe(moreTransactions);
+  }
 });
@@ -15,6 +15,9 @@
  */
  
 document.addEventListener("DOMContentLoaded", function(event) {
+  // Transaction dates are shown in the browser's time zone
+  document.cookie = "tz=" + Intl.DateTimeFormat().resolvedOptions().timeZone + "; path=/; SameSite=Lax";
+
   // Login client-side validation
   var login = document.querySelector("#login-form");
   login.addEventListener("submit", function(e) {
@@ -0,0 +1,171 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fingerprinted, precompressed static assets and compressed responses"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, abort
+
+try:
+    import brotli
+except ImportError:  # brotli variants are only served if it is installed
+    brotli = None
+
+# a year, the longest max-age caches honour
+IMMUTABLE_MAX_AGE = 31536000
+# max-age of assets requested without fingerprint, e.g. from old pages
+PLAIN_MAX_AGE = 300
+# content types worth compressing
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+# added to the ETag of responses compressed by compress_response
+GZIP_ETAG_SUFFIX = '-gzip'
+# added to the ETag of each compressed variant of a static asset
+ETAG_SUFFIXES = {'br': '-br', 'gzip': GZIP_ETAG_SUFFIX}
+
+
+class StaticAsset:
+    """One static file, its fingerprinted name and compressed variants.
+
+    Each variant is compressed at the highest level the first time it is
+    asked for, then kept, so no request pays for compressing an asset
+    again and worker startup does not pay for slow brotli compression.
+    """
+
+    def __init__(self, path, body):
+        """Initialize an asset read from path"""
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        base, ext = os.path.splitext(path)
+        self.fingerprinted_path = f'{base}.{self.etag[:10]}{ext}'
+        self.encodings = []
+        if self.mimetype.startswith(COMPRESSIBLE_TYPES):
+            self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        # encoding -> compressed body, None if not smaller than the original
+        self._variants = {}
+
+    def variant(self, encoding):
+        """Return the body compressed with encoding, None if not worth it"""
+        if encoding not in self._variants:
+            if encoding == 'br':
+                compressed = brotli.compress(self.body, quality=11)
+            else:
+                compressed = gzip.compress(self.body, compresslevel=9, mtime=0)
+            # computing it twice in concurrent requests is harmless
+            self._variants[encoding] = compressed if len(compressed) < len(self.body) else None
+        return self._variants[encoding]
+
+    def negotiate(self, request):
+        """Return the encoding to serve to request, None for the plain body"""
+        for encoding in self.encodings:
+            # e.g. gzip when br is accepted but does not make the body smaller
+            if request.accept_encodings[encoding] > 0 and self.variant(encoding) is not None:
+                return encoding
+        return None
+
+
+class StaticAssets:
+    """The files of a static folder, read once at startup.
+
+    Templates link to assets through :meth:`url`, which adds a digest of
+    the file's content to its name, e.g. ``static/scripts/index.3f2a9c1b0e.js``.
+    Such URLs change whenever the file changes, so they are served with a
+    far-future, immutable Cache-Control. Plain file names keep working with
+    a short max-age.
+    """
+
+    def __init__(self, folder, url_prefix='static'):
+        """Initialize the assets found in folder"""
+        self.url_prefix = url_prefix
+        self._assets = {}
+        self._fingerprinted = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, folder).replace(os.sep, '/')
+                with open(full_path, 'rb') as asset_file:
+                    asset = StaticAsset(path, asset_file.read())
+                self._assets[path] = asset
+                self._fingerprinted[asset.fingerprinted_path] = path
+
+    def url(self, path):
+        """Return the relative, fingerprinted URL of the asset at path"""
+        asset = self._assets.get(path)
+        if asset is None:
+            return f'{self.url_prefix}/{path}'
+        return f'{self.url_prefix}/{asset.fingerprinted_path}'
+
+    def response(self, filename, request):
+        """Return the response serving filename to request"""
+        immutable = filename in self._fingerprinted
+        asset = self._assets.get(self._fingerprinted.get(filename, filename))
+        if asset is None:
+            return abort(404)
+
+        encoding = asset.negotiate(request)
+        resp = Response(mimetype=asset.mimetype)
+        # a strong ETag names one exact representation
+        resp.set_etag(asset.etag + ETAG_SUFFIXES.get(encoding, ''))
+        if immutable:
+            resp.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            resp.headers['Cache-Control'] = f'public, max-age={PLAIN_MAX_AGE}'
+        if asset.encodings:
+            resp.vary.add('Accept-Encoding')
+        if etag_matches(request, asset.etag):
+            resp.status_code = 304
+            return resp
+
+        if encoding is None:
+            resp.set_data(asset.body)
+        else:
+            resp.set_data(asset.variant(encoding))
+            resp.headers['Content-Encoding'] = encoding
+        return resp
+
+
+def compress_response(response, request, min_size):
+    """
+    Gzip a dynamic response if it is at least min_size bytes long and the
+    client accepts it. Streamed and already encoded responses are left alone.
+    """
+    if min_size <= 0 or response.status_code != 200:
+        return response
+    if (response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+        return response
+    response.vary.add('Accept-Encoding')
+    if request.accept_encodings['gzip'] <= 0:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag is not None:
+        # a strong ETag names one exact representation
+        response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+    return response
+
+
+def etag_matches(request, etag):
+    """Return True if request's If-None-Match names etag, compressed or not"""
+    return any(request.if_none_match.contains(etag + suffix)
+               for suffix in ('', *ETAG_SUFFIXES.values()))
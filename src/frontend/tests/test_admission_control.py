@@ -0,0 +1,112 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for admission_control module
+"""
+
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+
+from admission_control import CRITICAL, NORMAL, AdmissionController
+
+ROUTE = 'GET /home'
+
+
+class TestAdmissionController(unittest.TestCase):
+    """test the adaptive concurrency limit"""
+
+    def setUp(self):
+        """setup before each test"""
+        self.now = 1000.0
+        patcher = patch('admission_control.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def controller(self, **kwargs):
+        """return an admission controller with a quiet logger"""
+        return AdmissionController(logger=MagicMock(), **kwargs)
+
+    def serve(self, controller, latencies, concurrency, timed=True):
+        """serve requests taking latencies while concurrency - 1 others are in flight.
+
+        Return the number of requests rejected.
+        """
+        others = [controller.try_acquire(ROUTE, CRITICAL) for _ in range(concurrency - 1)]
+        self.assertNotIn(None, others)
+        rejected = 0
+        for latency in latencies:
+            ticket = controller.try_acquire(ROUTE, CRITICAL, timed=timed)
+            self.now += latency
+            if ticket is None:
+                rejected += 1
+                continue
+            controller.release(ticket)
+        for ticket in others:
+            # slow, but not timed, so that they do not count
+            ticket.timed = False
+            controller.release(ticket)
+        return rejected
+
+    def test_normal_requests_leave_reserved_capacity(self):
+        """test page views are rejected before posted forms"""
+        controller = self.controller(initial_limit=8, reserved=0.25)
+        tickets = [controller.try_acquire(ROUTE, NORMAL) for _ in range(6)]
+        self.assertNotIn(None, tickets)
+        self.assertIsNone(controller.try_acquire(ROUTE, NORMAL))
+        self.assertIsNotNone(controller.try_acquire('POST /payment', CRITICAL))
+        self.assertIsNotNone(controller.try_acquire('POST /payment', CRITICAL))
+        self.assertIsNone(controller.try_acquire('POST /payment', CRITICAL))
+        stats = controller.stats()
+        self.assertEqual((stats['rejected_normal'], stats['rejected_critical']), (1, 1))
+        self.assertEqual(stats['in_flight'], 8)
+
+    def test_bimodal_latency_keeps_limit(self):
+        """test occasional slow requests, e.g. cache misses, do not lower the limit"""
+        controller = self.controller(initial_limit=6)
+        rng = random.Random(42)
+        latencies = [0.01 if rng.random() < 0.3 else 0.001 for _ in range(5000)]
+        self.assertEqual(self.serve(controller, latencies, concurrency=4), 0)
+        self.assertGreaterEqual(controller.limit, 6)
+
+    def test_sustained_slowdown_lowers_limit_then_recovers(self):
+        """test the limit shrinks while requests are slower, and grows back after"""
+        controller = self.controller(initial_limit=10, min_limit=2)
+        self.serve(controller, [0.01] * 200, concurrency=5)
+        self.assertEqual(controller.stats()['decreases'], 0)
+        limit = controller.limit
+
+        self.serve(controller, [0.1] * 20, concurrency=6)
+        self.assertLess(controller.limit, limit)
+        self.assertGreater(controller.stats()['decreases'], 0)
+        lowered = controller.limit
+
+        # enough requests in flight to use the limit, which it grows with
+        self.serve(controller, [0.01] * 500, concurrency=lowered // 2 + 1)
+        self.assertGreater(controller.limit, lowered)
+
+    def test_limit_holds_when_little_used(self):
+        """test slow requests do not lower a limit that is not what slows them down"""
+        controller = self.controller(initial_limit=20)
+        self.serve(controller, [0.01] * 100 + [0.5] * 50, concurrency=4)
+        self.assertEqual(controller.limit, 20)
+        self.assertEqual(controller.stats()['decreases'], 0)
+
+    def test_untimed_requests_do_not_change_limit(self):
+        """test long downloads do not count as slow requests"""
+        controller = self.controller(initial_limit=10)
+        self.serve(controller, [0.01] * 100, concurrency=5)
+        self.serve(controller, [5.0] * 50, concurrency=5, timed=False)
+        self.assertEqual(controller.stats()['decreases'], 0)
@@ -0,0 +1,94 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for the /api/home endpoint of the frontend
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from frontend.benchmarks import stub_backends
+from frontend.frontend import create_app
+
+
+class TestApiHomeETag(unittest.TestCase):
+    """test conditional requests of /api/home"""
+
+    @classmethod
+    def setUpClass(cls):
+        """start stub backends and a frontend using them"""
+        private_pem, public_key_path = stub_backends.generate_keys(tempfile.mkdtemp())
+        cls.state = stub_backends.StubState(private_pem)
+        cls.server = stub_backends.start(cls.state)
+        env = stub_backends.frontend_env(f'127.0.0.1:{cls.server.server_port}',
+                                         public_key_path)
+        # every request reads the balance from the stubs
+        env.update({'RESPONSE_CACHE_TTL': '0', 'COMPRESS_MIN_SIZE': '1'})
+        with patch.dict(os.environ, env):
+            cls.app = create_app()
+        cls.token = stub_backends.make_token(private_pem)
+
+    @classmethod
+    def tearDownClass(cls):
+        """stop the stub backends"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """setup before each test"""
+        self.client = self.app.test_client()
+        self.client.set_cookie('token', self.token)
+
+    def get(self, **headers):
+        """GET /api/home with headers"""
+        return self.client.get('/api/home', headers=headers)
+
+    def test_matching_etag_is_not_modified(self):
+        """test a request naming the ETag it got is answered with an empty 304"""
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        again = self.get(**{'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b'')
+        self.assertEqual(again.headers['ETag'], etag)
+
+    def test_gzip_etag_is_not_modified(self):
+        """test the ETag of the gzipped response matches too"""
+        first = self.get(**{'Accept-Encoding': 'gzip'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers['Content-Encoding'], 'gzip')
+        etag = first.headers['ETag']
+        self.assertTrue(etag.endswith('-gzip"'), etag)
+        again = self.get(**{'If-None-Match': etag, 'Accept-Encoding': 'gzip'})
+        self.assertEqual(again.status_code, 304)
+        # without the suffix, the ETag of the uncompressed response
+        self.assertEqual(again.headers['ETag'], etag.replace('-gzip', ''))
+
+    def test_changed_balance_changes_etag(self):
+        """test a response that would differ is sent in full with a new ETag"""
+        etag = self.get().headers['ETag']
+        with self.state.lock:
+            self.state.balance += 100
+        try:
+            changed = self.get(**{'If-None-Match': etag})
+        finally:
+            with self.state.lock:
+                self.state.balance -= 100
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+        self.assertEqual(changed.json['balance'], self.state.balance + 100)
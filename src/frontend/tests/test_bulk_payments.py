@@ -0,0 +1,122 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for bulk_payments module
+"""
+
+import unittest
+
+from bulk_payments import Transfer, derived_uuid, parse_rows, validate
+
+ACCOUNT_ID = '1011226111'
+BATCH_ID = 'batch-1'
+
+
+def payment(account_num='1033623433', amount='10.00', **fields):
+    """return a payment row"""
+    return dict(fields, account_num=account_num, amount=amount)
+
+
+class TestValidate(unittest.TestCase):
+    """test validation of bulk payments"""
+
+    def test_valid_rows_become_transfers(self):
+        """test amounts are converted to cents and rows counted from 1"""
+        transfers, errors = validate([payment(), payment('1055757655', ' 0.5 ', uuid='u-1')],
+                                     ACCOUNT_ID, BATCH_ID, max_rows=10)
+        self.assertEqual(errors, [])
+        self.assertEqual(transfers,
+                         [Transfer(1, '1033623433', 1000, derived_uuid(ACCOUNT_ID, BATCH_ID, 1)),
+                          Transfer(2, '1055757655', 50, 'u-1')])
+
+    def test_invalid_rows(self):
+        """test each invalid field is reported with its row"""
+        rows = [payment(account_num='123'),
+                payment(account_num=ACCOUNT_ID),
+                payment(amount='-1'),
+                payment(amount='0'),
+                payment(amount='1.005'),
+                payment(amount='ten'),
+                payment(amount='NaN'),
+                {'amount': '1'}]
+        transfers, errors = validate(rows, ACCOUNT_ID, BATCH_ID, max_rows=10)
+        self.assertEqual(transfers, [])
+        self.assertEqual([error['row'] for error in errors], list(range(1, len(rows) + 1)))
+        self.assertEqual(errors[0]['error'], 'account_num must be 10 digits')
+        self.assertEqual(errors[1]['error'], 'cannot pay your own account')
+        for error in errors[2:7]:
+            self.assertIn('is not a positive amount with at most 2 decimals', error['error'])
+        self.assertEqual(errors[7]['error'], 'account_num must be 10 digits')
+
+    def test_duplicate_uuid(self):
+        """test a uuid used twice in a batch is reported on its second row"""
+        rows = [payment(uuid='u-1'), payment(uuid='u-2'), payment(uuid='u-1')]
+        transfers, errors = validate(rows, ACCOUNT_ID, BATCH_ID, max_rows=10)
+        self.assertEqual(errors, [{'row': 3, 'error': 'duplicate uuid'}])
+        self.assertEqual([transfer.row for transfer in transfers], [1, 2])
+
+    def test_derived_uuids_are_stable(self):
+        """test rows without uuid get the same one when the batch is sent again"""
+        first, _ = validate([payment(), payment()], ACCOUNT_ID, BATCH_ID, max_rows=10)
+        again, _ = validate([payment(), payment()], ACCOUNT_ID, BATCH_ID, max_rows=10)
+        other, _ = validate([payment(), payment()], ACCOUNT_ID, 'batch-2', max_rows=10)
+        self.assertEqual([transfer.uuid for transfer in first],
+                         [transfer.uuid for transfer in again])
+        self.assertNotEqual(first[0].uuid, first[1].uuid)
+        self.assertNotEqual(first[0].uuid, other[0].uuid)
+
+    def test_derived_uuids_differ_between_accounts(self):
+        """test accounts sending the same batch id do not share uuids"""
+        first, _ = validate([payment(), payment()], ACCOUNT_ID, BATCH_ID, max_rows=10)
+        other, _ = validate([payment(), payment()], '1055757655', BATCH_ID, max_rows=10)
+        again, _ = validate([payment(), payment()], '1055757655', BATCH_ID, max_rows=10)
+        self.assertFalse({transfer.uuid for transfer in first}
+                         & {transfer.uuid for transfer in other})
+        self.assertEqual([transfer.uuid for transfer in other],
+                         [transfer.uuid for transfer in again])
+
+    def test_partial_failure_reports_every_invalid_row(self):
+        """test invalid rows are all reported, valid rows are still returned"""
+        rows = [payment(), payment(amount='abc'), payment(), payment(account_num='x')]
+        transfers, errors = validate(rows, ACCOUNT_ID, BATCH_ID, max_rows=10)
+        self.assertEqual([error['row'] for error in errors], [2, 4])
+        self.assertEqual([transfer.row for transfer in transfers], [1, 3])
+
+    def test_empty_and_oversized_batches(self):
+        """test a batch must have between 1 and max_rows payments"""
+        self.assertEqual(validate([], ACCOUNT_ID, BATCH_ID, max_rows=10),
+                         ([], [{'row': 0, 'error': 'no payments'}]))
+        self.assertEqual(validate([payment()] * 3, ACCOUNT_ID, BATCH_ID, max_rows=2),
+                         ([], [{'row': 0, 'error': 'more than 2 payments'}]))
+
+
+class TestParseRows(unittest.TestCase):
+    """test parsing of bulk payment documents"""
+
+    def test_json_list_or_object(self):
+        """test JSON may be a list of payments or hold it in payments"""
+        rows = [payment()]
+        self.assertEqual(parse_rows(rows, 'application/json'), rows)
+        self.assertEqual(parse_rows({'payments': rows}, 'application/json'), rows)
+        for document in ({'rows': rows}, [1, 2], 'text'):
+            with self.assertRaises(ValueError):
+                parse_rows(document, 'application/json')
+
+    def test_csv_with_header(self):
+        """test CSV rows are read by their header"""
+        rows = parse_rows('account_num,amount,uuid\n1033623433,1.50,u-1\n', 'text/csv')
+        self.assertEqual(rows, [{'account_num': '1033623433', 'amount': '1.50', 'uuid': 'u-1'}])
+        with self.assertRaises(ValueError):
+            parse_rows('account,value\n1033623433,1.50\n', 'text/csv')
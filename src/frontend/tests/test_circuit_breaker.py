@@ -0,0 +1,129 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for circuit_breaker module
+"""
+
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from api_call import ApiCall, ApiRequest
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """test the states of a circuit breaker"""
+
+    def setUp(self):
+        """setup before each test"""
+        self.now = 100.0
+        patcher = patch('circuit_breaker.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.on_transition = MagicMock()
+        self.breaker = CircuitBreaker('http://balancereader:8080', failure_threshold=3,
+                                      reset_timeout=10, logger=MagicMock(),
+                                      on_transition=self.on_transition)
+
+    def open_breaker(self):
+        """fail as many calls in a row as the threshold"""
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_closed_open_half_open_closed(self):
+        """test a breaker opens, lets a trial through after the timeout and closes"""
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.open_breaker()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # a single trial call at a time
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.on_transition.call_args_list,
+                         [call('http://balancereader:8080', OPEN),
+                          call('http://balancereader:8080', HALF_OPEN),
+                          call('http://balancereader:8080', CLOSED)])
+        stats = self.breaker.stats()
+        self.assertEqual((stats['opened'], stats['half_opened'], stats['closed']), (1, 1, 1))
+        self.assertEqual(stats['rejected'], 2)
+
+    def test_failed_trial_opens_again(self):
+        """test a failing trial call reopens the breaker for another timeout"""
+        self.open_breaker()
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.now += 9
+        self.assertFalse(self.breaker.allow())
+        self.now += 1
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+    def test_success_resets_consecutive_failures(self):
+        """test only failures in a row open the breaker"""
+        for _ in range(5):
+            self.breaker.record_failure()
+            self.breaker.record_failure()
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.on_transition.assert_not_called()
+
+    def test_interrupted_trial_lets_another_through(self):
+        """test a trial call killed before it ended does not keep the breaker half-open"""
+        self.open_breaker()
+        self.now += 10
+        session = MagicMock()
+        session.get.side_effect = KeyboardInterrupt
+        call_backend = ApiCall('balance', ApiRequest('http://balancereader:8080/balances/1',
+                                                     {}, timeout=1),
+                               MagicMock(), session=session, breaker=self.breaker)
+        with self.assertRaises(KeyboardInterrupt):
+            call_backend.make_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_zero_threshold_disables_breaker(self):
+        """test a breaker with no threshold lets every call through"""
+        breaker = CircuitBreaker('http://contacts:8080', failure_threshold=0, logger=MagicMock())
+        for _ in range(10):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+
+
+class TestCircuitBreakers(unittest.TestCase):
+    """test the set of circuit breakers"""
+
+    def test_one_breaker_per_backend(self):
+        """test URLs of the same scheme, host and port share a breaker"""
+        on_transition = MagicMock()
+        breakers = CircuitBreakers(failure_threshold=1, logger=MagicMock(),
+                                   on_transition=on_transition)
+        breaker = breakers.breaker_for('http://balancereader:8080/balances/1011226111')
+        self.assertIs(breaker, breakers.breaker_for('http://balancereader:8080/balances/2'))
+        self.assertIsNot(breaker, breakers.breaker_for('http://contacts:8080/contacts/user'))
+        breaker.record_failure()
+        on_transition.assert_called_once_with('http://balancereader:8080', OPEN)
+        self.assertEqual(breakers.stats()['http://balancereader:8080']['state'], OPEN)
+        self.assertEqual(breakers.stats()['http://contacts:8080']['state'], CLOSED)
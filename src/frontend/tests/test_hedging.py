@@ -0,0 +1,118 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for hedging module
+"""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hedging import Hedger
+
+
+class SlowOnce:
+    """Request whose first call blocks until released, later calls answer at once"""
+
+    def __init__(self, first='slow', later='fast'):
+        self.first = first
+        self.later = later
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            self.release.wait(5)
+            return self.first
+        return self.later
+
+
+class TestHedger(unittest.TestCase):
+    """test hedged backend requests"""
+
+    def setUp(self):
+        """setup before each test"""
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+
+    def warm_up(self, hedger, backend='balancereader', samples=5):
+        """record fast requests until the hedger knows the latency of backend"""
+        for _ in range(samples):
+            hedger.call(backend, lambda: 'warm')
+
+    def test_no_hedge_before_min_samples(self):
+        """test requests are not hedged while the latency is unknown"""
+        hedger = Hedger(self.executor, min_samples=5)
+        request = SlowOnce()
+        threading.Timer(0.1, request.release.set).start()
+        self.assertEqual(hedger.call('balancereader', request), 'slow')
+        self.assertEqual(request.calls, 1)
+        stats = hedger.stats()
+        self.assertEqual(stats['hedged'], 0)
+        self.assertEqual(stats['hedge_delay_seconds'], {'balancereader': None})
+
+    def test_slow_request_is_hedged_and_hedge_wins(self):
+        """test a request slower than the percentile is sent again"""
+        hedger = Hedger(self.executor, min_samples=5)
+        self.warm_up(hedger)
+        request = SlowOnce()
+        self.assertEqual(hedger.call('balancereader', request), 'fast')
+        request.release.set()
+        self.assertEqual(request.calls, 2)
+        stats = hedger.stats()
+        self.assertEqual(stats['hedged'], 1)
+        self.assertEqual(stats['hedge_won'], 1)
+
+    def test_failed_hedge_waits_for_primary(self):
+        """test a falsy hedge response does not replace the primary one"""
+        hedger = Hedger(self.executor, min_samples=5)
+        self.warm_up(hedger)
+        request = SlowOnce(later=None)
+        threading.Timer(0.1, request.release.set).start()
+        self.assertEqual(hedger.call('balancereader', request), 'slow')
+        stats = hedger.stats()
+        self.assertEqual(stats['hedged'], 1)
+        self.assertEqual(stats['hedge_won'], 0)
+
+    def test_hedges_are_limited_by_budget(self):
+        """test no hedge is sent once the budget is spent"""
+        hedger = Hedger(self.executor, min_samples=5, budget_ratio=0, max_tokens=1)
+        self.warm_up(hedger)
+        for expected_calls, expected in ((2, 'fast'), (1, 'slow')):
+            request = SlowOnce()
+            if expected == 'slow':
+                threading.Timer(0.1, request.release.set).start()
+            self.assertEqual(hedger.call('balancereader', request), expected)
+            request.release.set()
+            self.assertEqual(request.calls, expected_calls)
+        stats = hedger.stats()
+        self.assertEqual(stats['hedged'], 1)
+        self.assertEqual(stats['over_budget'], 1)
+
+    def test_latencies_are_kept_per_backend(self):
+        """test the latency of one backend does not enable hedging another"""
+        hedger = Hedger(self.executor, min_samples=5)
+        self.warm_up(hedger, backend='contacts')
+        request = SlowOnce()
+        threading.Timer(0.1, request.release.set).start()
+        self.assertEqual(hedger.call('balancereader', request), 'slow')
+        self.assertEqual(request.calls, 1)
+        delays = hedger.stats()['hedge_delay_seconds']
+        self.assertIsNotNone(delays['contacts'])
+        self.assertIsNone(delays['balancereader'])
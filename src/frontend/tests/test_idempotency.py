@@ -0,0 +1,127 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for idempotency module
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from idempotency import IdempotencyStore
+
+KEY = ('1011226111', '6f9619ff-8b86-d011-b42d-00cf4fc964ff')
+
+
+class TestIdempotencyStore(unittest.TestCase):
+    """test remembering the outcome of submissions"""
+
+    def setUp(self):
+        """setup before each test"""
+        self.now = 1000.0
+        patcher = patch('idempotency.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_outcome_is_replayed_until_it_expires(self):
+        """test a key submitted again gets the first outcome for ttl seconds"""
+        store = IdempotencyStore(ttl=600)
+        submission = MagicMock(side_effect=['first', 'second'])
+        self.assertEqual(store.submit(KEY, submission), ('first', False))
+        self.now += 599
+        self.assertEqual(store.submit(KEY, submission), ('first', True))
+        self.now += 1
+        self.assertEqual(store.submit(KEY, submission), ('second', False))
+        self.assertEqual(submission.call_count, 2)
+        stats = store.stats()
+        self.assertEqual((stats['submitted'], stats['replayed'], stats['joined']), (2, 1, 0))
+
+    def test_keys_are_independent(self):
+        """test another form of the same account is submitted"""
+        store = IdempotencyStore()
+        store.submit(KEY, lambda: 'first')
+        self.assertEqual(store.submit((KEY[0], 'other'), lambda: 'other'), ('other', False))
+
+    def test_failed_submission_is_not_remembered(self):
+        """test a submission that raised runs again on the next call"""
+        store = IdempotencyStore()
+        with self.assertRaises(UserWarning):
+            store.submit(KEY, MagicMock(side_effect=UserWarning('ledger down')))
+        self.assertEqual(store.submit(KEY, lambda: 'retried'), ('retried', False))
+
+    def test_oldest_outcome_is_dropped_when_full(self):
+        """test the store keeps at most max_size outcomes"""
+        store = IdempotencyStore(max_size=2)
+        for uuid in ('a', 'b', 'c'):
+            store.submit((KEY[0], uuid), lambda: 'done')
+        self.assertEqual(store.stats()['size'], 2)
+        self.assertEqual(store.submit((KEY[0], 'a'), lambda: 'again'), ('again', False))
+        self.assertEqual(store.submit((KEY[0], 'c'), lambda: 'again'), ('done', True))
+
+
+class TestConcurrentDuplicates(unittest.TestCase):
+    """test submissions of the same key at the same time"""
+
+    def test_concurrent_duplicates_run_once(self):
+        """test callers joining a running submission wait for its outcome"""
+        store = IdempotencyStore()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def submission():
+            calls.append(True)
+            started.set()
+            release.wait(5)
+            return 'submitted'
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(store.submit, KEY, submission)
+            self.assertTrue(started.wait(5))
+            duplicates = [executor.submit(store.submit, KEY, submission) for _ in range(4)]
+            # let them join; one that comes later gets the remembered outcome
+            time.sleep(0.1)
+            release.set()
+            self.assertEqual(leader.result(), ('submitted', False))
+            for duplicate in duplicates:
+                self.assertEqual(duplicate.result(), ('submitted', True))
+        self.assertEqual(len(calls), 1)
+        stats = store.stats()
+        self.assertEqual(stats['joined'] + stats['replayed'], 4)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_waiters_get_the_exception_of_a_failed_submission(self):
+        """test a failure is shared by the callers that joined it, then forgotten"""
+        store = IdempotencyStore()
+        started = threading.Event()
+        release = threading.Event()
+
+        def submission():
+            started.set()
+            release.wait(5)
+            raise UserWarning('ledger down')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(store.submit, KEY, submission)
+            self.assertTrue(started.wait(5))
+            duplicate = executor.submit(store.submit, KEY, submission)
+            time.sleep(0.1)
+            release.set()
+            for future in (leader, duplicate):
+                with self.assertRaises(UserWarning):
+                    future.result()
+        self.assertEqual(store.submit(KEY, lambda: 'retried'), ('retried', False))
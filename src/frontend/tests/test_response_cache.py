@@ -0,0 +1,121 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for response_cache module
+"""
+
+import unittest
+from unittest.mock import patch
+
+from response_cache import ResponseCache
+
+KEY = ('balance', '1011226111')
+
+
+class TestResponseCache(unittest.TestCase):
+    """test the response cache"""
+
+    def setUp(self):
+        """setup before each test"""
+        self.now = 1000.0
+        patcher = patch('response_cache.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(max_size=10, ttl=2, stale_ttl=10, stale_if_error=300)
+
+    def store(self, key=KEY, value=100):
+        """put value for key at the current generation"""
+        self.cache.put(key, value, self.cache.generation)
+
+    def test_fresh_until_ttl(self):
+        """test an entry younger than ttl is served without refresh"""
+        self.store()
+        self.now += 1.999
+        self.assertEqual(self.cache.lookup(KEY), (100, False))
+        self.assertEqual(self.cache.peek(KEY), 100)
+        self.now += 0.001
+        self.assertIsNone(self.cache.peek(KEY))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_stale_while_revalidate(self):
+        """test a stale entry is served and one caller at a time refreshes it"""
+        self.store()
+        self.now += 2
+        self.assertEqual(self.cache.lookup(KEY), (100, True))
+        self.assertEqual(self.cache.lookup(KEY), (100, False))
+        self.cache.end_refresh(KEY)
+        self.now += 7.999
+        self.assertEqual(self.cache.lookup(KEY), (100, True))
+        stats = self.cache.stats()
+        self.assertEqual(stats['stale_hits'], 3)
+        self.assertAlmostEqual(stats['staleness_seconds_max'], 9.999)
+
+    def test_miss_after_stale_ttl(self):
+        """test an entry as old as stale_ttl is not served by lookup"""
+        self.store()
+        self.now += 10
+        self.assertEqual(self.cache.lookup(KEY), (None, False))
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_stale_if_error(self):
+        """test fallback serves an entry until stale_if_error, then it is dropped"""
+        self.store()
+        self.now += 299.999
+        self.assertEqual(self.cache.fallback(KEY), 100)
+        self.now += 0.001
+        self.assertIsNone(self.cache.fallback(KEY))
+        self.assertEqual(self.cache.stats()['size'], 1)
+        self.assertEqual(self.cache.lookup(KEY), (None, False))
+        self.assertEqual(self.cache.stats()['size'], 0)
+        self.assertEqual(self.cache.stats()['stale_on_error'], 1)
+
+    def test_write_invalidates_read_in_flight(self):
+        """test a response fetched before an invalidation is not stored"""
+        self.store(value=100)
+        generation = self.cache.generation
+        # a read starts, then a write invalidates the key before it ends
+        self.cache.invalidate(KEY)
+        self.cache.put(KEY, 100, generation)
+        self.assertEqual(self.cache.lookup(KEY), (None, False))
+        self.assertIsNone(self.cache.fallback(KEY))
+        # a read started after the write is stored
+        self.cache.put(KEY, 90, self.cache.generation)
+        self.assertEqual(self.cache.lookup(KEY), (90, False))
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_invalidation_of_other_keys_drops_reads_in_flight(self):
+        """test any invalidation discards responses fetched before it"""
+        generation = self.cache.generation
+        self.cache.invalidate(('balance', '1033623433'))
+        self.cache.put(KEY, 100, generation)
+        self.assertEqual(self.cache.lookup(KEY), (None, False))
+        self.assertEqual(self.cache.stats()['invalidations'], 0)
+
+    def test_least_recently_used_is_evicted(self):
+        """test a full cache drops the entry looked up least recently"""
+        cache = ResponseCache(max_size=2, ttl=2)
+        cache.put('a', 1, cache.generation)
+        cache.put('b', 2, cache.generation)
+        cache.lookup('a')
+        cache.put('c', 3, cache.generation)
+        self.assertEqual(cache.lookup('a'), (1, False))
+        self.assertEqual(cache.lookup('b'), (None, False))
+        self.assertEqual(cache.lookup('c'), (3, False))
+
+    def test_disabled_cache_stores_nothing(self):
+        """test a ttl or size of 0 disables the cache"""
+        for cache in (ResponseCache(ttl=0), ResponseCache(max_size=0)):
+            cache.put(KEY, 100, cache.generation)
+            self.assertEqual(cache.lookup(KEY), (None, False))
@@ -0,0 +1,91 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for static_assets module
+"""
+
+import gzip
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from werkzeug.exceptions import NotFound
+
+import static_assets
+from static_assets import StaticAssets
+
+SCRIPT = b'function greet(name) { return "hello " + name; }\n' * 50
+
+
+class TestStaticAssets(unittest.TestCase):
+    """test serving static assets"""
+
+    def setUp(self):
+        """setup before each test"""
+        folder = tempfile.mkdtemp()
+        with open(os.path.join(folder, 'index.js'), 'wb') as script:
+            script.write(SCRIPT)
+        self.assets = StaticAssets(folder)
+        self.app = Flask(__name__)
+
+    def serve(self, filename='index.js', **headers):
+        """return the response to a request for filename with headers"""
+        with self.app.test_request_context(headers=headers) as context:
+            return self.assets.response(filename, context.request)
+
+    def test_each_encoding_has_its_own_etag(self):
+        """test the plain and compressed bodies have different strong ETags"""
+        plain = self.serve()
+        gzipped = self.serve(**{'Accept-Encoding': 'gzip'})
+        self.assertEqual(plain.get_data(), SCRIPT)
+        self.assertEqual(gzip.decompress(gzipped.get_data()), SCRIPT)
+        etags = {plain.get_etag(), gzipped.get_etag()}
+        if static_assets.brotli is not None:
+            compressed = self.serve(**{'Accept-Encoding': 'gzip, br'})
+            self.assertEqual(compressed.headers['Content-Encoding'], 'br')
+            self.assertEqual(static_assets.brotli.decompress(compressed.get_data()), SCRIPT)
+            etags.add(compressed.get_etag())
+        self.assertEqual(len(etags), 2 if static_assets.brotli is None else 3)
+        for _, weak in etags:
+            self.assertFalse(weak)
+
+    def test_gzip_when_br_is_not_smaller(self):
+        """test gzip is served to a client accepting both when br does not pay off"""
+        if static_assets.brotli is None:
+            self.skipTest('brotli is not installed')
+        with patch.object(static_assets.brotli, 'compress', lambda body, quality: body + b'.'):
+            resp = self.serve(**{'Accept-Encoding': 'br, gzip'})
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(resp.get_data()), SCRIPT)
+
+    def test_any_variant_etag_is_not_modified(self):
+        """test a cached variant is revalidated whichever encoding is served"""
+        gzip_etag, _ = self.serve(**{'Accept-Encoding': 'gzip'}).get_etag()
+        resp = self.serve(**{'If-None-Match': f'"{gzip_etag}"'})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.get_data(), b'')
+        resp = self.serve(**{'If-None-Match': '"other"'})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_fingerprinted_url_is_immutable(self):
+        """test fingerprinted names are cached for long, plain names briefly"""
+        fingerprinted = self.assets.url('index.js').split('/', 1)[1]
+        self.assertNotEqual(fingerprinted, 'index.js')
+        self.assertIn('immutable', self.serve(fingerprinted).headers['Cache-Control'])
+        self.assertNotIn('immutable', self.serve().headers['Cache-Control'])
+        with self.assertRaises(NotFound):
+            self.serve('missing.js')
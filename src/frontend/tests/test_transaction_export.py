@@ -0,0 +1,131 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for transaction_export module
+"""
+
+import csv
+import datetime
+import io
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from transaction_export import export_rows, iter_json_array, to_csv
+
+ACCOUNT_ID = '1011226111'
+ROUTING_NUM = '883745000'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+TRANSACTIONS = [{'transactionId': 3, 'fromAccountNum': '1033623433',
+                 'fromRoutingNum': ROUTING_NUM, 'toAccountNum': ACCOUNT_ID,
+                 'toRoutingNum': ROUTING_NUM, 'amount': 12345,
+                 'timestamp': '2026-10-01T22:30:00.000+00:00'},
+                {'transactionId': 2, 'fromAccountNum': ACCOUNT_ID,
+                 'fromRoutingNum': ROUTING_NUM, 'toAccountNum': '1055757655',
+                 'toRoutingNum': ROUTING_NUM, 'amount': 5,
+                 'timestamp': '2026-09-30T08:00:00.000+00:00'}]
+
+
+def chunked(data, size):
+    """split data into chunks of size bytes"""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """test parsing a JSON array arriving in chunks"""
+
+    def test_any_chunk_size(self):
+        """test elements split at any byte, within numbers or UTF-8 characters too"""
+        document = [{'label': 'Café ☕', 'amount': 123456}, 1234.5, -7, 'text', True, None,
+                    [1, [2]], {}]
+        data = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+        for size in range(1, len(data) + 1):
+            self.assertEqual(list(iter_json_array(chunked(data, size))), document, size)
+
+    def test_empty_array(self):
+        """test an empty array, with or without whitespace, yields nothing"""
+        for data in (b'[]', b' [ \n ] ', b''.join([b'[', b'', b' ', b']'])):
+            self.assertEqual(list(iter_json_array(chunked(data, 1))), [])
+
+    def test_elements_are_yielded_as_they_arrive(self):
+        """test an element is yielded before the rest of the array is received"""
+        elements = iter_json_array(iter([b'[{"a": 1}, ', b'{"b"']))
+        self.assertEqual(next(elements), {'a': 1})
+        with self.assertRaises(ValueError):
+            next(elements)
+
+    def test_invalid_documents(self):
+        """test documents that are not a complete JSON array raise ValueError"""
+        for data in (b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1, }', b'', b'[1,]'):
+            with self.assertRaises(ValueError, msg=data):
+                list(iter_json_array(chunked(data, 2)))
+
+
+class TestExportRows(unittest.TestCase):
+    """test the rows of an export"""
+
+    def test_credit_and_debit_rows(self):
+        """test rows are signed and labelled from the account's point of view"""
+        timezone = datetime.timezone(datetime.timedelta(hours=-7))
+        rows = list(export_rows(ACCOUNT_ID, TRANSACTIONS, {'1033623433': 'Alice'},
+                                timezone, TIMESTAMP_FORMAT))
+        self.assertEqual(rows, [
+            {'transaction_id': 3, 'timestamp': '2026-10-01T15:30:00-07:00', 'type': 'credit',
+             'account_num': '1033623433', 'routing_num': ROUTING_NUM, 'label': 'Alice',
+             'amount': '123.45'},
+            {'transaction_id': 2, 'timestamp': '2026-09-30T01:00:00-07:00', 'type': 'debit',
+             'account_num': '1055757655', 'routing_num': ROUTING_NUM, 'label': '',
+             'amount': '-0.05'}])
+
+    def test_other_accounts_transactions_are_skipped(self):
+        """test transactions not involving the account are left out"""
+        rows = list(export_rows('1099999999', TRANSACTIONS, {}, datetime.timezone.utc,
+                                TIMESTAMP_FORMAT))
+        self.assertEqual(rows, [])
+
+    def test_malformed_transactions_are_skipped(self):
+        """test transactions missing fields or with invalid values are logged and left out"""
+        malformed = [{'transactionId': 4, 'toAccountNum': ACCOUNT_ID},
+                     dict(TRANSACTIONS[0], amount='12345'),
+                     dict(TRANSACTIONS[0], timestamp='yesterday'),
+                     'not a transaction']
+        logger = MagicMock()
+        rows = list(export_rows(ACCOUNT_ID, malformed + TRANSACTIONS, {},
+                                datetime.timezone.utc, TIMESTAMP_FORMAT, logger=logger))
+        self.assertEqual([row['transaction_id'] for row in rows], [3, 2])
+        self.assertEqual(logger.warning.call_count, len(malformed))
+
+
+class TestToCsv(unittest.TestCase):
+    """test CSV export"""
+
+    def export(self, labels):
+        """return the CSV export of TRANSACTIONS, parsed"""
+        rows = export_rows(ACCOUNT_ID, TRANSACTIONS, labels, datetime.timezone.utc,
+                           TIMESTAMP_FORMAT)
+        return list(csv.DictReader(io.StringIO(''.join(to_csv(rows)))))
+
+    def test_formulas_are_escaped(self):
+        """test labels a spreadsheet would run are prefixed, amounts are not"""
+        for label in ('=HYPERLINK("http://example.com")', '+1', '-1+1', '@SUM(A1)', '\tx'):
+            lines = self.export({'1033623433': label, '1055757655': 'Bob = Alice'})
+            self.assertEqual(lines[0]['label'], "'" + label)
+            self.assertEqual(lines[1]['label'], 'Bob = Alice')
+            self.assertEqual(lines[1]['amount'], '-0.05')
+
+    def test_header_without_rows(self):
+        """test an empty history exports the header"""
+        self.assertEqual(''.join(to_csv([])).strip(),
+                         'transaction_id,timestamp,type,account_num,routing_num,label,amount')
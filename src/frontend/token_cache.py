@@ -0,0 +1,83 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of already verified JWTs"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """Bounded, thread-safe cache of the claims of verified tokens.
+
+    Entries are keyed by a SHA-256 digest of the token, so the cache never
+    holds the tokens themselves. An entry is dropped once the token's 'exp'
+    claim is reached; when the cache is full the least recently used entry
+    is evicted.
+    """
+
+    def __init__(self, max_size=1024):
+        """Initialize a verified token cache"""
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counts = {'hits': 0, 'misses': 0}
+
+    def get(self, token):
+        """Return the cached claims of token, or None if not cached or expired"""
+        digest = _digest(token)
+        now = time.time()
+        with self._lock:
+            claims = self._entries.get(digest)
+            if claims is not None and claims['exp'] <= now:
+                del self._entries[digest]
+                claims = None
+            if claims is None:
+                self._counts['misses'] += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._counts['hits'] += 1
+            return claims
+
+    def put(self, token, claims):
+        """Remember that token was verified. Tokens without 'exp' are not cached."""
+        if self.max_size <= 0 or 'exp' not in claims:
+            return
+        digest = _digest(token)
+        with self._lock:
+            self._entries[digest] = claims
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every verified token, e.g. after the signing keys changed"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {'size': len(self._entries),
+                    'max_size': self.max_size,
+                    'hits': self._counts['hits'],
+                    'misses': self._counts['misses']}
+
+
+def _digest(token):
+    if isinstance(token, str):
+        token = token.encode('utf-8')
+    return hashlib.sha256(token).digest()
@@ -14,33 +14,79 @@
 
 """Enable tracing with a ThreadPoolExecutor"""
 
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-from opentelemetry import context as otel_context
 
 class TracedThreadPoolExecutor(ThreadPoolExecutor):
-    """Implementation of :class:`ThreadPoolExecutor` that will pass context into sub tasks."""
+    """Implementation of :class:`ThreadPoolExecutor` that will pass context into sub tasks.
 
-    def __init__(self, tracer, *args, **kwargs):
+    The executor is meant to be long-lived and shared by all request threads
+    of a process. It keeps track of how many tasks are waiting for a free
+    worker and of how long they waited.
+
+    If tracer is None, tracing is disabled: OpenTelemetry is not imported
+    and tasks run without any context being carried over. If queue_gauge
+    is given, e.g. a Prometheus gauge, it is incremented and decremented
+    as tasks enter and leave the queue.
+    """
+
+    def __init__(self, tracer, *args, queue_gauge=None, **kwargs):
         """Initialize TracedThreadPoolExecutor"""
         self.tracer = tracer
+        self.queue_gauge = queue_gauge
+        self._otel_context = None
+        if tracer is not None:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry import context as otel_context
+            self._otel_context = otel_context
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._waits = {'count': 0, 'total': 0.0, 'max': 0.0}
         super().__init__(*args, **kwargs)
 
     def with_otel_context(self, context, function):
-        """Attach context"""
-        otel_context.attach(context)
-        return function()
+        """Attach context for the duration of function, then restore the worker's own"""
+        token = self._otel_context.attach(context)
+        try:
+            return function()
+        finally:
+            self._otel_context.detach(token)
 
     # pylint: disable-msg=arguments-differ
     def submit(self, function, *args, **kwargs):
         """Submit a new task to the thread pool."""
 
         # get the current otel context
-        context = otel_context.get_current()
+        context = self._otel_context.get_current() if self._otel_context else None
+        with self._stats_lock:
+            self._queued += 1
+        if self.queue_gauge is not None:
+            self.queue_gauge.inc()
+        return super().submit(self._run_queued, time.monotonic(),
+                              context, lambda: function(*args, **kwargs))
+
+    def _run_queued(self, submitted, context, task):
+        """Record the time task spent in the queue, then run it"""
+        waited = time.monotonic() - submitted
+        with self._stats_lock:
+            self._queued -= 1
+            self._waits['count'] += 1
+            self._waits['total'] += waited
+            self._waits['max'] = max(self._waits['max'], waited)
+        if self.queue_gauge is not None:
+            self.queue_gauge.dec()
         if context:
-            return super().submit(
-                lambda: self.with_otel_context(
-                    context, lambda: function(*args, **kwargs)
-                ),
-            )
+            return self.with_otel_context(context, task)
+        return task()
 
-        return super().submit(lambda: function(*args, **kwargs))
+    def stats(self):
+        """Return queue depth and queue wait time (in seconds) counters"""
+        with self._stats_lock:
+            count = self._waits['count']
+            return {'max_workers': self._max_workers,
+                    'queue_depth': self._queued,
+                    'tasks': count,
+                    'wait_seconds_total': self._waits['total'],
+                    'wait_seconds_max': self._waits['max'],
+                    'wait_seconds_avg': self._waits['total'] / count if count else 0.0}
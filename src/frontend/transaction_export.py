@@ -0,0 +1,176 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming export of a transaction history
+
+Every step is a generator, so an export holds one transaction and one
+chunk of the backend response at a time, whatever its length.
+"""
+
+import codecs
+import csv
+import io
+import json
+import logging
+
+from history_view import parse_timestamp
+
+EXPORT_FIELDS = ['transaction_id', 'timestamp', 'type', 'account_num', 'routing_num',
+                 'label', 'amount']
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789.eE+-'
+# spreadsheets evaluate CSV cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# CSV fields written as they are, amount being negative for debits
+NUMERIC_FIELDS = frozenset(['transaction_id', 'amount'])
+
+
+def iter_json_array(chunks):
+    """Parse a JSON array arriving in chunks of UTF-8 bytes, yield its elements
+
+    Raises:
+        ValueError: if the document is not a JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    started = False
+    first = True
+    for chunk in _with_end(chunks):
+        final = chunk is None
+        buffer = buffer[pos:] + utf8.decode(chunk or b'', final=final)
+        pos = _skip_whitespace(buffer, 0)
+        if not started and pos < len(buffer):
+            if buffer[pos] != '[':
+                raise ValueError('expected a JSON array')
+            started = True
+            pos = _skip_whitespace(buffer, pos + 1)
+        while started and pos < len(buffer):
+            if buffer[pos] == ']':
+                return
+            start = pos
+            if not first:
+                if buffer[pos] != ',':
+                    raise ValueError(f'expected , or ] in JSON array, got {buffer[pos]!r}')
+                start = _skip_whitespace(buffer, pos + 1)
+            value, end = _decode(decoder, buffer, start, final)
+            if end is None:
+                # the element goes on in the next chunk
+                break
+            yield value
+            first = False
+            pos = _skip_whitespace(buffer, end)
+    raise ValueError('unterminated JSON array')
+
+
+def _skip_whitespace(buffer, pos):
+    """Return the position of the first character from pos that is not whitespace"""
+    while pos < len(buffer) and buffer[pos] in WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _decode(decoder, buffer, start, final):
+    """Return the JSON value at start and where it ends, (None, None) if it is incomplete"""
+    try:
+        value, end = decoder.raw_decode(buffer, start)
+    except json.JSONDecodeError:
+        if final:
+            raise
+        return None, None
+    # a number is complete once something other than a digit follows it
+    if (not final and isinstance(value, (int, float)) and not isinstance(value, bool)
+            and (end == len(buffer) or buffer[end] in NUMBER_CHARS)):
+        return None, None
+    return value, end
+
+
+def _with_end(chunks):
+    """Yield the chunks, then None"""
+    yield from chunks
+    yield None
+
+
+# pylint: disable-msg=too-many-arguments
+def export_rows(account_id, transactions, labels, timezone, timestamp_format, *,
+                logger=logging):
+    """
+    Yield the export rows of the transactions of account_id, as dicts of
+    EXPORT_FIELDS. Timestamps are shown in timezone, the other account is
+    labelled like in the history table, amounts are signed dollars.
+    Malformed transactions are logged and left out.
+    """
+    for trans in transactions:
+        try:
+            row = export_row(account_id, trans, labels, timezone, timestamp_format)
+        except (KeyError, TypeError, ValueError) as err:
+            logger.warning('Skipping malformed transaction in export: %s: %s',
+                           type(err).__name__, err)
+            continue
+        if row is not None:
+            yield row
+
+
+def export_row(account_id, trans, labels, timezone, timestamp_format):
+    """Return the export row of a transaction, None if not one of account_id"""
+    if trans['toAccountNum'] == account_id:
+        credit = True
+        other, routing = trans['fromAccountNum'], trans['fromRoutingNum']
+    elif trans['fromAccountNum'] == account_id:
+        credit = False
+        other, routing = trans['toAccountNum'], trans['toRoutingNum']
+    else:
+        return None
+    dollars, cents = divmod(trans['amount'], 100)
+    return {'transaction_id': trans['transactionId'],
+            'timestamp': parse_timestamp(trans['timestamp'],
+                                         timestamp_format).astimezone(timezone).isoformat(),
+            'type': 'credit' if credit else 'debit',
+            'account_num': other,
+            'routing_num': routing,
+            'label': labels.get(other) or '',
+            'amount': f'{"" if credit else "-"}{dollars}.{cents:02d}'}
+
+
+def to_csv(rows):
+    """Yield the header line, then a CSV line per row
+
+    Text that a spreadsheet would run as a formula, e.g. a contact label
+    starting with =, is prefixed with a quote.
+    """
+    line = io.StringIO()
+    writer = csv.DictWriter(line, EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({field: value if field in NUMERIC_FIELDS else escape_formula(value)
+                         for field, value in row.items()})
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+    if line.tell():
+        yield line.getvalue()
+
+
+def escape_formula(value):
+    """Return value, prefixed with a quote if it is text a spreadsheet would run"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def to_ndjson(rows, json_codec):
+    """Yield a JSON line per row"""
+    for row in rows:
+        yield json_codec.dumpb(row) + b'\n'